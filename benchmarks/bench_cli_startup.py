@@ -0,0 +1,39 @@
+"""Measure the import time of the command line module against the modules it defers.
+
+Uses 'python -X importtime', which prints the time taken to import each module, and reports the cumulative time for
+the top-level imports.
+
+Run from the project root:
+    python benchmarks/bench_cli_startup.py
+"""
+import subprocess
+import sys
+
+
+def import_time(statement):
+    """Cumulative import time in milliseconds of the modules imported by a statement, in a new process."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # Lines are 'import time: self [us] | cumulative | module', top-level modules are not indented
+        parts = line.split('|')
+        if len(parts) == 3 and parts[0].startswith('import time:') and not parts[2].startswith('  '):
+            cumulative = parts[1].strip()
+            if cumulative.isdigit():
+                total_us += int(cumulative)
+    return total_us / 1000
+
+
+def main():
+    for label, statement in [
+        ('tutorialpkg.cli', 'import tutorialpkg.cli'),
+        ('pandas', 'import pandas'),
+        ('pandas + matplotlib.pyplot', 'import pandas, matplotlib.pyplot'),
+    ]:
+        times = [import_time(statement) for _ in range(5)]
+        print(f'{label:<30} {min(times):8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark replacing the country aliases across the whole DataFrame against resolving the 'country' column only.
+
+The raw events csv is scaled to 1 million rows. The old version is the DataFrame.replace() call that country_name()
+used to make, which compares every cell of every column with the aliases. resolve_country_names() looks up each unique
+value of the 'country' column once, and for a categorical column works on the category codes.
+
+Run from the project root:
+    python benchmarks/bench_country_aliases.py
+"""
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from tutorialpkg.data_tools.countries import load_country_aliases, resolve_country_names
+
+RAW_CSV = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data', 'paralympics_events_raw.csv')
+ROWS = 1_000_000
+
+
+def time_it(label, func, repeat=3):
+    """Print the best time of 'repeat' runs of func."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    print(f'{label:<35} {min(times):8.3f} s')
+    return min(times)
+
+
+def main():
+    raw = pd.read_csv(RAW_CSV)
+    scaled = pd.concat([raw] * (ROWS // len(raw) + 1), ignore_index=True).head(ROWS)
+    countries = scaled['country']
+    categories = countries.astype('category')
+    aliases = load_country_aliases()
+    print(f'Events data with {ROWS} rows\n')
+
+    before = time_it('replace on the whole DataFrame', lambda: scaled.replace(to_replace=aliases))
+    time_it('replace on the country column', lambda: countries.replace(aliases))
+    time_it('resolve, string column', lambda: resolve_country_names(countries, aliases))
+    after = time_it('resolve, categorical column', lambda: resolve_country_names(categories, aliases))
+    print(f'\nSpeed up (whole DataFrame -> categorical): {before / after:.0f}x')
+
+
+if __name__ == '__main__':
+    main()
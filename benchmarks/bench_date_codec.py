@@ -0,0 +1,56 @@
+"""Benchmark parsing and formatting the event dates with pandas against the memoised DateCodec.
+
+The start and end dates of the raw events csv are repeated to 1 million rows. The current path parses the text with
+pd.to_datetime(format='%d/%m/%Y') and formats it for the database with .dt.strftime(). The codec parses each different
+string once and formats each different date once, or formats ISO text with numpy. The memory used by each way of
+storing the dates is also shown.
+
+Run from the project root:
+    python benchmarks/bench_date_codec.py
+"""
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from tutorialpkg.data_tools.dates import DateCodec, format_dates
+
+RAW_CSV = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data', 'paralympics_events_raw.csv')
+ROWS = 1_000_000
+DATE_FORMAT = '%d/%m/%Y'
+
+
+def time_it(label, func, repeat=3):
+    """Print the best time of 'repeat' runs of func and return the result of the last run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    print(f'{label:<40} {min(times):8.3f} s')
+    return result
+
+
+def main():
+    raw = pd.read_csv(RAW_CSV, usecols=['start', 'end'])
+    text = pd.concat([raw['start'], raw['end']] * (ROWS // (2 * len(raw)) + 1), ignore_index=True).head(ROWS)
+    print(f'{ROWS} date strings, {text.nunique()} different dates\n')
+
+    dates = time_it('pd.to_datetime', lambda: pd.to_datetime(text, format=DATE_FORMAT))
+    # A new codec each run, so the time includes filling the memo table
+    time_it('DateCodec.to_datetime', lambda: DateCodec(DATE_FORMAT).to_datetime(text))
+    codec = DateCodec(DATE_FORMAT)
+    days = time_it('DateCodec.day_numbers', lambda: codec.day_numbers(text))
+    print()
+    time_it('.dt.strftime dd/mm/YYYY', lambda: dates.dt.strftime(DATE_FORMAT))
+    time_it('format_dates dd/mm/YYYY', lambda: format_dates(dates, DATE_FORMAT))
+    time_it('.dt.strftime ISO', lambda: dates.dt.strftime('%Y-%m-%d'))
+    time_it('format_dates ISO', lambda: format_dates(dates))
+    print()
+    print(f'{"memory, date strings":<40} {text.memory_usage(deep=True) / 1024 ** 2:8.1f} MB')
+    print(f'{"memory, datetime64":<40} {dates.memory_usage(deep=True) / 1024 ** 2:8.1f} MB')
+    print(f'{"memory, int32 day numbers":<40} {days.nbytes / 1024 ** 2:8.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
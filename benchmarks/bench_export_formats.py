@@ -0,0 +1,50 @@
+"""Benchmark saving the prepared event data in each export format, one at a time and all at once.
+
+The prepared events csv is repeated to 100,000 rows. Each format is written on its own to measure its throughput, then
+DataFrame.to_excel() is timed against write_xlsx(), and finally all the formats are written at the same time with
+export_dataframe().
+
+Run from the project root:
+    python benchmarks/bench_export_formats.py
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from tutorialpkg.data_tools.export import EXPORT_FORMATS, describe_export, export_dataframe, write_xlsx
+
+PREPARED_CSV = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data', 'paralympics_events_prepared.csv')
+ROWS = 100_000
+
+
+def main():
+    df = pd.read_csv(PREPARED_CSV, parse_dates=['start', 'end'])
+    df = pd.concat([df] * (ROWS // len(df) + 1), ignore_index=True).head(ROWS)
+    print(f'{len(df)} rows, {len(df.columns)} columns\n')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path = Path(tmp_dir).joinpath('prepared')
+        results = {}
+        for file_format in EXPORT_FORMATS:
+            results.update(export_dataframe(df, base_path, [file_format]))
+        print(describe_export(results))
+        print()
+
+        start = time.perf_counter()
+        df.to_excel(Path(tmp_dir).joinpath('openpyxl.xlsx'), index=False)
+        print(f'{"DataFrame.to_excel":<30} {time.perf_counter() - start:8.3f} s')
+        start = time.perf_counter()
+        write_xlsx(df, Path(tmp_dir).joinpath('streamed.xlsx'))
+        print(f'{"write_xlsx":<30} {time.perf_counter() - start:8.3f} s')
+        print()
+
+        start = time.perf_counter()
+        export_dataframe(df, base_path, EXPORT_FORMATS)
+        print(f'{"all formats, one at a time":<30} {sum(r["seconds"] for r in results.values()):8.3f} s')
+        print(f'{"all formats, at the same time":<30} {time.perf_counter() - start:8.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark profiling a wide DataFrame in one process and in a process pool.
+
+A DataFrame of 100,000 rows and 300 float columns, like a wide medal or participant table, is profiled with
+profile_dataframe() and with profile_parallel() for 1, 2 and 4 workers. The times include describe(), so the quantiles
+are found in both. The pool can only be faster on a machine with more than one CPU.
+
+Run from the project root:
+    python benchmarks/bench_parallel_profile.py
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from tutorialpkg.data_tools.profile import profile_dataframe, profile_parallel
+
+ROWS = 100_000
+COLUMNS = 300
+
+
+def main():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(ROWS, COLUMNS)), columns=[f'column_{i}' for i in range(COLUMNS)])
+    print(f'{ROWS} rows, {COLUMNS} columns, {os.cpu_count()} CPUs\n')
+
+    start = time.perf_counter()
+    expected = profile_dataframe(df).describe()
+    print(f'{"profile_dataframe":<30} {time.perf_counter() - start:8.3f} s')
+    for workers in (1, 2, 4):
+        start = time.perf_counter()
+        result = profile_parallel(df, workers=workers).describe()
+        print(f'{f"profile_parallel, {workers} workers":<30} {time.perf_counter() - start:8.3f} s')
+        pd.testing.assert_frame_equal(result, expected)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Measure the peak memory of preparing 1 million event rows with the cached pipeline and with low_memory=True.
+
+Each mode runs in a new process. The peak resident set size (RSS) is reset after the raw csv is read (Linux only, by
+writing to /proc/self/clear_refs), so the peak is that of the preparation and includes the raw data. It is reported
+as a multiple of the memory used by the raw DataFrame. The per-step peaks are from a second run with tracemalloc,
+which counts the memory allocated by Python and numpy but not the pyarrow memory used by string columns.
+
+Run from the project root:
+    python benchmarks/bench_prepare_memory.py
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+SRC_DIR = Path(__file__).parent.parent.joinpath('src')
+RAW_CSV = SRC_DIR.joinpath('tutorialpkg', 'data', 'paralympics_events_raw.csv')
+ROWS = 1_000_000
+
+
+def peak_rss_mb(reset=False):
+    """Return the peak RSS of this process in MB, and optionally reset it to the current RSS."""
+    if reset:
+        Path('/proc/self/clear_refs').write_text('5')
+    for line in Path('/proc/self/status').read_text().splitlines():
+        if line.startswith('VmHWM:'):
+            return int(line.split()[1]) / 1024
+
+
+def run_mode(mode, scaled_csv, output_csv):
+    """Prepare the scaled csv in this process and print the memory used."""
+    sys.path.insert(0, str(SRC_DIR))
+    import data_preparation
+    from tutorialpkg.data_tools.npc import get_npc_lookup
+    from tutorialpkg.data_tools.schema import EVENTS_SCHEMA, read_with_schema
+
+    raw = read_with_schema(scaled_csv, EVENTS_SCHEMA)
+    npc = get_npc_lookup()
+    input_mb = raw.memory_usage(deep=True).sum() / 1024 ** 2
+    low_memory = mode == 'low_memory'
+    baseline = peak_rss_mb(reset=True)
+
+    pipeline = data_preparation.create_prepare_pipeline(output_csv=output_csv, cache_dir=None)
+    results = pipeline.run({'raw': raw, 'npc': npc}, targets=['duration', 'write_csv'], low_memory=low_memory)
+    peak = peak_rss_mb()
+    del results
+    pipeline.clear_cache()
+
+    pipeline.run({'raw': raw, 'npc': npc}, targets=['duration', 'write_csv'], low_memory=low_memory,
+                 trace_memory=True)
+    steps = ', '.join(f"{step} {timing['peak_mb']:.0f}" for step, timing in pipeline.timings.items())
+    # The baseline RSS includes the interpreter and libraries, so count the raw data in the peak
+    used = peak - baseline + input_mb
+    print(f'{mode:<12} input {input_mb:6.0f} MB, peak RSS {used:6.0f} MB ({used / input_mb:.1f}x input)')
+    print(f'{"":<12} tracemalloc peak MB per step: {steps}')
+
+
+def main():
+    raw = pd.read_csv(RAW_CSV)
+    scaled = pd.concat([raw] * (ROWS // len(raw) + 1), ignore_index=True).head(ROWS)
+    with tempfile.TemporaryDirectory() as tmp:
+        scaled_csv = Path(tmp).joinpath('events_scaled.csv')
+        scaled.to_csv(scaled_csv, index=False)
+        print(f'Preparing {ROWS} event rows\n')
+        for mode in ['cached', 'low_memory']:
+            subprocess.run([sys.executable, __file__, mode, str(scaled_csv), str(Path(tmp).joinpath('out.csv'))],
+                           check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4:
+        run_mode(*sys.argv[1:])
+    else:
+        main()
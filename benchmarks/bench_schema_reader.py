@@ -0,0 +1,59 @@
+"""Benchmark reading the events csv then casting the columns against reading it with the events schema.
+
+The raw events csv is scaled to 1 million rows. Rows with missing counts are left out, so that the load-then-cast
+version can convert the float columns to int as change_datatype() does.
+
+Run from the project root:
+    python benchmarks/bench_schema_reader.py
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from tutorialpkg.data_tools.schema import EVENTS_SCHEMA, read_with_schema
+
+RAW_CSV = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data', 'paralympics_events_raw.csv')
+ROWS = 1_000_000
+
+
+def load_then_cast(path):
+    """The current approach: read with default types, then convert the columns."""
+    df = pd.read_csv(path)
+    for column in df.select_dtypes(include=['float64']).columns:
+        df[column] = df[column].astype(int)
+    df['start'] = pd.to_datetime(df['start'], format='%d/%m/%Y')
+    df['end'] = pd.to_datetime(df['end'], format='%d/%m/%Y')
+    df['type'] = df['type'].astype('category')
+    df['country'] = df['country'].astype('category')
+    return df
+
+
+def time_it(label, func, repeat=3):
+    """Print the best time of 'repeat' runs of func."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = func()
+        times.append(time.perf_counter() - start)
+    memory = df.memory_usage(deep=True).sum() / 1024 ** 2
+    print(f'{label:<25} {min(times):8.3f} s {memory:10.1f} MB')
+    return min(times)
+
+
+def main():
+    raw = pd.read_csv(RAW_CSV).dropna(subset=['countries', 'events', 'participants_m', 'participants_f',
+                                              'participants'])
+    scaled = pd.concat([raw] * (ROWS // len(raw) + 1), ignore_index=True).head(ROWS)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp).joinpath('events_scaled.csv')
+        scaled.to_csv(path, index=False)
+        print(f'Events csv with {ROWS} rows\n')
+        before = time_it('load then cast', lambda: load_then_cast(path))
+        after = time_it('schema at read', lambda: read_with_schema(path, EVENTS_SCHEMA))
+        print(f'\nSpeed up: {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
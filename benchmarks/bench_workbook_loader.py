@@ -0,0 +1,66 @@
+"""Benchmark reading three sheets with pd.read_excel against the single-open read_workbook() loader.
+
+A copy of paralympics_all.xlsx is scaled to about 100k rows in total. The events and medal_standings sheets are
+repeated to 50k rows each and npc_codes is unchanged.
+
+Run from the project root:
+    python benchmarks/bench_workbook_loader.py
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+from tutorialpkg.data_tools.workbook import read_workbook
+
+DATA_PATH = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data_db_activity', 'paralympics_all.xlsx')
+SHEETS = ['events', 'medal_standings', 'npc_codes']
+ROWS_PER_SHEET = 50_000
+
+
+def make_scaled_workbook(path, rows_per_sheet=ROWS_PER_SHEET):
+    """Write a copy of the paralympics workbook with the events and medal sheets repeated to rows_per_sheet rows."""
+    source = pd.read_excel(DATA_PATH, sheet_name=None)
+    workbook = openpyxl.Workbook(write_only=True)
+    for name, df in source.items():
+        if name != 'npc_codes':
+            repeats = rows_per_sheet // len(df) + 1
+            df = pd.concat([df] * repeats, ignore_index=True).head(rows_per_sheet)
+        worksheet = workbook.create_sheet(name)
+        worksheet.append(list(df.columns))
+        for row in df.itertuples(index=False):
+            worksheet.append([None if pd.isna(value) else value for value in row])
+    workbook.save(path)
+
+
+def time_it(label, func, repeat=3):
+    """Print the best time of 'repeat' runs of func."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    print(f'{label:<45} {min(times):8.3f} s')
+    return min(times)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp).joinpath('paralympics_scaled.xlsx')
+        make_scaled_workbook(path)
+        print(f'Workbook with {ROWS_PER_SHEET} rows in events and medal_standings\n')
+
+        before = time_it('pd.read_excel once per sheet',
+                         lambda: [pd.read_excel(path, sheet_name=sheet) for sheet in SHEETS])
+        after = time_it('read_workbook, all columns', lambda: read_workbook(path, SHEETS))
+        time_it('read_workbook, 3 columns per sheet', lambda: read_workbook(
+            path, SHEETS, columns={'events': ['type', 'year', 'host'],
+                                   'medal_standings': ['Year', 'NPC', 'Total'],
+                                   'npc_codes': ['code', 'name', 'region']}))
+        print(f'\nSpeed up (all columns): {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-# set display options for pandas
-pd.set_option("display.max_columns", None)
+from tutorialpkg.data_tools.dataset import ParalympicsDataset
+from tutorialpkg.data_tools.metrics import METRICS, DerivedMetrics
 
 
 def histogram(df, columns = None, type = None):
@@ -66,8 +66,8 @@ def timeseries(df):
         boxplots of relevant columns in the dataframe
     """
 
-    # sort values by date order
-    df = df.sort_values(by='start')
+    # select only the columns used in the chart and sort values by date order
+    df = df[['start', 'participants', 'type']].sort_values(by='start')
 
     # Create a lineplot of participants over time
     df.plot(x='start' , y='participants', xlabel='Date', ylabel='# of participants', legend=False)
@@ -77,14 +77,40 @@ def timeseries(df):
     # Show the plots
     plt.show()      # last command as it is a blocking function; pauses execution of script
 
+def metric_timeseries(df, metric):
+    """"
+    Generates a timeseries line chart of a derived metric, one line for each type of games
+
+    Parameters:
+            df (ParalympicsDataset): the prepared event data
+            metric (str): name of a derived metric, e.g. 'female_share' (see data_tools.metrics)
+ 
+    Returns:
+        line chart of the metric over time
+    """
+
+    # the metric is computed once for each version of the data file, and loaded from the cache after that
+    df_metric = df[['start', 'type']].assign(**{metric: DerivedMetrics(df)[metric]}).sort_values(by='start')
+
+    # Create a lineplot of the metric for winter and summer events
+    fig, ax = plt.subplots()
+    for season, df_season in df_metric.groupby('type'):
+        df_season.plot(x='start', y=metric, ax=ax, label=season, xlabel='Date', ylabel=METRICS[metric].description)
+
+    # Show the plots
+    plt.show()      # last command as it is a blocking function; pauses execution of script
+
 def main():
     """"
     Main logic for the program
     Reads the provided databases into DataFrame format    
     """
+    # set display options for pandas, here rather than on import so importing the module has no side effects
+    pd.set_option("display.max_columns", None)
+
     try:
         events_prepared_csv = Path(__file__).parent / 'tutorialpkg' / 'data' /'paralympics_events_prepared.csv'
-        df_events = pd.read_csv(events_prepared_csv)                                                      # read csv file into DataFrame
+        df_events = ParalympicsDataset(events_prepared_csv)                                               # open the csv file, each column is read when a chart first uses it
     except FileNotFoundError as e:
         print(f"CSV file not found. Please check the file path. Error: {e}")
         exit()
@@ -105,6 +131,9 @@ def main():
     # calls timeseries function
     timeseries(df_events)
 
+    # calls metric_timeseries function for a derived metric
+    # metric_timeseries(df_events, 'female_share')
+
 
     return
 
@@ -1,25 +1,53 @@
+import argparse
+import functools
+import glob
+import logging
+import os
 import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 
-# set display ooptions for pandas
-pd.set_option("display.max_columns", None)
+from tutorialpkg.data_tools import instrument, manifest
+from tutorialpkg.data_tools.cache import CACHE_DIR, file_hash, read_workbook_cached
+from tutorialpkg.data_tools.countries import COUNTRY_ALIASES_CSV, load_country_aliases, resolve_country_names
+from tutorialpkg.data_tools.dates import get_date_codec
+from tutorialpkg.data_tools.dtypes import describe_savings, optimise_dtypes
+from tutorialpkg.data_tools.instrument import instrumented
+from tutorialpkg.data_tools.loading import load_concurrently
+from tutorialpkg.data_tools.metrics import DerivedMetrics
+from tutorialpkg.data_tools.npc import (NPC_CSV, NPC_JOIN_VERSION, NpcLookup, get_npc_lookup, load_npc_codes,
+                                         load_npc_table)
+from tutorialpkg.data_tools.pipeline import Pipeline
+from tutorialpkg.data_tools.profile import profile_csv, profile_dataframe
+from tutorialpkg.data_tools.schema import EVENTS_SCHEMA, read_with_schema
 
-def describe_dataframe(DataFrame):
+# file that the prepared data is saved to
+PREPARED_CSV = pathlib.Path(__file__).parent / 'tutorialpkg' / 'data' / 'paralympics_events_prepared.csv'
+
+def describe_dataframe(DataFrame, chunksize=None):
     """ Describe an imported data file stored in DataFrame format. Will print the shape, the head and tail
         the label of all columns, the data type of ech column, the dataframe information and descriptive statistics.
+        Everything is found in one pass over the data, so a csv file larger than memory can be described too.
  
         Parameters:
-            DataFrame (DataFrame): an imported csv or excel in dataframe format, to be described
+            DataFrame (DataFrame or Path): an imported csv or excel in dataframe format, or the path of a csv file, to
+                be described
+            chunksize (int): rows to read at a time from a csv file, optional
  
         Returns:
             none
     """
-    print(DataFrame.shape, "\n")
-    print(DataFrame.head(), "\n", DataFrame.tail(), "\n", sep="",)
-    print(DataFrame.columns, "\n")
-    print(DataFrame.dtypes, "\n")
-    print(DataFrame.info(), "\n")
-    print(DataFrame.describe(), "\n")
+    if isinstance(DataFrame, pd.DataFrame):
+        profile = profile_dataframe(DataFrame)
+    else:
+        profile = profile_csv(DataFrame, chunksize=chunksize or 100_000)
+    print(profile.shape, "\n")
+    print(profile.head, "\n", profile.tail, "\n", sep="",)
+    print(profile.columns, "\n")
+    print(profile.dtypes, "\n")
+    print(profile.info(), "\n")
+    print(profile.describe(), "\n")
     return
 
 def country_name(DF):
@@ -31,14 +59,9 @@ def country_name(DF):
         Returns:
             fixed_DF (DataFrame): modified dataframe with compatible country names
     """
-    replacement_names = {                               # dictionary of abbreviations and respective country names
-        'UK': 'Great Britain',
-        'USA': 'United States of America',
-        'Korea': 'Republic of Korea',
-        'Russia': 'Russian Federation',
-        'China': "People's Republic of China"
-    }
-    fixed_DF = DF.replace(to_replace=replacement_names)     # replace abbrreviations with values found in the dictionary
+    # abbreviations and respective country names are in data/country_aliases.csv
+    # only the 'country' column is changed, and each unique name is looked up once
+    fixed_DF = DF.assign(country=resolve_country_names(DF['country']))
     return(fixed_DF)
 
 def change_datatype(df):
@@ -60,47 +83,301 @@ def change_datatype(df):
             # print(f"change {column}")
             df[column] = df[column].astype(int)
 
-    # change date columns into appropriate DataFrame date format
-    df['start'] = pd.to_datetime(df['start'], format='%d/%m/%Y')
-    df['end'] = pd.to_datetime(df['end'], format='%d/%m/%Y')
+    # change date columns into appropriate DataFrame date format, unless they were read as dates using the schema
+    # the date codec parses each different date once and remembers it for the next call, e.g. the next chunk
+    for column in ['start', 'end']:
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = get_date_codec('%d/%m/%Y').to_datetime(df[column])
 
     # standardise 'type' column by removing whitespace and changing to lowercase
     df['type'] = df['type'].str.strip()
     df['type'] = df['type'].str.lower()
     return df
 
-def prepare_data(raw, npc):
-    """ Merge event data with the npc codes and prepare for further processing
+def drop_raw_rows(df, rows):
+    """ Delete rows by their row number in the raw file, ignoring numbers that are not in df """
+    to_drop = df.index.intersection(list(rows))
+    if to_drop.empty:
+        return df       # dropping no rows would still copy every column
+    return df.drop(index=to_drop)
+
+def add_npc_codes(df, npc):
+    """ Add the npc code for each country using the npc join index, in place of a merge with npc_codes
+
+        Parameters:
+            df (DataFrame): pandas dataframe with a 'country' column
+            npc (NpcLookup or DataFrame): indexed npc code lookup, or pandas dataframe with country codes
+ 
+        Returns:
+            df (DataFrame): dataframe with a 'Code' column
+    """
+    if not isinstance(npc, NpcLookup):
+        npc = NpcLookup.from_dataframe(npc)
+    df['Code'], unmatched = npc.join(df['country'])
+    # Countries with no npc code are found in the same pass as the codes
+    if unmatched:
+        print(f"Countries with no npc code: {', '.join(f'{name} ({rows} rows)' for name, rows in unmatched.items())}")
+    return df
+
+def drop_columns(df, columns):
+    """ Delete the unwanted columns """
+    return df.drop(columns=list(columns))
+
+def add_duration(df):
+    """ Insert extra column with the duration in days, after the 'end' column """
+    df.insert(df.columns.get_loc('end')+1, 'duration', (df['end'] - df['start']).dt.days.astype(int))
+    return df
+
+def write_csv(df, path):
+    """ Export dataframe to csv format """
+    df.to_csv(path, index = False)
+    return path
+
+@functools.lru_cache
+def create_prepare_pipeline(rows_to_drop=(0, 17, 31), output_csv=None, cache_dir=CACHE_DIR.joinpath('pipeline')):
+    """ Declare the preparation steps as the stages of a pipeline.
+        Each stage is timed, and its result is cached so that only the stages after a change run again.
+        The pipeline is created once for each set of arguments, so the results are also kept in memory between calls.
+
+        Parameters:
+            rows_to_drop (tuple): row numbers in the raw file to delete
+            output_csv (Path): csv file for the 'write_csv' stage, defaults to paralympics_events_prepared.csv
+            cache_dir (Path): directory for the cached stage results, None to only cache in memory
+ 
+        Returns:
+            pipeline (Pipeline): stages that use the sources 'raw' (event data) and 'npc' (npc codes)
+    """
+    pipeline = Pipeline(cache_dir)
+    pipeline.add('drop_columns', drop_columns, ['raw'], {'columns': ('URL', 'disabilities_included', 'highlights')})    # first, so the long text columns are not copied by the later steps
+    pipeline.add('country_names', country_name, ['drop_columns'], version=file_hash(COUNTRY_ALIASES_CSV))    # fix incompatible country names in the events_raw file, run again when the alias table changes
+    pipeline.add('drop_rows', drop_raw_rows, ['country_names'], {'rows': rows_to_drop})         # drop rows for Rome 1960 and events set in the future due to missing data, before the codes are added as the row numbers are those of the raw file
+    pipeline.add('npc_codes', add_npc_codes, ['drop_rows', 'npc'], version=NPC_JOIN_VERSION)
+    pipeline.add('dtypes', change_datatype, ['npc_codes'])                     # standardise datatypes for further processing
+    pipeline.add('duration', add_duration, ['dtypes'])
+    pipeline.add('write_csv', write_csv, ['duration'], {'path': output_csv or PREPARED_CSV}, cache=False)    # always runs, so the file is written even if the data is cached
+    pipeline.add('compact', optimise_dtypes, ['duration'])                   # only run when prepare_data(optimise=True), returns the data and the bytes saved
+    return pipeline
+
+def prepare_chunk(raw, npc, drop_rows=(0, 17, 31)):
+    """ Prepare one block of event data: fix the country names, add the npc codes, drop the unwanted
+        columns and rows, standardise the datatypes and add the duration column.
+        Used for each chunk by prepare_data_streaming() and prepare_data_incremental(), so the stages are not cached.
+
+        Parameters:
+            raw (DataFrame): pandas dataframe with event data, the index is the row number in the raw file
+            npc (NpcLookup or DataFrame): indexed npc code lookup, or pandas dataframe with country codes
+            drop_rows (list): row numbers in the raw file to delete
+ 
+        Returns:
+            df_prepared(DataFrame): merged and prepared dataframe
+    """
+    pipeline = create_prepare_pipeline(tuple(drop_rows), cache_dir=None)
+    return pipeline.run({'raw': raw, 'npc': npc}, targets=['duration'], use_cache=False)['duration']
+
+@instrumented('data_preparation.prepare_data')
+def prepare_data(raw, npc, low_memory=False, report_memory=False, optimise=False, metrics=()):
+    """ Merge event data with the npc codes and prepare for further processing.
+        Runs the cached preparation pipeline, so a stage only runs if its inputs or settings have changed.
+
+        For large exports use low_memory=True. Nothing is cached, each step changes the columns of the dataframe from
+        the step before rather than copying it (copy-on-write shares the columns that are not changed), and the
+        dataframe from each step is released once the next step has run.
 
         Parameters:
             raw (DataFrame): pandas dataframe with event data
-            npc (DataFrame): pandas dataframe with country codes
+            npc (NpcLookup or DataFrame): indexed npc code lookup, or pandas dataframe with country codes
+            low_memory (bool): keep as few copies of the data in memory as possible, rather than caching each step
+            report_memory (bool): print the time and the peak memory allocated, measured with tracemalloc, for each step
+            optimise (bool): downcast the integer columns and make the repeated text columns categorical, printing
+                the bytes saved for each column (see data_tools.dtypes). The saved csv is the same
+            metrics (list): names of derived metrics to add as columns, e.g. ['female_share'] (see data_tools.metrics).
+                They are memoised for the saved csv, so the charts and queries that read it use the same values
  
         Returns:
             df_prepared(DataFrame): merged and prepared dataframe
     """
-    # fix incompatible country names in the events_raw file
-    raw = country_name(raw)
+    pipeline = create_prepare_pipeline()
+    targets = ['compact', 'write_csv'] if optimise else ['duration', 'write_csv']
+    results = pipeline.run({'raw': raw, 'npc': npc}, targets=targets,      # the time for each stage is logged and kept in pipeline.timings
+                           low_memory=low_memory, trace_memory=report_memory)
+    if report_memory:
+        print(f"{'step':<15}{'status':<10}{'seconds':>10}{'peak MB':>10}")
+        for step, timing in pipeline.timings.items():
+            print(f"{step:<15}{timing['status']:<10}{timing['seconds']:>10.3f}{timing.get('peak_mb', 0):>10.1f}")
+    if optimise:
+        df_prepared, savings = results['compact']
+        print(describe_savings(savings))
+    else:
+        df_prepared = results['duration']
+    # the stages keep the row numbers of the raw file, which prepare_data_incremental() uses, the result is numbered 0..n-1
+    df_prepared = df_prepared.reset_index(drop=True)
+    if metrics:
+        # the version is that of the saved csv, which ParalympicsDataset uses when it reads the file
+        derived = DerivedMetrics(df_prepared, version=file_hash(results['write_csv']))
+        df_prepared = pd.concat([df_prepared, derived.to_frame(metrics)], axis=1)
+    return (df_prepared)
 
-    # merge events_raw with npc_codes
-    merged = raw.merge(npc, how='left', left_on='country', right_on='Name')
+def prepare_data_incremental(raw, npc, output_csv=None, drop_rows=(0, 17, 31)):
+    """ Prepare only the new or changed rows of the event data and merge them into the existing prepared csv.
+        A manifest of the content hash of each raw row is kept next to the output file (see data_tools.manifest).
+        Rows whose hash is in the manifest are taken from the existing prepared csv rather than prepared again.
+        When rows have only been added to the end of the raw data the new rows are appended to the prepared csv,
+        otherwise the prepared csv is written again in the order of the raw data.
 
-    # delete unwanted columns
-    df_prepared = merged.drop(columns=['URL', 'disabilities_included', 'highlights', 'Name'], axis=1)
+        Parameters:
+            raw (DataFrame): pandas dataframe with event data, the index is the row number in the raw file
+            npc (NpcLookup or DataFrame): indexed npc code lookup, or pandas dataframe with country codes
+            output_csv (Path): csv file for the prepared data, defaults to paralympics_events_prepared.csv
+            drop_rows (list): row numbers in the raw file to delete
 
-    # delete unwanted rows
-    df_prepared = df_prepared.drop(index=[0,17,31])     #  drop rows for Rome 1960 and events set in the future due to missing data
-    df_prepared = df_prepared.reset_index(drop=True)    # reset index of DF to skip dropped rows
+        Returns:
+            changes (dict): lists of the raw row numbers that were 'added', 'changed', 'removed' and 'unchanged'
+    """
+    output_csv = pathlib.Path(output_csv or PREPARED_CSV)
+    manifest_file = manifest.manifest_path(output_csv)
+    if not isinstance(npc, NpcLookup):
+        npc = NpcLookup.from_dataframe(npc)
 
-    # standardise datatypes for further processing 
-    df_prepared = change_datatype(df_prepared)
+    # dropped rows are not in the prepared file, so they are not in the manifest either
+    raw = raw.drop(index=raw.index.intersection(list(drop_rows)))
+    hashes = manifest.row_hashes(raw)
+    inputs = manifest.fingerprint(raw.columns, raw.dtypes.astype(str), npc.codes, npc.names,
+                                  load_country_aliases().items())
+    previous = manifest.read_manifest(manifest_file, inputs) if output_csv.is_file() else None
+    changes = manifest.compare(previous, hashes)
 
-    # insert extra column with duration data
-    df_prepared.insert(df_prepared.columns.get_loc('end')+1, 'duration', (df_prepared['end'] - df_prepared['start']).dt.days.astype(int))
-    
-    # export dataframe to csv format
-    df_prepared.to_csv(pathlib.Path(__file__).parent / 'tutorialpkg' / 'data' /'paralympics_events_prepared.csv', index = False)
-    return (df_prepared)
+    kept = len(previous) if previous is not None else 0
+    appended = kept and list(hashes.index[:kept]) == list(previous.index) and not changes['changed']
+    if appended:
+        # rows only added at the end, so prepare every added row, even one with the same contents as an earlier row
+        new_rows = hashes.index[kept:]
+    else:
+        # prepare the rows whose contents have not been prepared before, a row that has moved is found by its hash
+        new_rows = hashes.index if previous is None else hashes.index[~hashes.isin(previous.to_numpy())]
+    df_new = prepare_chunk(raw.loc[new_rows], npc, drop_rows=())
+
+    # remove the manifest while the csv is written, so an interrupted run prepares every row next time
+    manifest_file.unlink(missing_ok=True)
+    if appended:
+        # append the added rows to the existing file
+        df_new.to_csv(output_csv, mode='a', header=False, index=False)
+    elif kept:
+        # take the unchanged rows from the existing file, using the first row with each hash
+        df_previous = pd.read_csv(output_csv, parse_dates=['start', 'end'])
+        positions = pd.Series(range(kept), index=previous.to_numpy())
+        positions = positions[~positions.index.duplicated()]
+        reused = hashes[~hashes.index.isin(new_rows)]
+        df_reused = df_previous.iloc[positions.loc[reused.to_numpy()].to_numpy()].set_axis(reused.index)
+        df_prepared = pd.concat([df_reused, df_new]).loc[hashes.index]
+        df_prepared.to_csv(output_csv, index=False)
+    else:
+        df_new.to_csv(output_csv, index=False)
+    manifest.write_manifest(manifest_file, hashes, inputs)
+    return changes
+
+def prepare_data_streaming(raw_csv, npc, output_csv=None, chunksize=100_000, drop_rows=(0, 17, 31)):
+    """ Prepare an event data csv file in chunks, for files that are too large to read into memory.
+        Each chunk is prepared with prepare_chunk() and appended to the output csv, so peak memory depends on the
+        chunk size and not on the size of the file.
+
+        Parameters:
+            raw_csv (Path): csv file with the raw event data
+            npc (NpcLookup or DataFrame): indexed npc code lookup, or pandas dataframe with country codes
+            output_csv (Path): csv file for the prepared data, defaults to paralympics_events_prepared.csv
+            chunksize (int): number of rows read from the raw file at a time
+            drop_rows (list): row numbers in the raw file to delete
+ 
+        Returns:
+            rows (int): number of rows written to the output file
+    """
+    output_csv = output_csv or PREPARED_CSV
+    if not isinstance(npc, NpcLookup):
+        npc = NpcLookup.from_dataframe(npc)    # index the npc codes once rather than for every chunk
+    rows = 0
+    # the chunks keep counting the index from the previous chunk, so drop_rows refers to rows of the whole file
+    with pd.read_csv(raw_csv, chunksize=chunksize) as reader:
+        for i, chunk in enumerate(reader):
+            df_prepared = prepare_chunk(chunk, npc, drop_rows)
+            # write the header with the first chunk, then append
+            df_prepared.to_csv(output_csv, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            rows += len(df_prepared)
+    return rows
+
+def find_event_files(source, pattern='*.csv'):
+    """ Find the event data files to prepare in a batch
+
+        Parameters:
+            source (Path or str): a directory, a glob pattern such as 'events/*_2024.csv', or a single file
+            pattern (str): pattern of the files to use in a directory
+
+        Returns:
+            paths (list): the files, sorted by name so the batch is always in the same order
+    """
+    source = pathlib.Path(source)
+    if source.is_dir():
+        paths = source.glob(pattern)
+    elif source.is_file():
+        paths = [source]
+    else:
+        paths = map(pathlib.Path, glob.glob(str(source)))
+    return sorted(path for path in paths if path.is_file())
+
+def _init_batch_worker(npc_csv):
+    """ Load the npc lookup once in each worker process.
+        The npc table and its join index are memory-mapped feather files, so every worker reads the same pages
+        of the operating system's file cache rather than having its own copy of the codes.
+    """
+    get_npc_lookup(npc_csv)
+
+def _prepare_file(path, npc_csv, drop_rows):
+    """ Read and prepare one event data file in a worker process, returning the data and its timing """
+    start = time.perf_counter()
+    df_prepared = prepare_chunk(pd.read_csv(path), get_npc_lookup(npc_csv), drop_rows)
+    return df_prepared, {'rows': len(df_prepared), 'seconds': time.perf_counter() - start, 'worker': os.getpid()}
+
+def prepare_batch(source, npc_csv=NPC_CSV, output_csv=None, workers=None, drop_rows=(), pattern='*.csv'):
+    """ Prepare many event data files, e.g. one for each year or region, each file in a worker process.
+        The npc feather table is built once, before the workers start, and each worker memory-maps it read-only.
+        The prepared files are joined in file name order into one dataframe.
+
+        Parameters:
+            source (Path or str): a directory of event files, a glob pattern, or a single file
+            npc_csv (Path): the npc_codes.csv file
+            output_csv (Path): csv file to save the joined data to, None to not save it
+            workers (int): number of worker processes, defaults to the number of CPUs
+            drop_rows (list): row numbers to delete from every file
+            pattern (str): pattern of the files to use when source is a directory
+
+        Returns:
+            df_prepared (DataFrame): the prepared data of all the files
+            timings (dict): for each file, the number of 'rows', the 'seconds' taken and the 'worker' process id
+    """
+    paths = find_event_files(source, pattern)
+    if not paths:
+        raise FileNotFoundError(f"No event data files found for {source}")
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("The number of workers must be at least 1.")
+    # build the npc feather file and join index here, so the workers do not all build it at the same time
+    load_npc_table(npc_csv)
+
+    results = {}
+    timings = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths)), initializer=_init_batch_worker,
+                             initargs=(npc_csv,)) as executor:
+        futures = {executor.submit(_prepare_file, path, npc_csv, tuple(drop_rows)): path for path in paths}
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            results[path], timings[path] = future.result()
+            print(f"[{done}/{len(paths)}] {path.name}: {timings[path]['rows']} rows in "
+                  f"{timings[path]['seconds']:.3f} s")
+    print(f"Prepared {len(paths)} files in {time.perf_counter() - start:.3f} s with {min(workers, len(paths))} workers")
+
+    df_prepared = pd.concat([results[path] for path in paths], ignore_index=True)
+    if output_csv:
+        df_prepared.to_csv(output_csv, index=False)
+    return df_prepared, timings
 
 
 def main():
@@ -108,30 +385,34 @@ def main():
     Main logic for the program
     Reads the provided databases into DataFrame format
     """
-    # read events_raw.csv file into DF
-    try:
-        paralympics_events_csv = pathlib.Path(__file__).parent/'tutorialpkg'/'data'/'paralympics_events_raw.csv'      # store provided .csv file
-        paralympics_events = pd.read_csv(paralympics_events_csv)                                                      # read csv file into DataFrame
-    except FileNotFoundError as e:
-        print(f"CSV file not found. Please check the file path. Error: {e}")
-        exit()
+    # set display ooptions for pandas, here rather than on import so importing the module has no side effects
+    pd.set_option("display.max_columns", None)
 
-    #  read all.xlsx file into DF
-    try:
-        paralympics_all_xlsx = pathlib.Path(__file__).parent / 'tutorialpkg' /'data' / 'paralympics_all_raw.xlsx'            # store provided .xlsx file name
-        paralympics_all = pd.read_excel(paralympics_all_xlsx, sheet_name=0)                                                  # read first sheet of Excel file into DataFrame
-        medal_standings = pd.read_excel(paralympics_all_xlsx, sheet_name=1)                                                  # read second sheet of Excel file into DataFrame
-    except FileNotFoundError as e:
-        print(f"Excel file not found. Please check the file path. Error: {e}")
-        exit()
-    
-    # read npc_codes.csv file into DF
-    try:
-        npc_codes_csv = pathlib.Path(__file__).parent/'tutorialpkg'/'data'/'npc_codes.csv'      # store provided .csv file
-        npc_codes = pd.read_csv(npc_codes_csv, encoding='utf-8', encoding_errors='ignore', usecols=['Code', 'Name'])    # read csv file into DataFrame, accounting for encoding errors in csv file
-    except FileNotFoundError as e:
-        print(f"CSV file not found. Please check the file path. Error: {e}")
+    data_dir = pathlib.Path(__file__).parent / 'tutorialpkg' / 'data'
+    paralympics_events_csv = data_dir / 'paralympics_events_raw.csv'        # store provided .csv file
+    paralympics_all_xlsx = data_dir / 'paralympics_all_raw.xlsx'            # store provided .xlsx file name
+    npc_codes_csv = data_dir / 'npc_codes.csv'                              # store provided .csv file
+
+    # read all the files at the same time, each in its own thread
+    loaders = {
+        'events': lambda: read_with_schema(paralympics_events_csv, EVENTS_SCHEMA, cache=True),     # read csv file into DataFrame with the final column types, cached after the first run
+        'all': lambda: read_workbook_cached(paralympics_all_xlsx, [0, 1]),                         # open the Excel file once for both sheets
+        'npc': lambda: (load_npc_codes(['Code', 'Name'], npc_codes_csv),                           # read the normalised utf-8 copy of the csv file into DataFrame, built on the first run
+                        get_npc_lookup(npc_codes_csv)),                                            # indexes on 'Code' and 'Name' for O(1) lookups
+    }
+    data, errors = load_concurrently(loaders)
+
+    # report each file that was not found
+    not_found_messages = {'events': "CSV file not found", 'all': "Excel file not found", 'npc': "CSV file not found"}
+    for name, e in errors.items():
+        print(f"{not_found_messages[name]}. Please check the file path. Error: {e}")
+    if errors:
         exit()
+
+    paralympics_events = data['events']
+    paralympics_all = data['all'][0]            # first sheet of Excel file as DataFrame
+    medal_standings = data['all'][1]            # second sheet of Excel file as DataFrame
+    npc_codes, npc_lookup = data['npc']
     
     # call the function to describe the dataframe
     describe_dataframe(paralympics_events)
@@ -139,12 +420,27 @@ def main():
     describe_dataframe(medal_standings)
     describe_dataframe(npc_codes)
 
-    #  merge and prepare events_raw and npc_codes
-    prepared_df = prepare_data(paralympics_events, npc_codes)
+    #  merge and prepare events_raw and npc_codes, only preparing the rows that have changed since the last run
+    changes = prepare_data_incremental(paralympics_events, npc_lookup)
+    print(f"Prepared data saved to {PREPARED_CSV}: {manifest.describe_changes(changes)}")
     
     # print unique values
     # print(prepared_df['type'].unique())           # returns the name of every unique name in that catergory
     # print(prepared_df['type'].value_counts())     # counts the occurences of each
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)     # show the time taken to load each file
+    # with --batch, prepare a directory or glob of event files rather than paralympics_events_raw.csv
+    parser = argparse.ArgumentParser(description='Prepare the paralympics event data.')
+    parser.add_argument('--batch', help='directory or glob pattern of event csv files to prepare')
+    parser.add_argument('--workers', type=int, help='number of worker processes for --batch')
+    parser.add_argument('--output', type=pathlib.Path, default=PREPARED_CSV, help='csv file for the --batch data')
+    parser.add_argument('--instrument', type=pathlib.Path, help='directory to record the time and memory of each stage in')
+    parser.add_argument('--cprofile', action='store_true', help='with --instrument, also save cProfile statistics')
+    args = parser.parse_args()
+    if args.instrument:
+        instrument.enable(args.instrument, cprofile=args.cprofile)
+    if args.batch:
+        prepare_batch(args.batch, output_csv=args.output, workers=args.workers)
+    else:
+        main()
\ No newline at end of file
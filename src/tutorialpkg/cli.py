@@ -0,0 +1,140 @@
+"""Command line entry point for the paralympics data tasks.
+
+Installed as the 'paralympics' command (see [project.scripts] in pyproject.toml):
+
+    paralympics prepare [--raw RAW_CSV] [--output OUTPUT_CSV] [--excel OUTPUT_XLSX] [--chunksize N]
+    paralympics build-db [--data XLSX] [--db DB]
+    paralympics query "SELECT ..." [--db DB] [--metrics]
+    paralympics chart {timeseries,distribution,outliers} [--data CSV]
+
+    paralympics --instrument DIR [--cprofile] COMMAND ...   records the time and memory of each stage in DIR, see
+                                                            tutorialpkg.data_tools.instrument
+
+Files are written to the current working directory unless another path is given, as the package's data files may be
+temporary copies, e.g. for a zipped install. The query and chart commands read the files written by the other commands
+if they are in the current working directory, and otherwise the package's files.
+
+pandas, numpy and matplotlib take hundreds of milliseconds to import, so this module only imports the standard
+library at the top. Each subcommand imports the modules it needs when it runs, e.g. 'query' only needs sqlite3.
+"""
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+from tutorialpkg.data_tools.resources import DB_DATA_PACKAGE, find_data_file, output_path, resource_path
+
+
+def run_prepare(args):
+    """Prepare the raw event data and save it to a csv file."""
+    from tutorialpkg.data_tools.npc import load_npc_codes
+    from tutorialpkg.tutor_solution import tutorial2_refactored
+
+    df_npc = load_npc_codes(['Code', 'Name'])
+    rows = tutorial2_refactored.prepare_event_data_streaming(args.raw, args.output, df_npc, chunksize=args.chunksize,
+                                                             excel_path=args.excel)
+    print(f"Saved {rows} prepared rows to {args.output}{f' and {args.excel}' if args.excel else ''}")
+
+
+def run_build_db(args):
+    """Create the paralympics database from the Excel workbook."""
+    from tutorialpkg.week8_queries.create_query_db import create_db
+
+    cur, con = create_db(args.data, args.db)
+    con.close()
+    print(f'Created database {args.db}')
+
+
+def run_query(args):
+    """Run an SQL query on a database and print each row."""
+    if not Path(args.db).is_file():
+        # sqlite3.connect would create a new empty database
+        raise FileNotFoundError(f'Database file {args.db} does not exist.')
+    con = sqlite3.connect(args.db)
+    try:
+        if args.metrics:
+            from tutorialpkg.data_tools.dataset import ParalympicsDataset
+            from tutorialpkg.data_tools.metrics import DerivedMetrics, register_metrics_table
+
+            # The derived metrics of the prepared data, as a temporary table to join on year and type
+            register_metrics_table(con, DerivedMetrics(ParalympicsDataset()))
+        for row in con.execute(args.sql):
+            print(row)
+    finally:
+        con.close()
+
+
+def run_chart(args):
+    """Draw one of the charts from the week 3 activities."""
+    from tutorialpkg.data_tools.dataset import ParalympicsDataset
+    from tutorialpkg.tutor_solution import tutorial3
+
+    ds = ParalympicsDataset(args.data)
+    if args.kind == 'timeseries':
+        tutorial3.view_timeseries(ds, 'start', 'participants')
+    elif args.kind == 'distribution':
+        tutorial3.view_distribution(ds, ['participants_m', 'participants_f'])
+    else:
+        tutorial3.view_outliers(ds[['duration', 'participants_m', 'participants_f', 'participants']])
+
+
+def create_parser():
+    """Create the argument parser with a sub-parser for each command."""
+    parser = argparse.ArgumentParser(prog='paralympics', description='Paralympics data preparation and queries.')
+    parser.add_argument('--instrument', type=Path,
+                        help='directory to record the time, memory and rows of each stage in, as JSON lines and a '
+                             'collapsed-stack file for flame graphs')
+    parser.add_argument('--cprofile', action='store_true', help='with --instrument, also save cProfile statistics')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    prepare = subparsers.add_parser('prepare', help='prepare the raw event data')
+    prepare.add_argument('--raw', type=Path, default=resource_path('paralympics_events_raw.csv'))
+    prepare.add_argument('--output', type=Path, default=output_path('paralympics_events_prepared.csv'))
+    prepare.add_argument('--excel', type=Path, help='also save the prepared rows to this xlsx file')
+    prepare.add_argument('--chunksize', type=int, default=100_000, help='rows read at a time')
+    prepare.set_defaults(func=run_prepare)
+
+    build_db = subparsers.add_parser('build-db', help='create the paralympics database')
+    build_db.add_argument('--data', type=Path, default=resource_path('paralympics_all.xlsx', DB_DATA_PACKAGE))
+    build_db.add_argument('--db', type=Path, default=output_path('para_queries.db'))
+    build_db.set_defaults(func=run_build_db)
+
+    query = subparsers.add_parser('query', help='run an SQL query and print the rows')
+    query.add_argument('sql')
+    query.add_argument('--db', type=Path, default=find_data_file('para_queries.db', DB_DATA_PACKAGE))
+    query.add_argument('--metrics', action='store_true',
+                       help='add a temporary EventMetrics table of the derived metrics of the prepared data')
+    query.set_defaults(func=run_query)
+
+    chart = subparsers.add_parser('chart', help='draw a chart of the prepared data')
+    chart.add_argument('kind', choices=['timeseries', 'distribution', 'outliers'])
+    chart.add_argument('--data', type=Path, default=find_data_file('paralympics_events_prepared.csv'))
+    chart.set_defaults(func=run_chart)
+
+    return parser
+
+
+def main(argv=None):
+    """Run the command given on the command line.
+
+    Returns:
+        int: Exit status, 0 for success and 1 if a file was not found or a database query failed
+    """
+    args = create_parser().parse_args(argv)
+    if args.instrument:
+        from tutorialpkg.data_tools import instrument
+
+        instrument.enable(args.instrument, cprofile=args.cprofile)
+    try:
+        args.func(args)
+    except FileNotFoundError as e:
+        print(f'File not found. Please check the file path. Error: {e}', file=sys.stderr)
+        return 1
+    except sqlite3.Error as e:
+        print(f'An error occurred running the query. Error: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""Columnar on-disk cache for the raw paralympics data files.
+
+Parsing the .xlsx workbooks with openpyxl is slow compared to reading a binary columnar file. This module stores
+each parsed sheet or csv as a feather file in a cache directory. The cache entry is keyed by the source path and the
+read options, and is checked against the source file's modification time, size and content hash. If the source has
+not changed then the DataFrame is loaded from the feather file, otherwise the source is parsed again.
+
+The feather file keeps the index, column names and dtypes of the parsed DataFrame, so a cached read returns the same
+DataFrame as parsing the source. Each file is written to a temporary file and then renamed, so a run that is stopped
+part way through never leaves a partly written cache entry.
+
+The cache is in the user's cache directory rather than in the installed package. Set the PARALYMPICS_CACHE_DIR
+environment variable to use another directory, e.g. a temporary directory for the tests.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from pyarrow import feather
+
+from tutorialpkg.data_tools.workbook import read_workbook
+
+CACHE_DIR_ENV = 'PARALYMPICS_CACHE_DIR'
+# Location of the cache files, also used by the other modules that cache their results
+CACHE_DIR = Path(os.environ.get(CACHE_DIR_ENV) or
+                 Path(os.environ.get('XDG_CACHE_HOME') or Path.home().joinpath('.cache')).joinpath('paralympics'))
+
+
+def file_hash(file_path, chunk_size=1024 * 1024):
+    """Calculate the sha256 hash of the contents of a file.
+
+    Args:
+        file_path (Path): Path to the file
+        chunk_size (int): Number of bytes read at a time, so large files are not read into memory at once
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _cache_key(source, variant):
+    """Name of the cache entry for a source file read with a particular set of options."""
+    key_text = f'{Path(source).resolve()}|{variant}'
+    return hashlib.sha1(key_text.encode('utf-8')).hexdigest()
+
+
+def _cache_files(source, key_text, cache_dir):
+    """Paths of the feather data file and json metadata file for a cache entry."""
+    cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+    key = _cache_key(source, key_text)
+    return cache_dir.joinpath(f'{key}.feather'), cache_dir.joinpath(f'{key}.json')
+
+
+def _read_data(data_file):
+    """Read a cached DataFrame, with the index and column names it was saved with."""
+    return feather.read_table(data_file).to_pandas()
+
+
+def _load_entry(source, stat, data_file, meta_file):
+    """Load a cache entry if it matches the source file.
+
+    Returns:
+        tuple: (DataFrame or None, sha256 of the source or None if it was not needed)
+    """
+    if not (data_file.is_file() and meta_file.is_file()):
+        return None, None
+    try:
+        meta = json.loads(meta_file.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        return None, None
+    # Fast check: the file has not been touched since the cache was written
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return _read_data(data_file), None
+    # The file has been touched, so compare the contents
+    content_hash = file_hash(source)
+    if meta['sha256'] == content_hash:
+        _write_meta(source, stat, content_hash, meta_file)
+        return _read_data(data_file), content_hash
+    return None, content_hash
+
+
+def _write_atomically(path, write):
+    """Call write(temp_path) for a temporary file next to path, then rename it to path.
+
+    The rename replaces the old file in one step, so other readers see either the old or the new file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f'{path.name}.', suffix='.tmp', dir=path.parent)
+    os.close(fd)
+    temp_path = Path(temp_name)
+    try:
+        write(temp_path)
+        temp_path.replace(path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _write_meta(source, stat, content_hash, meta_file):
+    """Write the metadata that is used to check a cache entry is still valid."""
+    meta = {'source': str(Path(source).resolve()), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+            'sha256': content_hash}
+    _write_atomically(meta_file, lambda path: path.write_text(json.dumps(meta), encoding='utf-8'))
+
+
+def _store_entry(df, source, stat, content_hash, data_file, meta_file):
+    """Save a parsed DataFrame and its metadata to the cache.
+
+    The data is written before the metadata, so an entry whose data was not replaced fails the metadata check.
+    """
+    # pyarrow saves the index and the column names in the file's pandas metadata
+    _write_atomically(data_file, lambda path: feather.write_feather(df, path, compression='uncompressed'))
+    _write_meta(source, stat, content_hash or file_hash(source), meta_file)
+
+
+def cached_read(source, reader, variant='', cache_dir=None, **kwargs):
+    """Read a data file using a cached columnar copy where the source has not changed.
+
+    Args:
+        source (Path): Path to the csv or xlsx file
+        reader (function): Function that parses the source, e.g. pd.read_csv, called as reader(source, **kwargs)
+        variant (str): Extra text for the cache key, e.g. the sheet name, so each sheet has its own entry
+        cache_dir (Path): Optional. Directory for the cache files. Defaults to CACHE_DIR
+        **kwargs: Keyword arguments passed to the reader
+
+    Returns:
+        DataFrame: The parsed data
+
+    Raises:
+        FileNotFoundError: If the source file does not exist
+    """
+    source = Path(source)
+    # stat() raises FileNotFoundError for a missing source, the same as the pandas readers
+    stat = source.stat()
+    data_file, meta_file = _cache_files(source, f'{reader.__name__}|{variant}|{sorted(kwargs.items())}', cache_dir)
+    df, content_hash = _load_entry(source, stat, data_file, meta_file)
+    if df is None:
+        df = reader(source, **kwargs)
+        _store_entry(df, source, stat, content_hash, data_file, meta_file)
+    return df
+
+
+def read_csv_cached(source, cache_dir=None, **kwargs):
+    """Read a csv file into a DataFrame using the columnar cache.
+
+    Args:
+        source (Path): Path to the csv file
+        cache_dir (Path): Optional. Directory for the cache files
+        **kwargs: Keyword arguments passed to pd.read_csv
+
+    Returns:
+        DataFrame: The parsed data
+    """
+    return cached_read(source, pd.read_csv, cache_dir=cache_dir, **kwargs)
+
+
+def read_excel_cached(source, sheet_name=0, cache_dir=None, **kwargs):
+    """Read a sheet of an Excel file into a DataFrame using the columnar cache.
+
+    Args:
+        source (Path): Path to the xlsx file
+        sheet_name (str or int): Name or position of the sheet to read
+        cache_dir (Path): Optional. Directory for the cache files
+        **kwargs: Keyword arguments passed to pd.read_excel
+
+    Returns:
+        DataFrame: The parsed data
+    """
+    return cached_read(source, pd.read_excel, variant=f'sheet={sheet_name}', cache_dir=cache_dir,
+                       sheet_name=sheet_name, **kwargs)
+
+
+def read_workbook_cached(source, sheets, columns=None, cache_dir=None):
+    """Read several sheets of a workbook using the columnar cache.
+
+    Sheets found in the cache are loaded from it. All the other sheets are parsed together with read_workbook(), so
+    the workbook is opened at most once.
+
+    Args:
+        source (Path): Path to the xlsx file
+        sheets (list): Sheet names (str) or positions (int) to read
+        columns (dict): Optional. Maps a sheet to the list of columns to read from it
+        cache_dir (Path): Optional. Directory for the cache files
+
+    Returns:
+        dict: The DataFrame for each sheet, keyed by the values given in 'sheets'
+    """
+    source = Path(source)
+    stat = source.stat()
+    columns = columns or {}
+    dfs = {}
+    to_read = {}
+    content_hash = None
+    for sheet in sheets:
+        files = _cache_files(source, f'read_workbook|sheet={sheet}|{columns.get(sheet)}', cache_dir)
+        df, entry_hash = _load_entry(source, stat, *files)
+        content_hash = content_hash or entry_hash
+        if df is None:
+            to_read[sheet] = files
+        else:
+            dfs[sheet] = df
+
+    if to_read:
+        parsed = read_workbook(source, list(to_read), columns)
+        content_hash = content_hash or file_hash(source)
+        for sheet, files in to_read.items():
+            _store_entry(parsed[sheet], source, stat, content_hash, *files)
+        dfs.update(parsed)
+
+    # Return the sheets in the order they were requested
+    return {sheet: dfs[sheet] for sheet in sheets}
+
+
+def clear_cache(cache_dir=None):
+    """Delete all the cache files.
+
+    Args:
+        cache_dir (Path): Optional. Directory for the cache files. Defaults to CACHE_DIR
+    """
+    cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+    if cache_dir.is_dir():
+        for cache_file in cache_dir.glob('*'):
+            if cache_file.suffix in ('.feather', '.json'):
+                cache_file.unlink()
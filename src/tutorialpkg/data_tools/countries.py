@@ -0,0 +1,65 @@
+"""Resolve the short country names used in the event data to the names used in npc_codes.csv.
+
+The event data uses names such as 'UK' and 'USA', which have to be replaced before the NPC codes can be found.
+The aliases are kept in country_aliases.csv rather than in the code, so both preparation paths use the same table.
+
+resolve_country_names() works on one column. Each unique value is looked up once, and the result is spread back to the
+rows using the integer codes of the column. For a categorical column the codes are the category codes, so no values
+are compared at all.
+"""
+import csv
+import functools
+
+import numpy as np
+import pandas as pd
+
+from tutorialpkg.data_tools.resources import resource_path
+
+COUNTRY_ALIASES_CSV = resource_path('country_aliases.csv')
+
+
+@functools.lru_cache
+def load_country_aliases(csv_path=COUNTRY_ALIASES_CSV):
+    """Read the alias table, which has an 'alias' and a 'name' column.
+
+    Args:
+        csv_path (Path): The country_aliases.csv file
+
+    Returns:
+        dict: The name for each alias, e.g. {'UK': 'Great Britain'}
+
+    Raises:
+        FileNotFoundError: If the csv file does not exist
+    """
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        return {row['alias'].strip(): row['name'].strip() for row in csv.DictReader(f)}
+
+
+def resolve_country_names(countries, aliases=None):
+    """Replace the aliases in a column of country names with the full names.
+
+    Args:
+        countries (Series): Country names, as strings or categorical
+        aliases (dict): Optional. The name for each alias. Defaults to the table in country_aliases.csv
+
+    Returns:
+        Series: The resolved names, with the same index and dtype as countries
+    """
+    if aliases is None:
+        aliases = load_country_aliases()
+    categorical = isinstance(countries.dtype, pd.CategoricalDtype)
+    if categorical:
+        codes, uniques = countries.cat.codes.to_numpy(), countries.cat.categories
+    else:
+        codes, uniques = pd.factorize(countries)
+    names = [aliases.get(value, value) for value in uniques]
+
+    if categorical:
+        # An alias and its name may both be categories, so find the new categories and recode
+        name_codes, categories = pd.factorize(pd.Index(names, dtype=uniques.dtype))
+        new_codes = np.append(name_codes, -1).take(codes)
+        return pd.Series(pd.Categorical.from_codes(new_codes, categories), index=countries.index, name=countries.name)
+
+    # factorize gives -1 for missing values, which takes the NaN added to the end
+    resolved = np.array(names + [np.nan], dtype=object).take(codes)
+    return pd.Series(resolved, index=countries.index, name=countries.name, dtype=countries.dtype)
@@ -0,0 +1,131 @@
+"""Lazy dataset handle for the prepared paralympics data.
+
+Most charts only need two or three columns of paralympics_events_prepared.csv. ParalympicsDataset reads the column
+names when it is created, and reads the data for a column the first time that column is used. Loaded columns are
+kept, so each column is read from the file at most once. Filtered views, e.g. the summer events only, share the
+loaded columns of the dataset they were created from.
+
+The dataset can be used in place of a DataFrame for the common operations used in the charts:
+    ds['participants']                    a column as a Series
+    ds[['start', 'participants']]         a DataFrame with the listed columns
+    ds[ds['type'] == 'summer']            a filtered view of the dataset
+Any other DataFrame attribute, e.g. ds.hist(), loads all the columns and uses the full DataFrame.
+"""
+from pathlib import Path
+
+import pandas as pd
+from pyarrow import feather
+
+from tutorialpkg.data_tools.resources import resource_path
+
+PREPARED_CSV = resource_path('paralympics_events_prepared.csv')
+DATE_COLUMNS = ['start', 'end']
+
+
+class ParalympicsDataset:
+    """Lazily loaded, column by column, view of the prepared paralympics data.
+
+    Args:
+        source (Path): csv or feather file with the prepared data. Defaults to paralympics_events_prepared.csv
+
+    Raises:
+        FileNotFoundError: If the source file does not exist
+    """
+
+    def __init__(self, source=PREPARED_CSV, _parent=None, _mask=None):
+        self.source = Path(source)
+        self._parent = _parent
+        self._mask = _mask
+        # Loaded columns, by name
+        self._columns = {}
+        if _parent is None:
+            # Reading only the header also checks that the file exists
+            if self.source.suffix == '.feather':
+                self.columns = feather.read_table(self.source, columns=[], memory_map=True).schema.names
+            else:
+                self.columns = pd.read_csv(self.source, nrows=0).columns.tolist()
+        else:
+            self.columns = _parent.columns
+
+    def _read_columns(self, names):
+        """Read the listed columns from the source file in one pass."""
+        if self.source.suffix == '.feather':
+            return feather.read_table(self.source, columns=names, memory_map=True).to_pandas()
+        dates = [col for col in DATE_COLUMNS if col in names]
+        # The pyarrow parser only converts the columns that are asked for
+        return pd.read_csv(self.source, usecols=names, parse_dates=dates, engine='pyarrow')
+
+    def load(self, names):
+        """Make sure the listed columns are loaded, reading any that are not in one pass.
+
+        Args:
+            names (list): Column names
+
+        Raises:
+            KeyError: If a column is not in the dataset
+        """
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise KeyError(f'Columns {unknown} are not in the dataset.')
+        missing = [name for name in names if name not in self._columns]
+        if not missing:
+            return
+        if self._parent is None:
+            df = self._read_columns(missing)
+            for name in missing:
+                self._columns[name] = df[name]
+        else:
+            # A view filters the columns loaded by the dataset it came from
+            self._parent.load(missing)
+            for name in missing:
+                self._columns[name] = self._parent._columns[name][self._mask]
+
+    @property
+    def loaded_columns(self):
+        """The names of the columns that have been loaded."""
+        return list(self._columns)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            self.load([key])
+            return self._columns[key]
+        if isinstance(key, pd.Series) and key.dtype == bool:
+            return self.filter(key)
+        names = list(key)
+        self.load(names)
+        return pd.DataFrame({name: self._columns[name] for name in names})
+
+    def __len__(self):
+        if self._mask is not None:
+            return int(self._mask.sum())
+        # Any column gives the number of rows
+        return len(self[self.loaded_columns[0] if self._columns else self.columns[0]])
+
+    def filter(self, mask):
+        """Return a view of the rows where mask is True.
+
+        Args:
+            mask (Series): Boolean Series with the same index as this dataset, e.g. ds['type'] == 'summer'
+
+        Returns:
+            ParalympicsDataset: The filtered view, which shares the loaded columns of this dataset
+        """
+        if self._mask is not None:
+            # Combine with this view's filter so the view reads from the full dataset
+            mask = self._mask & mask.reindex(self._mask.index, fill_value=False)
+        root = self if self._parent is None else self._parent
+        return ParalympicsDataset(self.source, _parent=root, _mask=mask)
+
+    def where(self, column, value):
+        """Return a view of the rows where column == value, e.g. ds.where('type', 'summer')."""
+        return self.filter(self[column] == value)
+
+    def to_frame(self, columns=None):
+        """Return a DataFrame with the listed columns, or all columns if None."""
+        return self[columns or self.columns]
+
+    def __getattr__(self, name):
+        # Called only for attributes the dataset does not have, e.g. plot or hist, so use the full DataFrame
+        if name.startswith('_') or name in ('columns', 'source'):
+            raise AttributeError(name)
+        return getattr(self.to_frame(), name)
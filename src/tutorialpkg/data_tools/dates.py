@@ -0,0 +1,121 @@
+"""Date parsing with a memo table, compact day-number storage and vectorised date formatting.
+
+The event data has a small number of different dates, each repeated on many rows. pd.to_datetime(format=...) parses
+the text on every row and .dt.strftime() formats every row again. DateCodec parses each different date string once and
+keeps the result in a memo table, so later calls, e.g. for the next chunk of a large file, only parse dates that have
+not been seen before. The results are spread back to the rows with an integer take.
+
+Dates can be returned as:
+    int32 day numbers (days since 1970-01-01), 4 bytes a date, with MISSING_DAY for missing dates
+    numpy datetime64[D] arrays, 8 bytes a date
+    pandas datetime Series, the same type as pd.to_datetime returns
+
+format_dates() turns dates into text for SQLite, formatting each different date once. ISO text (YYYY-MM-DD) is made
+by numpy rather than strftime.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+ISO_FORMAT = '%Y-%m-%d'
+# Day number used for a missing date
+MISSING_DAY = np.iinfo(np.int32).min
+
+
+class DateCodec:
+    """Parse date strings in one format, parsing each different string once.
+
+    Args:
+        date_format (str): The strptime format of the text, e.g. '%d/%m/%Y'
+    """
+
+    def __init__(self, date_format='%d/%m/%Y'):
+        self.date_format = date_format
+        # The day number of each date string that has been parsed
+        self._memo = {}
+
+    def __len__(self):
+        """Number of different date strings in the memo table."""
+        return len(self._memo)
+
+    def day_numbers(self, values):
+        """Parse date strings to day numbers.
+
+        Args:
+            values (Series or array): Date strings, or a categorical of date strings. Missing values are allowed
+
+        Returns:
+            ndarray: int32 days since 1970-01-01, with MISSING_DAY for missing values
+
+        Raises:
+            ValueError: If a string does not match the date format
+        """
+        codes, uniques = pd.factorize(values)
+        new = [text for text in uniques if text not in self._memo]
+        if new:
+            parsed = pd.to_datetime(pd.Index(new, dtype=object), format=self.date_format)
+            days = parsed.to_numpy().astype('datetime64[D]').astype(np.int64).astype(np.int32)
+            self._memo.update(zip(new, days.tolist()))
+        unique_days = np.fromiter((self._memo[text] for text in uniques), dtype=np.int32, count=len(uniques))
+        # factorize gives -1 for missing values, which takes the MISSING_DAY added to the end
+        return np.append(unique_days, np.int32(MISSING_DAY)).take(codes)
+
+    def to_datetime64(self, values):
+        """Parse date strings to a numpy datetime64[D] array, with NaT for missing values."""
+        return days_to_datetime64(self.day_numbers(values))
+
+    def to_datetime(self, values):
+        """Parse date strings to a pandas datetime Series, in place of pd.to_datetime(values, format=date_format).
+
+        Args:
+            values (Series): Date strings
+
+        Returns:
+            Series: The dates, with the same index and name as values
+        """
+        dates = self.to_datetime64(values).astype('datetime64[us]')
+        return pd.Series(dates, index=getattr(values, 'index', None), name=getattr(values, 'name', None))
+
+
+@functools.lru_cache
+def get_date_codec(date_format='%d/%m/%Y'):
+    """Return the shared DateCodec for a format, so every caller uses the same memo table."""
+    return DateCodec(date_format)
+
+
+def days_to_datetime64(days):
+    """Convert int32 day numbers to a datetime64[D] array, with NaT for MISSING_DAY."""
+    days = np.asarray(days)
+    dates = days.astype('datetime64[D]')
+    dates[days == MISSING_DAY] = np.datetime64('NaT', 'D')
+    return dates
+
+
+def format_dates(dates, date_format=ISO_FORMAT):
+    """Format dates as text, e.g. to save them in a SQLite TEXT column.
+
+    Args:
+        dates (Series or array): Dates as pandas datetimes, datetime64 values or int32 day numbers
+        date_format (str): strftime format. Defaults to ISO text, YYYY-MM-DD, which SQLite date functions understand
+
+    Returns:
+        Series: The text for each date, None for missing dates. Same index as dates if it is a Series
+    """
+    index = getattr(dates, 'index', None)
+    values = np.asarray(dates)
+    if np.issubdtype(values.dtype, np.integer):
+        days = days_to_datetime64(values)
+    else:
+        days = values.astype('datetime64[D]')
+
+    # Format each different date once, then spread the text back to the rows
+    codes, uniques = pd.factorize(days)
+    if date_format == ISO_FORMAT:
+        # numpy writes ISO dates without calling strftime
+        unique_text = np.datetime_as_string(np.asarray(uniques, dtype='datetime64[D]'), unit='D').astype(object)
+    else:
+        unique_text = pd.DatetimeIndex(uniques).strftime(date_format).to_numpy(dtype=object)
+    # factorize gives -1 for missing dates, which takes the None added to the end
+    text = np.append(unique_text, None).take(codes)
+    return pd.Series(text, index=index, dtype=object)
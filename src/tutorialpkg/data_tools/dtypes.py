@@ -0,0 +1,86 @@
+"""Reduce the memory used by a DataFrame by choosing smaller column data types.
+
+After preparation the count columns, e.g. 'participants' and 'year', are int64 and the text columns, e.g. 'type' and
+'country', are strings stored once per row. optimise_dtypes() changes:
+    integer columns to the smallest signed integer type that holds every value, e.g. int16 for 'year'. Unsigned
+        columns stay unsigned. Nullable 'Int64' columns become 'Int8', 'Int16' or 'Int32', so missing values are kept.
+        A column that is already as small as it can be is not changed
+    text columns with few different values to 'category', which stores each different value once and an integer code
+        for each row
+
+Float, date and boolean columns are not changed. The values are the same after the change, so the saved csv is too.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _smallest_integer(values):
+    """Return the smallest integer dtype that holds the values, keeping nullable types nullable.
+
+    Unsigned columns are given the smallest unsigned type and signed columns the smallest signed type. The dtype of the
+    values is returned if no type is smaller.
+    """
+    nullable = isinstance(values.dtype, pd.api.extensions.ExtensionDtype)
+    if values.isna().all():
+        return values.dtype
+    low, high = values.min(), values.max()
+    unsigned = pd.api.types.is_unsigned_integer_dtype(values.dtype)
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64) if unsigned else (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            if info.bits >= np.dtype(values.dtype.numpy_dtype if nullable else values.dtype).itemsize * 8:
+                return values.dtype
+            # The nullable types are named e.g. 'UInt8' and 'Int8'
+            name = f"{'U' if unsigned else ''}Int{info.bits}" if nullable else dtype
+            return pd.api.types.pandas_dtype(name)
+    return values.dtype
+
+
+def optimise_dtypes(df, max_category_ratio=0.5, exclude=()):
+    """Downcast the integer columns and make the text columns with few different values categorical.
+
+    Args:
+        df (DataFrame): The data
+        max_category_ratio (float): A text column becomes categorical if its number of different values is at most
+            this fraction of the number of rows
+        exclude (list): Columns not to change
+
+    Returns:
+        tuple: (DataFrame with the new dtypes,
+                DataFrame of the 'dtype', 'new_dtype', 'bytes', 'new_bytes' and 'bytes_saved' of each column)
+
+    Raises:
+        ValueError: If max_category_ratio is not between 0 and 1
+    """
+    if not 0 <= max_category_ratio <= 1:
+        raise ValueError('max_category_ratio must be between 0 and 1.')
+    changes = {}
+    for column in df.columns:
+        values = df[column]
+        if column in exclude or isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(values.dtype):
+            dtype = _smallest_integer(values)
+        elif pd.api.types.is_string_dtype(values.dtype) and pd.api.types.infer_dtype(values, skipna=True) == 'string':
+            low_cardinality = len(values) and values.nunique() <= max_category_ratio * len(values)
+            dtype = 'category' if low_cardinality else values.dtype
+        else:
+            continue
+        if dtype != values.dtype:
+            changes[column] = dtype
+
+    old_dtypes = df.dtypes.astype(str)
+    before = df.memory_usage(index=False, deep=True)
+    df = df.astype(changes) if changes else df
+    after = df.memory_usage(index=False, deep=True)
+    savings = pd.DataFrame({'dtype': old_dtypes, 'new_dtype': df.dtypes.astype(str), 'bytes': before,
+                            'new_bytes': after, 'bytes_saved': before - after})
+    return df, savings
+
+
+def describe_savings(savings):
+    """Return a table of the memory saved for each column by optimise_dtypes(), with the total."""
+    total = savings[['bytes', 'new_bytes', 'bytes_saved']].sum()
+    percent = 100 * total['bytes_saved'] / total['bytes'] if total['bytes'] else 0
+    return (f"{savings.to_string()}\n"
+            f"Total: {total['bytes']:,} bytes to {total['new_bytes']:,} bytes, {percent:.0f}% saved")
@@ -0,0 +1,283 @@
+"""Save prepared data in several file formats, writing the formats at the same time.
+
+Formats:
+    csv       plain text, the same as DataFrame.to_csv(index=False)
+    csv.gz    gzip compressed csv
+    csv.zst   zstd compressed csv, compressed by pyarrow so the zstandard package is not needed
+    parquet   columnar and compressed, keeps the column types
+    feather   Arrow IPC, the fastest to write and to read back with memory mapping
+    xlsx      Excel workbook, written by write_xlsx()
+
+DataFrame.to_excel() builds every cell as an openpyxl object before saving, which is slow and holds the whole sheet in
+memory. write_xlsx() writes the sheet XML straight into the zip file a block of rows at a time, making the XML text for
+each column with vectorised string operations, so memory use depends on the block size rather than the number of rows.
+
+export_dataframe() writes each format in its own thread. Writing parquet and feather, and the gzip and zstd
+compression, release the GIL, so they run at the same time as the csv and xlsx text is made. The time taken, file size
+and throughput of each format is returned so the formats can be compared.
+"""
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather, parquet
+
+EXPORT_FORMATS = ('csv', 'csv.gz', 'csv.zst', 'parquet', 'feather', 'xlsx')
+
+# Excel stores dates as the number of days since 1899-12-30
+_EXCEL_EPOCH = np.datetime64('1899-12-30', 'us')
+_EXCEL_MAX_ROWS = 1_048_576
+_XML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+# Characters that are not allowed in XML 1.0
+_XML_INVALID = r'[\x00-\x08\x0b\x0c\x0e-\x1f]'
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'),
+    # Style 1 is the date and time format used by DataFrame.to_excel()
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd\\ hh:mm:ss"/></numFmts>'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'),
+}
+_SHEET_START = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+_SHEET_END = '</sheetData></worksheet>'
+
+
+def export_path(base_path, file_format):
+    """Return the file path for a format, e.g. ('prepared.csv', 'csv.gz') -> 'prepared.csv.gz'.
+
+    Only an export format's suffix is removed from the name, so 'events.v2.csv' becomes 'events.v2.parquet'.
+    """
+    base_path = Path(base_path)
+    name = base_path.name
+    # The longest suffix first, so 'csv.gz' is removed rather than only 'gz'
+    for suffix in sorted(EXPORT_FORMATS, key=len, reverse=True):
+        if name.endswith(f'.{suffix}'):
+            name = name[:-len(suffix) - 1]
+            break
+    return base_path.with_name(f'{name}.{file_format}')
+
+
+def _escape(text):
+    """Escape a Series of strings for XML text."""
+    text = text.str.replace(_XML_INVALID, '', regex=True)
+    for char, escaped in _XML_ESCAPES.items():
+        text = text.str.replace(char, escaped, regex=False)
+    return text
+
+
+def _column_letter(i):
+    """Return the Excel column letters for a 0-based column number, e.g. 0 -> 'A', 26 -> 'AA'."""
+    letters = ''
+    i += 1
+    while i:
+        i, remainder = divmod(i - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_cells(values, refs):
+    """Return the cell XML for each value in a column, and '' for missing values.
+
+    Args:
+        values (Series): One column of a block of rows
+        refs (Series): The cell reference of each row, e.g. 'B12'
+
+    Returns:
+        Series: Cell XML strings
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        values = values.astype(dtype.categories.dtype)
+        dtype = values.dtype
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(dtype):
+        text = pd.Series(np.where(values.fillna(False).to_numpy(dtype=bool), '1', '0'), index=values.index)
+        cells = '<c r="' + refs + '" t="b"><v>' + text + '</v></c>'
+    elif pd.api.types.is_datetime64_dtype(dtype):
+        days = (values.to_numpy(dtype='datetime64[us]') - _EXCEL_EPOCH) / np.timedelta64(1, 'D')
+        cells = '<c r="' + refs + '" s="1"><v>' + pd.Series(days, index=values.index).astype(str) + '</v></c>'
+    elif pd.api.types.is_numeric_dtype(dtype):
+        numbers = values.to_numpy(dtype=float, na_value=np.nan)
+        missing = missing | ~np.isfinite(numbers)
+        text = values.astype(str) if pd.api.types.is_integer_dtype(dtype) else pd.Series(numbers).astype(str)
+        cells = '<c r="' + refs + '"><v>' + text.set_axis(values.index) + '</v></c>'
+    else:
+        text = _escape(values.astype(str))
+        cells = '<c r="' + refs + '" t="inlineStr"><is><t xml:space="preserve">' + text + '</t></is></c>'
+    return cells.astype(object).where(~missing, '')
+
+
+def _xlsx_rows(df, first_row):
+    """Return the sheet XML for a block of rows, where first_row is the Excel row number of the first one."""
+    row_numbers = pd.Series(np.arange(first_row, first_row + len(df)), index=df.index).astype(str)
+    xml = '<row r="' + row_numbers + '">'
+    for i, column in enumerate(df.columns):
+        xml = xml + _xlsx_cells(df[column], _column_letter(i) + row_numbers)
+    return ''.join((xml + '</row>').tolist())
+
+
+def _blocks(frames, chunksize):
+    """Split a DataFrame into blocks of rows, or pass through an iterable of DataFrames."""
+    if isinstance(frames, pd.DataFrame):
+        for start in range(0, max(len(frames), 1), chunksize):
+            yield frames.iloc[start:start + chunksize]
+    else:
+        yield from frames
+
+
+def write_xlsx(frames, path, sheet_name='Sheet1', chunksize=10_000):
+    """Save data to an Excel workbook, writing the sheet XML a block of rows at a time.
+
+    Reading the file with pd.read_excel() gives the same data as a file saved by DataFrame.to_excel(index=False).
+
+    Args:
+        frames (DataFrame or iterable): The data, or an iterable of DataFrames with the same columns, e.g. chunks
+        path (Path): The xlsx file to save
+        sheet_name (str): Name of the worksheet
+        chunksize (int): Number of rows of a DataFrame converted to XML at a time
+
+    Returns:
+        int: Number of data rows written
+
+    Raises:
+        ValueError: If there are more rows than an Excel sheet can hold
+    """
+    workbook = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                f'<sheets><sheet name="{_escape(pd.Series([sheet_name]))[0]}" sheetId="1" r:id="rId1"/></sheets>'
+                '</workbook>')
+    rows = 0
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in _XLSX_PARTS.items():
+            zf.writestr(name, xml)
+        zf.writestr('xl/workbook.xml', workbook)
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(_SHEET_START.encode('utf-8'))
+            for df in _blocks(frames, chunksize):
+                if rows == 0:
+                    header = pd.DataFrame([[str(c) for c in df.columns]], columns=df.columns, dtype=object)
+                    sheet.write(_xlsx_rows(header, 1).encode('utf-8'))
+                if rows + len(df) + 1 > _EXCEL_MAX_ROWS:
+                    raise ValueError(f'An Excel sheet can only hold {_EXCEL_MAX_ROWS - 1} rows of data.')
+                sheet.write(_xlsx_rows(df, rows + 2).encode('utf-8'))
+                rows += len(df)
+            sheet.write(_SHEET_END.encode('utf-8'))
+    return rows
+
+
+def write_dataframe(df, path, file_format):
+    """Save a DataFrame in one of the EXPORT_FORMATS, without the index.
+
+    Args:
+        df (DataFrame): The data to save
+        path (Path): The file to save
+        file_format (str): One of EXPORT_FORMATS
+
+    Raises:
+        ValueError: If the format is not one of EXPORT_FORMATS
+    """
+    if file_format == 'csv':
+        df.to_csv(path, index=False)
+    elif file_format == 'csv.gz':
+        df.to_csv(path, index=False, compression='gzip')
+    elif file_format == 'csv.zst':
+        with pa.CompressedOutputStream(str(path), 'zstd') as stream:
+            df.to_csv(stream, index=False)
+    elif file_format in ('parquet', 'feather'):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if file_format == 'parquet':
+            parquet.write_table(table, path)
+        else:
+            feather.write_feather(table, path)
+    elif file_format == 'xlsx':
+        write_xlsx(df, path)
+    else:
+        raise ValueError(f"Invalid file type {file_format}. Please specify one of {', '.join(EXPORT_FORMATS)}.")
+
+
+def _timed_write(df, path, file_format):
+    """Save a DataFrame and return the time taken, file size and throughput."""
+    start = time.perf_counter()
+    write_dataframe(df, path, file_format)
+    seconds = time.perf_counter() - start
+    size = Path(path).stat().st_size
+    return {'path': Path(path), 'seconds': seconds, 'bytes': size,
+            'rows_per_second': len(df) / seconds if seconds else float('inf'),
+            'mb_per_second': size / 1024 ** 2 / seconds if seconds else float('inf')}
+
+
+def export_dataframe(df, base_path, formats=('csv',), max_workers=None):
+    """Save a DataFrame in several formats, each format in its own thread.
+
+    Args:
+        df (DataFrame): The data to save
+        base_path (Path): The file path without the format, e.g. data/prepared gives data/prepared.parquet
+        formats (list): Formats from EXPORT_FORMATS
+        max_workers (int): Optional. Number of formats written at the same time. Defaults to all of them
+
+    Returns:
+        dict: For each format, {'path', 'seconds', 'bytes', 'rows_per_second', 'mb_per_second'}
+
+    Raises:
+        ValueError: If a format is not one of EXPORT_FORMATS
+    """
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Invalid file types {unknown}. Please specify from {', '.join(EXPORT_FORMATS)}.")
+    if len(formats) == 1:
+        return {formats[0]: _timed_write(df, export_path(base_path, formats[0]), formats[0])}
+    with ThreadPoolExecutor(max_workers=max_workers or len(formats)) as executor:
+        futures = {f: executor.submit(_timed_write, df, export_path(base_path, f), f) for f in formats}
+        return {f: future.result() for f, future in futures.items()}
+
+
+def describe_export(results):
+    """Return a table of the time, size and throughput of each format from export_dataframe()."""
+    lines = [f"{'format':<10}{'seconds':>10}{'MB':>10}{'MB/s':>10}{'rows/s':>14}"]
+    for file_format, result in results.items():
+        lines.append(f"{file_format:<10}{result['seconds']:>10.3f}{result['bytes'] / 1024 ** 2:>10.2f}"
+                     f"{result['mb_per_second']:>10.1f}{result['rows_per_second']:>14,.0f}")
+    return '\n'.join(lines)
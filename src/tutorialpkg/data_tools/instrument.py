@@ -0,0 +1,156 @@
+"""Opt-in timing and memory instrumentation of the data preparation, database and query functions.
+
+Functions decorated with @instrumented() record, each time they are called:
+    wall time and CPU time of the process
+    peak memory allocated by Python during the call, from tracemalloc
+    rows in (length of the first DataFrame argument) and rows out (length of the result, e.g. the rows of a query)
+
+Instrumentation is off unless the PARALYMPICS_INSTRUMENT environment variable is set to an output directory, or
+enable() is called, e.g. by 'paralympics --instrument DIR'. When it is off a decorated function only checks one flag.
+When it is on, each call adds:
+    a JSON line to DIR/stages.jsonl
+    a line to DIR/stages.collapsed with the stack of instrumented stages and the time spent in the stage itself, not
+        in the stages it called, in microseconds. This is the collapsed-stack format of flamegraph.pl and speedscope
+    if PARALYMPICS_INSTRUMENT_CPROFILE=1 or enable(cprofile=True), the cProfile statistics of the stage in
+        DIR/<stage>-<pid>-<n>.prof, for pstats or snakeviz. Only one profiler can run at a time, so a stage called by a
+        profiled stage is part of that stage's profile rather than having its own
+
+This module only uses the standard library, so the command line can import it without importing pandas.
+"""
+import cProfile
+import functools
+import itertools
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+INSTRUMENT_ENV = 'PARALYMPICS_INSTRUMENT'
+CPROFILE_ENV = 'PARALYMPICS_INSTRUMENT_CPROFILE'
+
+
+class _Settings:
+    """Where the results are written, None when instrumentation is off."""
+    output_dir = Path(os.environ[INSTRUMENT_ENV]) if os.environ.get(INSTRUMENT_ENV) else None
+    cprofile = os.environ.get(CPROFILE_ENV, '') not in ('', '0')
+
+
+# Stages that are running, innermost last, each a dict of its start values
+_stack = []
+_profile_numbers = itertools.count(1)
+# True if tracemalloc was started by this module, and so should be stopped by disable()
+_started_tracing = False
+
+
+def enable(output_dir, cprofile=False):
+    """Record each call of an instrumented function in output_dir, optionally with cProfile statistics."""
+    _Settings.output_dir = Path(output_dir)
+    _Settings.cprofile = cprofile
+    _Settings.output_dir.mkdir(parents=True, exist_ok=True)
+
+
+def disable():
+    """Stop recording the calls of instrumented functions, and stop tracemalloc if it was started to record them."""
+    global _started_tracing
+    _Settings.output_dir = None
+    if _started_tracing and not _stack:
+        tracemalloc.stop()
+        _started_tracing = False
+
+
+def is_enabled():
+    """True if the calls of instrumented functions are being recorded."""
+    return _Settings.output_dir is not None
+
+
+def _rows(value):
+    """Number of rows of a DataFrame, Series or list of query rows, or None for other values."""
+    if isinstance(value, (str, bytes, dict)) or not hasattr(value, '__len__'):
+        return None
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def instrumented(stage=None):
+    """Decorator that records the time, memory and rows of each call of a function when instrumentation is on.
+
+    Args:
+        stage (str): Optional. Name of the stage in the results. Defaults to the function's module and name
+    """
+    def decorator(func):
+        name = stage or f'{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _Settings.output_dir is None:
+                return func(*args, **kwargs)
+            rows_in = next((_rows(arg) for arg in args if hasattr(arg, 'columns')), None)
+            return _run_stage(name, func, args, kwargs, rows_in)
+        return wrapper
+    return decorator
+
+
+def _run_stage(name, func, args, kwargs, rows_in):
+    """Call func, measuring it, and write the results."""
+    global _started_tracing
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    memory, peak = tracemalloc.get_traced_memory()
+    # The peak so far belongs to the stages that are running, then the peak is measured again for this stage
+    for running in _stack:
+        running['peak'] = max(running['peak'], peak)
+    tracemalloc.reset_peak()
+    profiler = None
+    if _Settings.cprofile and not any(running['profiled'] for running in _stack):
+        profiler = cProfile.Profile()
+    entry = {'name': name, 'memory': memory, 'peak': memory, 'children_seconds': 0.0, 'profiled': profiler is not None}
+    _stack.append(entry)
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    try:
+        if profiler is not None:
+            result = profiler.runcall(func, *args, **kwargs)
+        else:
+            result = func(*args, **kwargs)
+    finally:
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        _stack.pop()
+        entry['peak'] = max(entry['peak'], tracemalloc.get_traced_memory()[1])
+        if _stack:
+            _stack[-1]['children_seconds'] += wall
+            _stack[-1]['peak'] = max(_stack[-1]['peak'], entry['peak'])
+    _write_stage(entry, wall, cpu, rows_in, _rows(result), profiler)
+    return result
+
+
+def _write_stage(entry, wall, cpu, rows_in, rows_out, profiler):
+    """Append the results of a stage to the JSON lines and collapsed-stack files."""
+    output_dir = _Settings.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    profile_path = None
+    if profiler is not None:
+        profile_path = output_dir.joinpath(f"{entry['name']}-{os.getpid()}-{next(_profile_numbers)}.prof")
+        profiler.dump_stats(profile_path)
+    stack = [running['name'] for running in _stack] + [entry['name']]
+    record = {
+        'stage': entry['name'],
+        'parent': _stack[-1]['name'] if _stack else None,
+        'finished': datetime.now(timezone.utc).isoformat(),
+        'pid': os.getpid(),
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'peak_memory_bytes': entry['peak'] - entry['memory'],
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'profile': str(profile_path) if profile_path else None,
+    }
+    with open(output_dir.joinpath('stages.jsonl'), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+    self_microseconds = max(0, round((wall - entry['children_seconds']) * 1_000_000))
+    with open(output_dir.joinpath('stages.collapsed'), 'a', encoding='utf-8') as f:
+        f.write(f"{';'.join(stack)} {self_microseconds}\n")
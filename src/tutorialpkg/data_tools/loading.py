@@ -0,0 +1,44 @@
+"""Load several input files at the same time using a thread pool.
+
+Reading a file is mostly waiting for the disk or network and parsing in C code, so several files can be read in
+parallel threads. This is most useful when the files are on network storage.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_load(name, loader):
+    """Call loader() and log how long it took."""
+    start = time.perf_counter()
+    result = loader()
+    logger.info('Loaded %s in %.3f s', name, time.perf_counter() - start)
+    return result
+
+
+def load_concurrently(loaders, max_workers=None):
+    """Run each loader function in a thread pool and collect the results.
+
+    A FileNotFoundError from a loader is returned for that input so the caller can report each missing file.
+    Other errors are raised.
+
+    Args:
+        loaders (dict): Maps a name for each input to a function with no arguments that loads it,
+            e.g. {'events': lambda: pd.read_csv(events_csv)}
+        max_workers (int): Optional. Number of threads, defaults to one per loader
+
+    Returns:
+        tuple: (dict of name: loaded data, dict of name: FileNotFoundError for the inputs that were not found)
+    """
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(loaders) or 1) as pool:
+        futures = {name: pool.submit(_timed_load, name, loader) for name, loader in loaders.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except FileNotFoundError as e:
+                errors[name] = e
+    return results, errors
@@ -0,0 +1,113 @@
+"""Per-row content hash manifest for preparing only the new or changed rows of a data file.
+
+The manifest is saved next to the prepared file, e.g. paralympics_events_prepared.manifest.feather. It has one row for
+each row of the prepared file, in the same order, with the row number in the raw file and a hash of the raw row's
+contents. Comparing the hashes of the current raw rows with the manifest shows which rows are new, changed, removed or
+unchanged, so only the new and changed rows need to be prepared again.
+
+The manifest also stores a fingerprint of everything else the prepared rows depend on, e.g. the raw columns and the NPC
+codes. If the fingerprint does not match then the manifest is ignored and every row is prepared again.
+"""
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+# Key of the fingerprint in the feather file's schema metadata
+_FINGERPRINT_KEY = b'fingerprint'
+
+
+def manifest_path(output_path):
+    """Return the path of the manifest file for a prepared file, e.g. prepared.csv -> prepared.manifest.feather."""
+    output_path = Path(output_path)
+    return output_path.with_name(f'{output_path.stem}.manifest.feather')
+
+
+def row_hashes(df):
+    """Hash the contents of each row of a DataFrame.
+
+    The hash does not include the index, so a row that moves to a different row number keeps the same hash.
+
+    Args:
+        df (DataFrame): The raw data, indexed by row number
+
+    Returns:
+        Series: uint64 hash of each row, with the same index as df
+    """
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+def fingerprint(*parts):
+    """Return a hex digest that changes if any of the parts change, e.g. fingerprint(df.columns, npc.codes)."""
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(repr(list(part)).encode('utf-8'))
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+
+def read_manifest(path, expected_fingerprint):
+    """Read the row hashes from a manifest file.
+
+    Args:
+        path (Path): The manifest file
+        expected_fingerprint (str): Fingerprint of the current inputs, from fingerprint()
+
+    Returns:
+        Series: uint64 hash of each prepared row indexed by raw row number, or None if the file does not exist or was
+            made from different inputs
+    """
+    path = Path(path)
+    if not path.is_file():
+        return None
+    table = feather.read_table(path)
+    metadata = table.schema.metadata or {}
+    if metadata.get(_FINGERPRINT_KEY, b'').decode('utf-8') != expected_fingerprint:
+        return None
+    df = table.to_pandas()
+    return pd.Series(df['hash'].to_numpy(), index=df['row'].to_numpy(), name='hash')
+
+
+def write_manifest(path, hashes, manifest_fingerprint):
+    """Save the row hashes of the prepared file.
+
+    Args:
+        path (Path): The manifest file
+        hashes (Series): uint64 hash of each prepared row indexed by raw row number, in the order of the prepared file
+        manifest_fingerprint (str): Fingerprint of the inputs, from fingerprint()
+    """
+    table = pa.table({'row': pa.array(hashes.index.to_numpy(), pa.int64()),
+                      'hash': pa.array(hashes.to_numpy(), pa.uint64())})
+    table = table.replace_schema_metadata({_FINGERPRINT_KEY: manifest_fingerprint.encode('utf-8')})
+    feather.write_feather(table, path)
+
+
+def compare(previous, current):
+    """Compare the row hashes in a manifest with the hashes of the current raw rows.
+
+    Rows are matched by their row number in the raw file.
+
+    Args:
+        previous (Series): Hashes from read_manifest(), or None if there is no manifest
+        current (Series): Hashes of the current raw rows, from row_hashes()
+
+    Returns:
+        dict: Lists of row numbers for 'added', 'changed', 'removed' and 'unchanged' rows
+    """
+    if previous is None:
+        previous = pd.Series([], dtype='uint64')
+    in_both = current.index.intersection(previous.index)
+    same = current.loc[in_both].to_numpy() == previous.loc[in_both].to_numpy()
+    return {
+        'added': current.index.difference(previous.index).tolist(),
+        'changed': in_both[~same].tolist(),
+        'removed': previous.index.difference(current.index).tolist(),
+        'unchanged': in_both[same].tolist(),
+    }
+
+
+def describe_changes(changes):
+    """Return a one line summary of the result of compare()."""
+    return ', '.join(f'{len(rows)} {kind}' for kind, rows in changes.items()) + ' rows'
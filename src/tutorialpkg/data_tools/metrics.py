@@ -0,0 +1,224 @@
+"""Registry of derived metrics of the prepared event data, computed when first used and memoised per dataset version.
+
+Each metric is a function registered with register_metric() and the columns it uses. DerivedMetrics computes a
+metric the first time it is asked for, with vectorised pandas operations on the columns, and keeps the result:
+    in memory, shared by every DerivedMetrics of the same dataset version in the program
+    on disk, as one feather file per dataset version in the cache directory, so other programs, e.g. the charts
+        after the data was prepared, load the arrays rather than computing them again
+
+The version of a dataset is the sha256 of the prepared csv or feather file, or a hash of the contents of a
+DataFrame. The version the metrics are saved under also has the hash of the medal standings and of the code of each
+registered metric, so the metrics are computed again when the data, the medals or a metric function changes. A
+filtered ParalympicsDataset view uses the metrics of the full dataset, so e.g. the growth of the summer games is still
+between editions of the full data.
+
+    metrics = DerivedMetrics(ParalympicsDataset())
+    metrics['female_share']                       a Series, with the same index as the data
+
+Metrics:
+    female_share                 participants_f / participants
+    participants_per_country     participants / countries
+    medals_per_participant       medals awarded at the games / participants, from the medal standings sheet of
+                                 paralympics_all_raw.xlsx. Missing where the games have no medal standings
+    growth                       participants / participants at the previous games of the same type - 1
+"""
+import collections
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pyarrow import feather
+
+from tutorialpkg.data_tools.cache import CACHE_DIR, _write_atomically, file_hash, read_workbook_cached
+from tutorialpkg.data_tools.dataset import ParalympicsDataset
+from tutorialpkg.data_tools.manifest import fingerprint
+from tutorialpkg.data_tools.pipeline import code_fingerprint, fingerprint_value
+from tutorialpkg.data_tools.resources import resource_path
+
+MEDALS_XLSX = resource_path('paralympics_all_raw.xlsx')
+METRICS_CACHE_DIR = CACHE_DIR.joinpath('metrics')
+
+# Metric name to (function, columns used, description), in the order they were registered
+METRICS = {}
+Metric = collections.namedtuple('Metric', ['func', 'columns', 'description'])
+
+# Computed metric values for the most recent dataset versions, {version: {metric: ndarray}}
+_MEMO = collections.OrderedDict()
+_MEMO_VERSIONS = 8
+
+
+def register_metric(name, columns=(), description=''):
+    """Decorator that adds a metric function to METRICS.
+
+    The function is called with the DerivedMetrics, and uses metrics.column(name) for the columns it lists and
+    metrics[name] for other metrics. It returns an array or Series with one value for each row.
+    """
+    def decorator(func):
+        METRICS[name] = Metric(func, tuple(columns), description)
+        return func
+    return decorator
+
+
+def dataset_version(data):
+    """Return the version of a DataFrame or ParalympicsDataset, which changes when its contents change."""
+    if isinstance(data, ParalympicsDataset):
+        return file_hash(data.source)
+    return fingerprint_value(data)
+
+
+def metrics_version():
+    """Return a hex digest of the registered metrics and their code, which changes when a metric is edited."""
+    return fingerprint([(name, metric.columns, code_fingerprint(metric.func)) for name, metric in METRICS.items()])
+
+
+def clear_memo():
+    """Forget the metrics computed in this program. The files in the cache directory are kept."""
+    _MEMO.clear()
+
+
+class DerivedMetrics:
+    """Lazily computed, memoised derived metrics of one version of the event data.
+
+    Args:
+        data (DataFrame or ParalympicsDataset): The prepared event data, or a filtered view of it
+        version (str): Optional. Version of the data, e.g. the hash of the file it was saved to. Found from the data
+            if None. The version of the metrics also has the medals and the metric code
+        medals (DataFrame): Optional. Medal standings with 'Year', 'Location' and 'Total' columns. Defaults to the
+            medal_standings sheet of paralympics_all_raw.xlsx
+        cache_dir (Path): Optional. Directory for the saved metrics. None to only memoise in memory
+    """
+
+    def __init__(self, data, version=None, medals=None, cache_dir=METRICS_CACHE_DIR):
+        # A filtered view uses the metrics of the dataset it came from
+        self._mask = getattr(data, '_mask', None)
+        parent = getattr(data, '_parent', None)
+        self.data = data if parent is None else parent
+        self._medals = medals
+        medals_version = file_hash(MEDALS_XLSX) if medals is None else fingerprint_value(medals)
+        self.version = fingerprint([version or dataset_version(self.data), medals_version, metrics_version()])
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    def column(self, name):
+        """Return a column of the full data as a Series."""
+        return self.data[name]
+
+    @property
+    def index(self):
+        return self.data.index if isinstance(self.data, pd.DataFrame) else pd.RangeIndex(len(self.data))
+
+    @property
+    def medals(self):
+        """The medal standings, read from paralympics_all_raw.xlsx the first time they are used."""
+        if self._medals is None:
+            self._medals = read_workbook_cached(MEDALS_XLSX, [1])[1]
+        return self._medals
+
+    def _cache_file(self):
+        return self.cache_dir.joinpath(f'{self.version}.feather')
+
+    def _values(self, name):
+        """Return the values of a metric for the full data, from memory, from disk or by computing them."""
+        if name not in METRICS:
+            raise KeyError(f'{name} is not a registered metric. The metrics are {list(METRICS)}.')
+        memo = _MEMO.setdefault(self.version, {})
+        _MEMO.move_to_end(self.version)
+        while len(_MEMO) > _MEMO_VERSIONS:
+            _MEMO.popitem(last=False)
+        if name in memo:
+            return memo[name]
+        saved = None
+        if self.cache_dir and self._cache_file().is_file():
+            saved = feather.read_table(self._cache_file(), memory_map=True)
+            if name in saved.column_names:
+                memo[name] = saved.column(name).to_numpy()
+                return memo[name]
+        if isinstance(self.data, ParalympicsDataset):
+            # Read the columns the metric uses in one pass
+            self.data.load(list(METRICS[name].columns))
+        values = np.asarray(METRICS[name].func(self), dtype='float64')
+        memo[name] = values
+        if self.cache_dir:
+            # The file may have metrics saved by another program that are not in the memo, keep them in the file
+            for column in saved.column_names if saved is not None else []:
+                memo.setdefault(column, saved.column(column).to_numpy())
+            # Replace the file with a new one, as the arrays loaded from it are memory-mapped
+            _write_atomically(self._cache_file(), lambda path: feather.write_feather(pd.DataFrame(memo), path,
+                                                                                     compression='uncompressed'))
+        return values
+
+    def __getitem__(self, name):
+        """Return a metric as a float Series with the same index as the data, e.g. metrics['female_share']."""
+        values = pd.Series(self._values(name), index=self.index, name=name)
+        return values if self._mask is None else values[self._mask]
+
+    def to_frame(self, names=None):
+        """Return a DataFrame with the listed metrics, or all the registered metrics if None."""
+        return pd.DataFrame({name: self[name] for name in names or METRICS})
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator as a float array, by position, missing where the denominator is 0 or missing."""
+    numerator = pd.Series(numerator).to_numpy(dtype='float64', na_value=np.nan)
+    denominator = pd.Series(denominator).to_numpy(dtype='float64', na_value=np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator != 0, numerator / denominator, np.nan)
+
+
+@register_metric('female_share', ['participants_f', 'participants'], 'Fraction of the participants who are female')
+def female_share(metrics):
+    return _ratio(metrics.column('participants_f'), metrics.column('participants'))
+
+
+@register_metric('participants_per_country', ['participants', 'countries'], 'Mean participants per country')
+def participants_per_country(metrics):
+    return _ratio(metrics.column('participants'), metrics.column('countries'))
+
+
+@register_metric('medals_per_participant', ['year', 'host', 'participants'],
+                 'Medals awarded at the games per participant')
+def medals_per_participant(metrics):
+    def location_key(year, location):
+        # The same games can be written differently, e.g. 'Tignes-Albertville' and 'Tignes Albertville'
+        return year.astype(str) + '|' + location.astype(str).str.lower().str.replace(r'[^a-z]', '', regex=True)
+
+    medals = metrics.medals
+    totals = medals['Total'].groupby(location_key(medals['Year'], medals['Location']).to_numpy()).sum()
+    medal_totals = location_key(metrics.column('year'), metrics.column('host')).map(totals)
+    return _ratio(medal_totals.to_numpy(), metrics.column('participants'))
+
+
+@register_metric('growth', ['type', 'year', 'participants'],
+                 'Change in participants since the previous games of the same type, as a fraction')
+def growth(metrics):
+    df = pd.DataFrame({'type': metrics.column('type').to_numpy(), 'year': metrics.column('year').to_numpy(),
+                       'participants': metrics.column('participants').to_numpy()})
+    order = df.sort_values(['type', 'year'], kind='stable')
+    previous = order.groupby('type', observed=True)['participants'].shift()
+    # Put the values back in the order of the rows
+    values = np.empty(len(df))
+    values[order.index.to_numpy()] = _ratio(order['participants'], previous) - 1
+    return values
+
+
+def register_metrics_table(connection, metrics, names=None, table='EventMetrics'):
+    """Create a temporary SQLite table of the metrics, so analysis queries can join them on the year and type.
+
+    Args:
+        connection (Connection): sqlite3 connection
+        metrics (DerivedMetrics): The metrics of the event data
+        names (list): Optional. The metrics to add. Defaults to all the registered metrics
+        table (str): Name of the temporary table
+
+    Returns:
+        str: The table name
+    """
+    keys = pd.DataFrame({column: metrics.column(column) for column in ['year', 'type', 'host']})
+    if metrics._mask is not None:
+        keys = keys[metrics._mask]
+    df = pd.concat([keys, metrics.to_frame(names).set_axis(keys.index)], axis=1)
+    columns = ', '.join(f'"{column}"' for column in df.columns)
+    connection.execute(f'DROP TABLE IF EXISTS temp."{table}"')
+    connection.execute(f'CREATE TEMP TABLE "{table}" ({columns})')
+    connection.executemany(f'INSERT INTO temp."{table}" VALUES ({", ".join("?" * len(df.columns))})',
+                           df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+    return table
@@ -0,0 +1,306 @@
+"""Normalised and indexed lookup table for the NPC (National Paralympic Committee) codes.
+
+npc_codes.csv is mostly utf-8, but a few names (Côte d'Ivoire, Curaçao, Türkiye) are saved in the Mac Roman encoding.
+Reading it with encoding_errors='ignore' drops those characters, and has to be done on every run.
+
+build_npc_table() decodes the file once, normalises the text and saves it as an uncompressed feather file. The
+feather file is memory-mapped when it is loaded, so the data is not copied into memory until it is used. Each csv file
+has its own feather file in the cache directory, named from the csv file's path, and a metadata file with the csv
+file's modification time, size and content hash, so the table is built again when the csv file changes.
+NpcLookup holds dictionary indexes on 'Code' and 'Name' so a code or name is found in O(1) time, without creating a
+merge table.
+
+NpcJoinIndex is the NPC names in sorted order with the row of each name in the table. It is saved next to the feather
+file when the table is built, and memory-mapped when it is loaded, so joining a column of country names to the NPC
+rows does not build a hash table each time. Each different country name is found with a binary search, the rows are
+spread back with a take, and the names with no NPC are counted in the same pass.
+"""
+import functools
+import io
+import json
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+from tutorialpkg.data_tools.cache import _cache_files, _write_atomically, _write_meta, file_hash
+from tutorialpkg.data_tools.resources import resource_path
+
+NPC_CSV = resource_path('npc_codes.csv')
+# Version of the NpcJoinIndex and NpcLookup join, increase it when they change so cached joins are not used
+NPC_JOIN_VERSION = 1
+
+
+def npc_table_path(csv_path=NPC_CSV):
+    """The feather file in the cache directory for a csv file of NPC codes, named from the csv file's path."""
+    return _cache_files(csv_path, 'npc_table', None)[0]
+
+
+def _meta_path(table_path):
+    """The metadata file that is saved with a table file, e.g. npc_codes.feather -> npc_codes.json."""
+    table_path = Path(table_path)
+    return table_path.with_name(f'{table_path.stem}.json')
+
+
+def _index_path(table_path):
+    """The join index file that is saved with a table file, e.g. npc_codes.feather -> npc_codes.index.feather."""
+    table_path = Path(table_path)
+    return table_path.with_name(f'{table_path.stem}.index.feather')
+
+
+def _decode_line(line):
+    """Decode one line of the csv file, using Mac Roman for lines that are not valid utf-8."""
+    try:
+        text = line.decode('utf-8')
+    except UnicodeDecodeError:
+        text = line.decode('mac_roman')
+    return unicodedata.normalize('NFC', text)
+
+
+def build_npc_table(csv_path=NPC_CSV, table_path=None):
+    """Create the normalised feather file of NPC codes from the csv file, and the join index on 'Name'.
+
+    Args:
+        csv_path (Path): The npc_codes.csv file
+        table_path (Path): Optional. The feather file to create. Defaults to the csv file's file in the cache directory
+
+    Returns:
+        Path: The feather file
+    """
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    text = '\n'.join(_decode_line(line) for line in csv_path.read_bytes().splitlines())
+    df = pd.read_csv(io.StringIO(text), dtype=str)
+    for column in df.columns:
+        df[column] = df[column].str.strip()
+
+    table_path = Path(table_path) if table_path else npc_table_path(csv_path)
+    # Uncompressed so that the file can be memory-mapped
+    _write_atomically(table_path, lambda path: feather.write_feather(pa.Table.from_pandas(df, preserve_index=False),
+                                                                     path, compression='uncompressed'))
+    _write_atomically(_index_path(table_path), lambda path: feather.write_feather(
+        NpcJoinIndex.from_names(df['Name']).to_table(), path, compression='uncompressed'))
+    # The metadata is written last, so a table that was not replaced fails the check in load_npc_table()
+    _write_meta(csv_path, stat, file_hash(csv_path), _meta_path(table_path))
+    return table_path
+
+
+def _table_is_current(csv_path, table_path):
+    """Check the table and join index files were built from the csv file as it is now.
+
+    The modification time and size are checked first, and the content hash only if the csv file has been touched.
+    """
+    meta_file = _meta_path(table_path)
+    if not (table_path.is_file() and _index_path(table_path).is_file() and meta_file.is_file()):
+        return False
+    try:
+        meta = json.loads(meta_file.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        return False
+    # A table_path given by the caller may have been built from another csv file
+    if meta['source'] != str(csv_path.resolve()):
+        return False
+    stat = csv_path.stat()
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return True
+    content_hash = file_hash(csv_path)
+    if meta['sha256'] == content_hash:
+        _write_meta(csv_path, stat, content_hash, meta_file)
+        return True
+    return False
+
+
+def load_npc_table(csv_path=NPC_CSV, table_path=None):
+    """Load the NPC codes as a memory-mapped pyarrow Table, building the feather file if needed.
+
+    The feather file is built again if it was built from another csv file or the contents of the csv file have changed.
+
+    Args:
+        csv_path (Path): The npc_codes.csv file
+        table_path (Path): Optional. The feather file. Defaults to the csv file's file in the cache directory
+
+    Returns:
+        pyarrow.Table: The NPC codes
+
+    Raises:
+        FileNotFoundError: If the csv file does not exist
+    """
+    csv_path = Path(csv_path)
+    table_path = Path(table_path) if table_path else npc_table_path(csv_path)
+    if not _table_is_current(csv_path, table_path):
+        build_npc_table(csv_path, table_path)
+    return feather.read_table(table_path, memory_map=True)
+
+
+def load_npc_join_index(csv_path=NPC_CSV, table_path=None):
+    """Load the join index on the NPC names that is saved with the feather file, building both if needed.
+
+    Args:
+        csv_path (Path): The npc_codes.csv file
+        table_path (Path): Optional. The feather file. Defaults to the csv file's file in the cache directory
+
+    Returns:
+        NpcJoinIndex: The sorted names and their rows in the table
+    """
+    table_path = Path(table_path) if table_path else npc_table_path(csv_path)
+    load_npc_table(csv_path, table_path)
+    return NpcJoinIndex.from_table(feather.read_table(_index_path(table_path), memory_map=True))
+
+
+def load_npc_codes(columns=None, csv_path=NPC_CSV):
+    """Load the NPC codes into a DataFrame.
+
+    This replaces pd.read_csv(npc_csv, encoding='utf-8', encoding_errors='ignore', usecols=columns).
+
+    Args:
+        columns (list): Optional. The columns to load, e.g. ['Code', 'Name']. All columns if None
+        csv_path (Path): The npc_codes.csv file
+
+    Returns:
+        DataFrame: The NPC codes
+    """
+    table = load_npc_table(csv_path)
+    if columns:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+class NpcJoinIndex:
+    """Sorted index of the NPC names, for joining a column of country names to the NPC table rows without a merge.
+
+    Attributes:
+        names (ndarray): The NPC names, sorted
+        rows (ndarray): The row of each sorted name in the NPC table
+    """
+
+    def __init__(self, names, rows):
+        self.names = np.asarray(names, dtype=object)
+        self.rows = np.asarray(rows, dtype=np.intp)
+
+    @classmethod
+    def from_names(cls, names):
+        """Create the index from the names in table order."""
+        names = np.asarray(names, dtype=object)
+        order = np.argsort(names, kind='stable')
+        return cls(names[order], order)
+
+    @classmethod
+    def from_table(cls, table):
+        """Create the index from a pyarrow Table made by to_table()."""
+        return cls(table.column('name').to_numpy(zero_copy_only=False), table.column('row').to_numpy())
+
+    def to_table(self):
+        """Return the index as a pyarrow Table with 'name' and 'row' columns, to save it."""
+        return pa.table({'name': pa.array(self.names, pa.string()), 'row': pa.array(self.rows, pa.int64())})
+
+    def join(self, names):
+        """Find the NPC table row for each value in a Series of country names.
+
+        Args:
+            names (Series): Country names, as strings or categorical
+
+        Returns:
+            tuple: (ndarray of the table row for each name, -1 where there is no match,
+                    dict of the number of rows for each name that has no NPC)
+        """
+        # Each different name is searched for once, for a categorical column these are the categories
+        codes, uniques = pd.factorize(names)
+        unique_names = np.asarray(uniques, dtype=object)
+        found = np.searchsorted(self.names, unique_names).clip(max=max(len(self.names) - 1, 0))
+        matched = (self.names[found] == unique_names) if len(self.names) else np.zeros(len(unique_names), bool)
+        unique_rows = np.where(matched, self.rows[found] if len(self.rows) else -1, -1)
+        # factorize gives -1 for missing names, which takes the -1 added to the end
+        positions = np.append(unique_rows, -1).take(codes)
+
+        # Count the rows of each name that was not matched, from the same factorize codes
+        counts = np.bincount(codes[codes >= 0], minlength=len(unique_names))
+        unmatched = {unique_names[i]: int(counts[i]) for i in np.flatnonzero(~matched)}
+        return positions, unmatched
+
+
+class NpcLookup:
+    """Find NPC codes and names using dictionary indexes on the 'Code' and 'Name' columns.
+
+    Attributes:
+        codes (list): The NPC codes, in file order
+        names (list): The NPC names, in file order
+        join_index (NpcJoinIndex): Sorted index of the names, used to find the codes for a column of names
+    """
+
+    def __init__(self, codes, names, join_index=None):
+        self.codes = list(codes)
+        self.names = list(names)
+        self._code_index = {code: i for i, code in enumerate(self.codes)}
+        self._name_index = {name: i for i, name in enumerate(self.names)}
+        self._join_index = join_index
+
+    @classmethod
+    def from_table(cls, table, join_index=None):
+        """Create the lookup from a pyarrow Table with 'Code' and 'Name' columns, and optionally its join index."""
+        return cls(table.column('Code').to_pylist(), table.column('Name').to_pylist(), join_index)
+
+    @property
+    def join_index(self):
+        """The join index on the names, created the first time it is used if it was not loaded with the table."""
+        if self._join_index is None:
+            self._join_index = NpcJoinIndex.from_names(self.names)
+        return self._join_index
+
+    @classmethod
+    def from_dataframe(cls, df, code_column='Code', name_column='Name'):
+        """Create the lookup from a DataFrame with the codes and names."""
+        return cls(df[code_column], df[name_column])
+
+    def code(self, name):
+        """Return the code for a name, or None if the name is not found."""
+        i = self._name_index.get(name)
+        return None if i is None else self.codes[i]
+
+    def name(self, code):
+        """Return the name for a code, or None if the code is not found."""
+        i = self._code_index.get(code)
+        return None if i is None else self.names[i]
+
+    def join(self, names):
+        """Find the code for each value in a Series of names, and the names that have no code.
+
+        Args:
+            names (Series): Country names
+
+        Returns:
+            tuple: (Series of the code for each name, with missing values where the name is not found,
+                    dict of the number of rows for each name that was not found)
+        """
+        positions, unmatched = self.join_index.join(names)
+        # -1 for names that are not found takes the None added to the end
+        codes = np.append(np.array(self.codes, dtype=object), None).take(positions)
+        return pd.Series(codes, index=names.index, name='Code', dtype='str'), unmatched
+
+    def codes_for(self, names):
+        """Find the code for each value in a Series of names.
+
+        Args:
+            names (Series): Country names
+
+        Returns:
+            Series: The code for each name, with missing values where the name is not found
+        """
+        return self.join(names)[0]
+
+
+@functools.lru_cache
+def _npc_lookup(csv_path, content_hash):
+    """The NpcLookup for a csv file with the given contents, which are part of the key so a changed file is reloaded."""
+    return NpcLookup.from_table(load_npc_table(csv_path), load_npc_join_index(csv_path))
+
+
+def get_npc_lookup(csv_path=NPC_CSV):
+    """Return the NpcLookup for the NPC codes file, with its saved join index.
+
+    The lookup is created once per program run for each csv file path and contents.
+    """
+    csv_path = Path(csv_path).resolve()
+    return _npc_lookup(csv_path, file_hash(csv_path))
@@ -0,0 +1,51 @@
+"""Missing-value profile of a DataFrame, computed from a single boolean matrix.
+
+Calling isna().any(axis=1), isnull().any(axis=0) and isnull().sum().sum() separately checks every cell of the
+DataFrame each time. null_profile() checks every cell once, to make a boolean numpy matrix, and gets the per-row mask,
+the per-column counts and the total from that matrix.
+"""
+import numpy as np
+import pandas as pd
+
+
+class NullProfile:
+    """The missing values in a DataFrame.
+
+    Attributes:
+        row_mask (Series): True for each row that has a missing value, e.g. to select the rows with df[row_mask]
+        column_counts (Series): Number of missing values in each column
+        total (int): Number of missing values in the DataFrame
+        rows (DataFrame): The rows that have a missing value
+    """
+
+    def __init__(self, row_mask, column_counts, rows):
+        self.row_mask = row_mask
+        self.column_counts = column_counts
+        self.total = int(column_counts.sum())
+        self.rows = rows
+
+    @property
+    def column_mask(self):
+        """True for each column that has a missing value, the same as df.isnull().any(axis=0)."""
+        return self.column_counts > 0
+
+    @property
+    def columns(self):
+        """Names of the columns that have a missing value."""
+        return self.column_counts.index[self.column_mask].tolist()
+
+
+def null_profile(df):
+    """Find the missing values in a DataFrame in one pass over its cells.
+
+    Args:
+        df (DataFrame): The data
+
+    Returns:
+        NullProfile: The row mask, column counts, total and rows with missing values
+    """
+    # One boolean matrix with a row for each row of df and a column for each column
+    matrix = df.isna().to_numpy()
+    row_mask = pd.Series(matrix.any(axis=1), index=df.index)
+    column_counts = pd.Series(matrix.sum(axis=0, dtype=np.int64), index=df.columns)
+    return NullProfile(row_mask, column_counts, df[row_mask])
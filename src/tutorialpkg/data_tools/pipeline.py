@@ -0,0 +1,317 @@
+"""Small pipeline engine that runs named data preparation stages in dependency order.
+
+Each stage is a function with a name, the names of its inputs and optional keyword arguments (its config). An input is
+either a source passed to run(), e.g. the raw DataFrame, or the result of another stage, so the stages form a DAG.
+
+    pipeline = Pipeline(cache_dir=CACHE_DIR.joinpath('pipeline'))
+    pipeline.add('country_names', country_name, ['raw'])
+    pipeline.add('drop_rows', drop_raw_rows, ['country_names'], {'rows': [0, 17, 31]})
+    results = pipeline.run({'raw': df_raw})
+
+Each stage has a key made from its name, its function's code, its config, its version and the keys of its inputs, and
+the key of a source is a hash of its contents. Only the stage's own function is hashed, so a stage that reads a file or
+calls code that may change is given a version, e.g. the file's hash or a number that is increased when that code
+changes. The result of a stage is cached under its key, in memory and optionally on disk.
+When a source or the config of a stage changes, the keys of that stage and the stages downstream of it change, so only
+those stages run again and the results of the stages upstream are taken from the cache.
+
+The time taken by each stage, and whether its result came from the cache, is logged and kept in Pipeline.timings.
+
+For large data, run(low_memory=True) keeps as little data in memory as it can: nothing is cached, and the result of a
+stage is released as soon as the stages that use it have run, so only the data for the current stage is held.
+run(trace_memory=True) also records the peak memory allocated while each stage runs, using tracemalloc.
+"""
+import graphlib
+import hashlib
+import logging
+import pickle
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_value(value):
+    """Return a hex digest of the contents of a source value.
+
+    DataFrames and Series are hashed with pandas, including the index, column names and dtypes. Other values are
+    hashed from their pickled bytes.
+    """
+    sha = hashlib.sha256()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        sha.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        if isinstance(value, pd.DataFrame):
+            sha.update(repr((list(value.columns), value.dtypes.astype(str).tolist())).encode('utf-8'))
+        else:
+            sha.update(repr((value.name, str(value.dtype))).encode('utf-8'))
+    else:
+        sha.update(pickle.dumps(value))
+    return sha.hexdigest()
+
+
+def code_fingerprint(func):
+    """Return a hex digest of the code of a function, which changes when the function is edited.
+
+    Nested functions and lambdas are hashed from their own code, as the repr of a code object changes between programs.
+    """
+    sha = hashlib.sha256()
+    code = getattr(func, '__code__', None)
+    to_hash = [code] if code is not None else []
+    while to_hash:
+        code = to_hash.pop()
+        sha.update(code.co_code)
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                to_hash.append(const)
+            else:
+                sha.update(repr(const).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def _protect(value):
+    """Give a stage or caller its own DataFrame object, so changing its columns in place does not change a cached value.
+
+    With copy-on-write, the shallow copy shares the data until a column is changed. The DataFrames in a tuple, e.g. the
+    result of a stage that returns the data and a report, are copied too.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_protect(item) for item in value)
+    return value
+
+
+class Stage:
+    """One step of a pipeline.
+
+    Attributes:
+        name (str): Name of the stage, used as the input name by the stages that use its result
+        func (function): Called as func(*inputs, **config)
+        inputs (list): Names of the sources or stages whose results are passed to func, in order
+        config (dict): Keyword arguments for func
+        cache (bool): False for stages that must always run, e.g. writing a file
+        version (str): Part of the cache key for what the stage uses besides its inputs and its own code, e.g. the hash
+            of a file it reads
+    """
+
+    def __init__(self, name, func, inputs, config=None, cache=True, version=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.config = dict(config or {})
+        self.cache = cache
+        self.version = version
+
+    def key(self, input_keys):
+        """Return the cache key of the stage for the given keys of its inputs."""
+        sha = hashlib.sha256()
+        sha.update(repr((self.name, self.func.__module__, self.func.__qualname__, sorted(self.config.items()),
+                         self.version, input_keys)).encode('utf-8'))
+        # Editing the function gives a new key
+        sha.update(code_fingerprint(self.func).encode('utf-8'))
+        return sha.hexdigest()
+
+
+class Pipeline:
+    """A DAG of named stages with per-stage timing and caching.
+
+    Args:
+        cache_dir (Path): Optional. Directory for the cached stage results. If None, results are only cached in memory
+
+    Attributes:
+        stages (dict): The Stage for each name, in the order they were added
+        timings (dict): For each stage in the last run, {'seconds': float, 'status': 'run', 'memory' or 'disk'},
+            and 'peak_mb' if the memory was traced
+    """
+
+    def __init__(self, cache_dir=None):
+        self.stages = {}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.timings = {}
+        # The last result of each stage, as (key, result), so memory use is one result per stage
+        self._memory = {}
+
+    def add(self, name, func, inputs, config=None, cache=True, version=None):
+        """Add a stage to the pipeline.
+
+        Args:
+            name (str): Name of the stage
+            func (function): Called as func(*inputs, **config)
+            inputs (list): Names of the sources or stages whose results are passed to func
+            config (dict): Optional. Keyword arguments for func, which are part of the cache key
+            cache (bool): Whether the result is cached, False for stages that must always run
+            version (str): Optional. Part of the cache key, to change when a file the stage reads or code the stage
+                calls changes
+
+        Returns:
+            Pipeline: This pipeline, so calls can be chained
+
+        Raises:
+            ValueError: If there is already a stage with the name
+        """
+        if name in self.stages:
+            raise ValueError(f'The pipeline already has a stage called {name}.')
+        self.stages[name] = Stage(name, func, inputs, config, cache, version)
+        return self
+
+    def order(self, targets=None):
+        """Return the names of the stages needed for the targets, with each stage after the stages it uses.
+
+        Args:
+            targets (list): Optional. Names of the stages to run. Defaults to all stages
+
+        Raises:
+            ValueError: If a target is not a stage or the stages have a cycle
+        """
+        unknown = [name for name in targets or [] if name not in self.stages]
+        if unknown:
+            raise ValueError(f'Stages {unknown} are not in the pipeline.')
+        needed = set()
+        to_visit = list(targets or self.stages)
+        while to_visit:
+            name = to_visit.pop()
+            if name in self.stages and name not in needed:
+                needed.add(name)
+                to_visit.extend(self.stages[name].inputs)
+        # Add the stages in the order they were added, so stages that do not depend on each other run in that order
+        sorter = graphlib.TopologicalSorter()
+        for name in self.stages:
+            if name in needed:
+                sorter.add(name, *[i for i in self.stages[name].inputs if i in self.stages])
+        try:
+            return list(sorter.static_order())
+        except graphlib.CycleError as e:
+            raise ValueError(f'The pipeline stages have a cycle: {e.args[1]}') from e
+
+    def _cache_file(self, key):
+        return self.cache_dir.joinpath(f'{key}.pkl')
+
+    def _load(self, stage, key):
+        """Return (result, status) from the memory or disk cache, or (None, None) if the result is not cached."""
+        if not stage.cache:
+            return None, None
+        cached_key, result = self._memory.get(stage.name, (None, None))
+        if cached_key == key:
+            return result, 'memory'
+        if self.cache_dir and self._cache_file(key).is_file():
+            return pd.read_pickle(self._cache_file(key)), 'disk'
+        return None, None
+
+    def _store(self, stage, key, result):
+        """Cache the result of a stage in memory and, if there is a cache directory, on disk."""
+        if not stage.cache:
+            return
+        self._memory[stage.name] = (key, result)
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            pd.to_pickle(result, self._cache_file(key))
+
+    def run(self, sources, targets=None, use_cache=True, low_memory=False, trace_memory=False):
+        """Run the stages needed for the targets, using cached results where the inputs have not changed.
+
+        The keys of all the stages are found first. A cached stage result is only loaded if it is a target or a stage
+        that uses it has to run, so an unchanged pipeline loads just the target results.
+
+        Args:
+            sources (dict): The value of each source, e.g. {'raw': df_raw, 'npc': npc_lookup}
+            targets (list): Optional. Names of the stages to run. Defaults to the stages whose results no stage uses
+            use_cache (bool): If False, every stage runs and nothing is cached, e.g. for chunks of a large file
+            low_memory (bool): If True, nothing is cached and each stage result is released once it is no longer needed
+            trace_memory (bool): If True, record the peak memory allocated by each stage in timings[stage]['peak_mb']
+
+        Returns:
+            dict: The result of each stage that was run or loaded, or only the targets if low_memory is True. The
+                DataFrames are copies of the cached results, so the caller can change them
+
+        Raises:
+            ValueError: If a stage uses an input that is neither a source nor a stage
+        """
+        order = self.order(targets)
+        for name in order:
+            missing = [i for i in self.stages[name].inputs if i not in self.stages and i not in sources]
+            if missing:
+                raise ValueError(f'Stage {name} uses {missing}, which are not sources or stages.')
+        if targets is None:
+            used = {i for stage in self.stages.values() for i in stage.inputs}
+            targets = [name for name in order if name not in used]
+
+        use_cache = use_cache and not low_memory
+        keys = {}
+        if use_cache:
+            keys = {name: fingerprint_value(value) for name, value in sources.items()}
+            for name in order:
+                keys[name] = self.stages[name].key([keys[i] for i in self.stages[name].inputs])
+
+        values = dict(sources)
+        self.timings = {}
+        results = {}
+        # Number of stages still to run that use each stage's result, so low_memory can release it after the last one
+        uses = {name: 0 for name in order}
+        for name in order:
+            for i in self.stages[name].inputs:
+                if i in uses:
+                    uses[i] += 1
+        tracing = trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        def evaluate(name):
+            """Return the result of a stage, from the cache or by running it after evaluating its inputs."""
+            if name in values:
+                return values[name]
+            stage = self.stages[name]
+            start = time.perf_counter()
+            result, status = self._load(stage, keys[name]) if use_cache else (None, None)
+            if status is None:
+                args = [_protect(evaluate(i)) for i in stage.inputs]
+                if trace_memory:
+                    before = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                # Time the stage itself, not the stages it uses
+                start = time.perf_counter()
+                result = stage.func(*args, **stage.config)
+                status = 'run'
+                del args
+                if use_cache:
+                    self._store(stage, keys[name], result)
+            elif status == 'disk':
+                self._memory[name] = (keys[name], result)
+            seconds = time.perf_counter() - start
+            self.timings[name] = {'seconds': seconds, 'status': status}
+            if trace_memory and status == 'run':
+                self.timings[name]['peak_mb'] = (tracemalloc.get_traced_memory()[1] - before) / 1024 ** 2
+                logger.info('Stage %s: %s in %.3f s, peak %.1f MB', name, status, seconds,
+                            self.timings[name]['peak_mb'])
+            else:
+                logger.info('Stage %s: %s in %.3f s', name, status, seconds)
+            values[name] = result
+            if not low_memory or name in targets:
+                # The caller gets its own object, as the result is also kept in the memory cache
+                results[name] = _protect(result)
+            if low_memory and status == 'run':
+                # Release the inputs that no stage still to run needs
+                for i in stage.inputs:
+                    if i in uses:
+                        uses[i] -= 1
+                        if uses[i] == 0 and i not in targets:
+                            values.pop(i, None)
+            return result
+
+        try:
+            for name in targets:
+                evaluate(name)
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        return results
+
+    def clear_cache(self):
+        """Delete the cached results, in memory and on disk."""
+        self._memory.clear()
+        if self.cache_dir and self.cache_dir.is_dir():
+            for cache_file in self.cache_dir.glob('*.pkl'):
+                cache_file.unlink()
@@ -0,0 +1,745 @@
+"""Single-pass, streaming profile of a DataFrame or csv file, in place of shape, head, tail, dtypes, info and describe.
+
+Calling df.shape, df.head(), df.tail(), df.dtypes, df.info() and df.describe() separately goes over the data several
+times, and needs the whole DataFrame in memory. DataProfile goes over the data once, a chunk at a time, and keeps:
+    the number of rows, the first and last rows, the column names and dtypes
+    for each column, the number of values and missing values and the memory used
+    for each numeric or date column, the mean and variance, and the min and max. The mean and variance of each chunk
+        are merged into the totals with the parallel form of Welford's algorithm, which does not lose precision
+        the way a running sum of squares does
+    the values of the numeric and date columns, for the quantiles, while there are at most exact_rows rows. After
+        that the values are dropped and the quantiles are missing, so memory use does not grow with the file
+    the rows with missing values, up to max_null_rows
+
+On data that fits in one chunk the output is the same as the pandas functions. profile_csv() reads a csv file in
+chunks, so files larger than memory can be profiled. Two profiles of parts of the same data can be merged.
+"""
+import collections
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from tutorialpkg.data_tools.sketches import CountMinSketch, HyperLogLog, KllSketch
+
+PERCENTILES = (0.25, 0.5, 0.75)
+# Rows of values kept for the exact quantiles, 8 bytes a value
+EXACT_ROWS = 1_000_000
+MAX_NULL_ROWS = 1_000
+
+# What info() needs to know about the index of a chunk
+IndexPart = collections.namedtuple('IndexPart', ['kind', 'length', 'first', 'last', 'is_range', 'memory',
+                                                 'qualified'])
+
+
+def _number(value):
+    """A numpy number as a Python number, and missing values as None, so they can be saved as JSON."""
+    if value is None or (np.ndim(value) == 0 and pd.isna(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _date_text(value):
+    """A Timestamp as ISO text, or None if it is missing."""
+    return None if value is None or pd.isna(value) else value.isoformat()
+
+
+def _date_value(text):
+    """The Timestamp of ISO text saved by _date_text()."""
+    return pd.NaT if text is None else pd.Timestamp(text)
+
+
+def _common_dtype(dtype, other):
+    """The dtype that holds the values of both dtypes, as pd.concat would give, e.g. float64 for int64 and float64."""
+    if _kind(dtype) == 'number' and _kind(other) == 'number':
+        try:
+            return np.result_type(dtype, other)
+        except TypeError:
+            return pd.Float64Dtype()
+    return np.dtype('object')
+
+
+def _kind(dtype):
+    """'number' or 'datetime' for the columns that describe() includes by default, otherwise 'other'."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'other'
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_timedelta64_dtype(dtype):
+        return 'number'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    return 'other'
+
+
+def _describes_by_default(dtype):
+    """True for the columns df.describe() includes when there are any: numbers and dates without a time zone."""
+    return _kind(dtype) == 'number' or (_kind(dtype) == 'datetime' and not isinstance(dtype, pd.DatetimeTZDtype))
+
+
+class ColumnProfile:
+    """Summary statistics of one column, updated a chunk at a time.
+
+    Attributes:
+        name (str): Column name
+        dtype (dtype): Column data type
+        count (int): Number of values that are not missing
+        nulls (int): Number of missing values
+        mean (float): Mean of the values, for numeric and date columns
+        m2 (float): Sum of the squared differences from the mean, for the variance
+        min, max: Smallest and largest values, for numeric and date columns
+        memory (int): Bytes used by the column, as DataFrame.memory_usage(deep=False)
+        distinct (HyperLogLog): Estimated number of different values, for an approximate profile
+        quantile_sketch (KllSketch): Estimated quantiles of numeric and date columns, for an approximate profile
+        top_values (CountMinSketch): Estimated most common values of other columns, for an approximate profile
+    """
+
+    def __init__(self, name, dtype, exact_rows=EXACT_ROWS, count_values=False, approximate=False):
+        self.name = name
+        self.dtype = dtype
+        self.kind = _kind(dtype)
+        self.count = 0
+        self.nulls = 0
+        self.mean = np.nan
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.memory = 0
+        self.exact_rows = exact_rows
+        # Values kept for the quantiles, dropped when there are more than exact_rows
+        self._values = [] if self.kind != 'other' else None
+        # Count of each value, only kept when describe() describes the non-numeric columns
+        self._value_counts = {} if count_values else None
+        # Quantiles and (unique, top, freq) of a profile read with from_dict(), which has no values or counts
+        self._stored_quantiles = {}
+        self._stored_top = None
+        # Fixed-size sketches in place of the values and counts, for data too large to keep them
+        self.approximate = approximate
+        self.distinct = HyperLogLog() if approximate else None
+        self.quantile_sketch = KllSketch(seed=0) if approximate and self.kind != 'other' else None
+        self.top_values = CountMinSketch() if approximate and self.kind == 'other' else None
+        if approximate:
+            self._values = self._value_counts = None
+
+    def _numbers(self, values):
+        """The values as float64, with dates as integers and 0 for missing values, and the mask of missing values."""
+        missing = values.isna().to_numpy()
+        if self.kind == 'datetime':
+            # asi8 is the integers of naive and time zone aware dates, for which to_numpy() gives Timestamp objects
+            numbers = values.array.asi8.astype('float64')
+        else:
+            numbers = values.to_numpy(dtype='float64', na_value=np.nan)
+        return np.where(missing, 0.0, numbers), missing
+
+    def change_dtype(self, dtype):
+        """Change the dtype when a later chunk needs a wider one, e.g. object when text follows a column of numbers.
+
+        A column that is no longer numbers or dates is left out of describe(), as pandas does, so its mean, variance,
+        min, max and values are dropped.
+        """
+        self.dtype = dtype
+        kind = _kind(dtype)
+        if kind == 'other' and self.kind != 'other':
+            self.mean, self.m2, self.min, self.max = np.nan, 0.0, None, None
+            self._values = self.quantile_sketch = None
+        self.kind = kind
+
+    def update(self, values):
+        """Add a chunk of the column's values.
+
+        Args:
+            values (Series): The column of the next chunk
+        """
+        chunk_count = int(values.count())
+        self.nulls += len(values) - chunk_count
+        self.memory += int(values.memory_usage(index=False, deep=False))
+        if self._value_counts is not None:
+            for value, n in values.value_counts(sort=False).items():
+                self._value_counts[value] = self._value_counts.get(value, 0) + int(n)
+        if self.approximate:
+            self.distinct.update(values)
+            if self.top_values is not None:
+                self.top_values.update(values)
+        if self.kind == 'other' or chunk_count == 0:
+            self.count += chunk_count
+            return
+
+        numbers, missing = self._numbers(values)
+        # The same sums as Series.mean() and Series.std(), with 0 in place of missing values, so one chunk gives
+        # exactly the same result as pandas
+        chunk_mean = numbers.sum(dtype='float64') / chunk_count
+        squares = (chunk_mean - numbers) ** 2
+        squares[missing] = 0
+        chunk_m2 = float(squares.sum(dtype='float64'))
+        self._merge_moments(chunk_count, chunk_mean, chunk_m2)
+        if self.quantile_sketch is not None:
+            self.quantile_sketch.update(numbers[~missing])
+        chunk_min, chunk_max = values.min(), values.max()
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        if self._values is not None:
+            self._values.append(values.dropna())
+            if self.count > self.exact_rows:
+                self._values = None
+
+    def _merge_moments(self, count, mean, m2):
+        """Merge the count, mean and m2 of other values into this column's (Chan et al.'s form of Welford)."""
+        if self.count == 0:
+            self.count, self.mean, self.m2 = count, mean, m2
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    def merge(self, other):
+        """Add the statistics of another profile of the same column, e.g. of a different part of the file."""
+        self.nulls += other.nulls
+        self.memory += other.memory
+        if self._value_counts is not None and other._value_counts is not None:
+            for value, n in other._value_counts.items():
+                self._value_counts[value] = self._value_counts.get(value, 0) + n
+        for name in ('distinct', 'quantile_sketch', 'top_values'):
+            if getattr(self, name) is not None and getattr(other, name) is not None:
+                getattr(self, name).merge(getattr(other, name))
+        if self.kind == 'other' or other.count == 0:
+            self.count += other.count
+            return
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        if self._values is not None and other._values is not None and self.count <= self.exact_rows:
+            self._values.extend(other._values)
+        else:
+            self._values = None
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1), NaN if there are fewer than 2 values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1)."""
+        return float(np.sqrt(self.variance))
+
+    def quantiles(self, percentiles=PERCENTILES):
+        """The quantiles of the values, or missing values if there were more than exact_rows values.
+
+        The quantiles of an approximate profile are estimated from its KllSketch.
+        """
+        if self.quantile_sketch is not None:
+            quantiles = self.quantile_sketch.quantile(list(percentiles)).tolist()
+            return [self._timestamp(q) for q in quantiles] if self.kind == 'datetime' else quantiles
+        if self._values is None:
+            return [self._stored_quantiles.get(p, np.nan) for p in percentiles]
+        values = pd.concat(self._values) if self._values else pd.Series([], dtype=self.dtype)
+        return values.quantile(list(percentiles)).tolist()
+
+    def _timestamp(self, number):
+        """A number of the date column's units as a Timestamp, truncated like Series.mean()."""
+        if np.isnan(number):
+            return pd.NaT
+        unit = getattr(self.dtype, 'unit', None) or np.datetime_data(self.dtype)[0]
+        timestamp = pd.Timestamp(np.datetime64(int(number), unit))
+        tz = getattr(self.dtype, 'tz', None)
+        return timestamp.tz_localize('UTC').tz_convert(tz) if tz else timestamp
+
+    def _mean_date(self):
+        """The mean of a date column as a Timestamp, the same as Series.mean()."""
+        return pd.NaT if self.count == 0 else self._timestamp(self.mean)
+
+    def describe(self, percentiles=PERCENTILES):
+        """Return the same Series as Series.describe() for the column."""
+        labels = [f'{p * 100:g}%' for p in percentiles]
+        if self.kind == 'datetime':
+            return pd.Series([self.count, self._mean_date(), self.min, *self.quantiles(percentiles), self.max],
+                             index=['count', 'mean', 'min', *labels, 'max'], name=self.name)
+        if self.kind == 'number':
+            if isinstance(self.dtype, pd.api.extensions.ExtensionDtype):
+                dtype = pd.Float64Dtype()
+            elif self.dtype.kind in 'iufb':
+                dtype = np.dtype('float')
+            else:
+                dtype = None
+            no_values = self.count == 0
+            return pd.Series([self.count, np.nan if no_values else self.mean, np.nan if no_values else self.std,
+                              np.nan if no_values else self.min, *self.quantiles(percentiles),
+                              np.nan if no_values else self.max],
+                             index=['count', 'mean', 'std', 'min', *labels, 'max'], name=self.name, dtype=dtype)
+        unique, top, freq = self._top()
+        if unique:
+            return pd.Series([self.count, unique, top, freq], index=['count', 'unique', 'top', 'freq'], name=self.name)
+        return pd.Series([self.count, 0, np.nan, np.nan], index=['count', 'unique', 'top', 'freq'], name=self.name,
+                         dtype='object')
+
+    def _top(self):
+        """Number of different values, the most common value and its count, estimated for an approximate profile."""
+        if self.top_values is not None:
+            most_common = self.top_values.most_common(1)
+            if not len(most_common):
+                return 0, None, None
+            return self.distinct.estimate(), most_common.index[0], int(most_common.iloc[0])
+        if self._value_counts is None:
+            return self._stored_top or (0, None, None)
+        counts = pd.Series(self._value_counts, dtype='int64').sort_values(ascending=False, kind='stable')
+        counts = counts[counts != 0]
+        if not len(counts):
+            return 0, None, None
+        return len(counts), counts.index[0], int(counts.iloc[0])
+
+    def to_dict(self, percentiles=PERCENTILES):
+        """Return the statistics as a dictionary that can be saved as JSON, with the quantiles for the percentiles."""
+        to_json = _date_text if self.kind == 'datetime' else _number
+        return {'name': self.name, 'dtype': str(self.dtype), 'count': self.count, 'nulls': self.nulls,
+                'mean': _number(self.mean), 'm2': self.m2, 'min': to_json(self.min), 'max': to_json(self.max),
+                'memory': self.memory,
+                'quantiles': [[p, to_json(q)] for p, q in zip(percentiles, self.quantiles(percentiles))],
+                'top': [_number(value) for value in self._top()]
+                if self._value_counts is not None or self.top_values is not None else None}
+
+    @classmethod
+    def from_dict(cls, values):
+        """Make a ColumnProfile from the dictionary made by to_dict(). It has no values, so merge() is not exact."""
+        column = cls(values['name'], pd.api.types.pandas_dtype(values['dtype']))
+        from_json = _date_value if column.kind == 'datetime' else (lambda value: value)
+        column.count, column.nulls, column.memory = values['count'], values['nulls'], values['memory']
+        column.mean = np.nan if values['mean'] is None else values['mean']
+        column.m2 = values['m2']
+        column.min, column.max = from_json(values['min']), from_json(values['max'])
+        column._values = None
+        column._stored_quantiles = {p: from_json(q) for p, q in values['quantiles']}
+        column._stored_top = tuple(values['top']) if values['top'] is not None else None
+        return column
+
+
+class DataProfile:
+    """Profile of a DataFrame or csv file, built a chunk at a time with update().
+
+    Args:
+        exact_rows (int): Number of rows up to which the values are kept for the exact quantiles
+        max_null_rows (int): Number of rows with missing values to keep
+        head_rows (int): Number of rows kept from the start and the end of the data
+        approximate (bool): If True, estimate the quantiles, the number of different values and the most common
+            values with fixed-size sketches, see tutorialpkg.data_tools.sketches, rather than keeping the values
+
+    Attributes:
+        rows (int): Number of rows
+        columns (Index): Column names
+        column_profiles (dict): The ColumnProfile of each column
+        head (DataFrame): The first rows, the same as df.head()
+        tail (DataFrame): The last rows, the same as df.tail()
+        null_rows (DataFrame): The first max_null_rows rows that have a missing value
+    """
+
+    def __init__(self, exact_rows=EXACT_ROWS, max_null_rows=MAX_NULL_ROWS, head_rows=5, approximate=False):
+        self.exact_rows = exact_rows
+        self.approximate = approximate
+        self.max_null_rows = max_null_rows
+        self.head_rows = head_rows
+        self.rows = 0
+        self.columns = None
+        self.column_profiles = {}
+        self.head = None
+        self.tail = None
+        self.null_rows = None
+        self._index_parts = []
+
+    def update(self, chunk, columns=None):
+        """Add the next chunk of rows to the profile.
+
+        Args:
+            chunk (DataFrame): The next rows
+            columns (list): Optional. The columns to find the statistics of, e.g. only the columns that changed.
+                Defaults to every column
+
+        Raises:
+            ValueError: If the chunk's columns are not the same as the first chunk's
+        """
+        if self.columns is None:
+            self.columns = chunk.columns
+            count_values = not any(map(_describes_by_default, chunk.dtypes))
+            self.column_profiles = {name: ColumnProfile(name, dtype, self.exact_rows, count_values, self.approximate)
+                                    for name, dtype in chunk.dtypes.items()}
+            self.head = chunk.head(self.head_rows)
+            self.tail = chunk.tail(self.head_rows)
+            self.null_rows = chunk.iloc[:0]
+        elif not chunk.columns.equals(self.columns):
+            raise ValueError('Each chunk must have the same columns as the first chunk.')
+        else:
+            if len(self.head) < self.head_rows:
+                self.head = pd.concat([self.head, chunk.head(self.head_rows - len(self.head))])
+            self.tail = pd.concat([self.tail, chunk.tail(self.head_rows)]).tail(self.head_rows)
+
+        for position, name in enumerate(self.columns):
+            if columns is not None and name not in columns:
+                continue
+            column = self.column_profiles[name]
+            values = chunk.iloc[:, position]
+            if values.dtype != column.dtype:
+                # e.g. a later chunk of a csv file has missing values in a column that was int64, or text
+                column.change_dtype(_common_dtype(column.dtype, values.dtype))
+            column.update(values)
+
+        missing = chunk.isna().to_numpy().any(axis=1)
+        if missing.any() and len(self.null_rows) < self.max_null_rows:
+            rows = chunk[missing].head(self.max_null_rows - len(self.null_rows))
+            self.null_rows = pd.concat([self.null_rows, rows]) if len(self.null_rows) else rows
+        self._index_parts.append(_index_part(chunk.index))
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        """Add a profile of the rows after this profile's rows, e.g. the next part of a file profiled separately."""
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        for name in self.columns:
+            column, other_column = self.column_profiles[name], other.column_profiles[name]
+            if other_column.dtype != column.dtype:
+                column.change_dtype(_common_dtype(column.dtype, other_column.dtype))
+            column.merge(other_column)
+        if len(self.head) < self.head_rows:
+            self.head = pd.concat([self.head, other.head.head(self.head_rows - len(self.head))])
+        self.tail = pd.concat([self.tail, other.tail]).tail(self.head_rows)
+        if len(self.null_rows) < self.max_null_rows and len(other.null_rows):
+            self.null_rows = pd.concat([self.null_rows, other.null_rows]).head(self.max_null_rows)
+        self._index_parts.extend(other._index_parts)
+        self.rows += other.rows
+        return self
+
+    def to_dict(self, percentiles=PERCENTILES):
+        """Return the profile as a dictionary that can be saved as JSON.
+
+        The head, tail and rows with missing values are saved as JSON tables, which keep the column types.
+        """
+        return {
+            'rows': self.rows,
+            'columns': [column.to_dict(percentiles) for column in self.column_profiles.values()],
+            'columns_dtype': str(self.columns.dtype),
+            'head': self.head.to_json(orient='table', date_format='iso'),
+            'tail': self.tail.to_json(orient='table', date_format='iso'),
+            'null_rows': self.null_rows.to_json(orient='table', date_format='iso'),
+            'index': [[_number(value) for value in part] for part in self._index_parts],
+        }
+
+    @classmethod
+    def from_dict(cls, values):
+        """Make a DataProfile from the dictionary made by to_dict()."""
+        profile = cls()
+        profile.rows = values['rows']
+        columns = [ColumnProfile.from_dict(column) for column in values['columns']]
+        profile.columns = pd.Index([column.name for column in columns], dtype=values['columns_dtype'])
+        profile.column_profiles = {column.name: column for column in columns}
+        for name in ('head', 'tail', 'null_rows'):
+            setattr(profile, name, pd.read_json(io.StringIO(values[name]), orient='table'))
+        profile._index_parts = [IndexPart(*part) for part in values['index']]
+        return profile
+
+    @property
+    def shape(self):
+        """(rows, columns), the same as df.shape."""
+        return self.rows, len(self.columns)
+
+    @property
+    def dtypes(self):
+        """The dtype of each column, the same as df.dtypes."""
+        return pd.Series({name: column.dtype for name, column in self.column_profiles.items()}, dtype='object')
+
+    @property
+    def null_counts(self):
+        """Number of missing values in each column, the same as df.isnull().sum()."""
+        return pd.Series({name: column.nulls for name, column in self.column_profiles.items()}, dtype='int64')
+
+    def nunique(self):
+        """Estimated number of different values in each column, like df.nunique(), for an approximate profile.
+
+        Raises:
+            ValueError: If the profile is not approximate
+        """
+        if not self.approximate:
+            raise ValueError('nunique() needs a profile made with approximate=True.')
+        return pd.Series({name: column.distinct.estimate() for name, column in self.column_profiles.items()},
+                         dtype='int64')
+
+    def value_counts(self, name, n=10):
+        """Estimated counts of the n most common values of a text column, like df[name].value_counts().head(n).
+
+        Raises:
+            ValueError: If the profile is not approximate, or the column is a numeric or date column
+        """
+        column = self.column_profiles[name]
+        if column.top_values is None:
+            raise ValueError('value_counts() needs a text column of a profile made with approximate=True.')
+        return column.top_values.most_common(n, name=name)
+
+    def describe(self, percentiles=PERCENTILES):
+        """Return the same summary statistics as df.describe(), estimated for an approximate profile."""
+        profiles = [column for column in self.column_profiles.values() if _describes_by_default(column.dtype)]
+        if not profiles:
+            profiles = list(self.column_profiles.values())
+        ldesc = [column.describe(percentiles) for column in profiles]
+        # The rows in the order pandas uses, with the shortest description first
+        names = []
+        for index in sorted((desc.index for desc in ldesc), key=len):
+            names.extend(name for name in index if name not in names)
+        df = pd.concat([desc.reindex(names) for desc in ldesc], axis=1, ignore_index=True, sort=False)
+        df.columns = pd.Index([column.name for column in profiles], dtype=self.columns.dtype)
+        return df
+
+    def _index_summary(self):
+        """The index line of df.info(), e.g. 'RangeIndex: 32 entries, 0 to 31'."""
+        parts = [part for part in self._index_parts if part.length]
+        if not parts:
+            return 'RangeIndex: 0 entries'
+        name = 'RangeIndex' if self._range_index() else parts[0].kind
+        return f'{name}: {self.rows} entries, {parts[0].first} to {parts[-1].last}'
+
+    def _range_index(self):
+        """True if the chunks' indexes join up to one RangeIndex, as the chunks of a csv file do."""
+        parts = [part for part in self._index_parts if part.length]
+        return all(part.is_range for part in parts) and all(
+            a.last + 1 == b.first for a, b in zip(parts, parts[1:]))
+
+    def info(self, buf=None):
+        """Write the same summary as df.info() to buf, by default the console.
+
+        Returns:
+            None, like df.info()
+        """
+        dtypes = self.dtypes
+        counts = self.null_counts.rsub(self.rows)
+        lines = [str(pd.DataFrame), self._index_summary()]
+        if len(self.columns) <= pd.get_option('display.max_info_columns'):
+            with_counts = self.rows <= pd.get_option('display.max_info_rows')
+            headers = [' # ', 'Column', 'Non-Null Count', 'Dtype'] if with_counts else [' # ', 'Column', 'Dtype']
+            rows = [[f' {i}', str(name), *([f'{counts[name]} non-null'] if with_counts else []), str(dtypes[name])]
+                    for i, name in enumerate(self.columns)]
+            widths = [max(len(header), *(len(row[i]) for row in rows)) for i, header in enumerate(headers)]
+            lines.append(f'Data columns (total {len(self.columns)} columns):')
+            lines.append('  '.join(header.ljust(width) for header, width in zip(headers, widths)))
+            lines.append('  '.join(('-' * len(header)).ljust(width) for header, width in zip(headers, widths)))
+            lines.extend('  '.join(value[:width].ljust(width) for value, width in zip(row, widths)) for row in rows)
+        else:
+            lines.append(f'Columns: {len(self.columns)} entries, {self.columns[0]} to {self.columns[-1]}')
+        dtype_counts = dtypes.map(lambda dtype: dtype.name).value_counts()
+        lines.append(f"dtypes: {', '.join(f'{name}({n:d})' for name, n in sorted(dtype_counts.items()))}")
+        memory = sum(column.memory for column in self.column_profiles.values())
+        # A RangeIndex uses the same memory whatever its length
+        index_parts = self._index_parts[:1] if self._range_index() else self._index_parts
+        memory += sum(part.memory for part in index_parts)
+        # '+' if the memory of Python objects is not counted, as df.info() shows it
+        qualifier = '+' if 'object' in dtype_counts or any(part.qualified for part in self._index_parts) else ''
+        lines.append(f'memory usage: {_size_text(memory, qualifier)}\n')
+        (buf or sys.stdout).write('\n'.join(lines))
+
+    def info_text(self):
+        """Return the text that info() writes."""
+        buf = io.StringIO()
+        self.info(buf)
+        return buf.getvalue()
+
+
+def _index_part(index):
+    """The IndexPart of a chunk's index."""
+    dtype = index.dtype
+    qualified = dtype == object or (pd.api.types.is_string_dtype(dtype) and getattr(dtype, 'storage', '') == 'python')
+    return IndexPart(type(index).__name__, len(index), index[0] if len(index) else None,
+                     index[-1] if len(index) else None, isinstance(index, pd.RangeIndex), int(index.memory_usage()),
+                     qualified)
+
+
+def _size_text(num, qualifier):
+    """Size in bytes as text, in the same way as df.info(), e.g. 3.9+ KB."""
+    for unit in ['bytes', 'KB', 'MB', 'GB', 'TB']:
+        if num < 1024.0:
+            return f'{num:3.1f}{qualifier} {unit}'
+        num /= 1024.0
+    return f'{num:3.1f}{qualifier} PB'
+
+
+def profile_dataframe(df, chunksize=None, exact_rows=EXACT_ROWS, max_null_rows=MAX_NULL_ROWS, columns=None,
+                      approximate=False):
+    """Profile a DataFrame in one pass.
+
+    Args:
+        df (DataFrame): The data
+        chunksize (int): Optional. Rows profiled at a time. Defaults to all the rows at once
+        exact_rows (int): Number of rows up to which the exact quantiles are found
+        max_null_rows (int): Number of rows with missing values to keep
+        columns (list): Optional. The columns to find the statistics of. Defaults to every column
+        approximate (bool): If True, estimate the quantiles and value counts with fixed-size sketches
+
+    Returns:
+        DataProfile: The profile
+    """
+    profile = DataProfile(exact_rows, max_null_rows, approximate=approximate)
+    chunksize = chunksize or max(len(df), 1)
+    for start in range(0, max(len(df), 1), chunksize):
+        profile.update(df.iloc[start:start + chunksize], columns)
+    # The memory of the whole DataFrame rather than the sum of the chunks, e.g. a category's categories are counted once
+    for name, memory in zip(df.columns, df.memory_usage(index=False, deep=False)):
+        profile.column_profiles[name].memory = int(memory)
+    # The whole index, so info() shows the same index summary and memory as df.info()
+    profile._index_parts = [_index_part(df.index)]
+    return profile
+
+
+def profile_csv(csv_path, chunksize=100_000, exact_rows=EXACT_ROWS, max_null_rows=MAX_NULL_ROWS, approximate=False,
+                **kwargs):
+    """Profile a csv file a chunk at a time, so the file does not have to fit in memory.
+
+    Args:
+        csv_path (Path): The csv file
+        chunksize (int): Number of rows read at a time
+        exact_rows (int): Number of rows up to which the exact quantiles are found
+        max_null_rows (int): Number of rows with missing values to keep
+        approximate (bool): If True, estimate the quantiles and value counts with fixed-size sketches, so the memory
+            used does not grow with the number of rows or different values
+        kwargs: Other arguments for pd.read_csv, e.g. usecols
+
+    Returns:
+        DataProfile: The profile
+    """
+    profile = DataProfile(exact_rows, max_null_rows, approximate=approximate)
+    with pd.read_csv(csv_path, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            profile.update(chunk)
+    return profile
+
+
+def _shared_column(values):
+    """The numpy dtype a column is stored as in shared memory and the dtype to restore, or None to pickle it.
+
+    Numeric and date columns are shared. A nullable integer or float column is shared as float64 with NaN for the
+    missing values, and changed back to its dtype by the worker.
+    """
+    dtype = values.dtype
+    if _kind(dtype) == 'other' or isinstance(dtype, pd.DatetimeTZDtype):
+        return None
+    if isinstance(dtype, np.dtype):
+        return dtype.str, None
+    if dtype.kind in 'iuf':
+        return np.dtype('float64').str, str(dtype)
+    return None
+
+
+def _profile_column_group(shm_name, shared, pickled, rows, exact_rows, count_values, approximate, percentiles):
+    """Profile a group of columns in a worker process.
+
+    Args:
+        shm_name (str): Name of the shared memory block with the numeric columns
+        shared (list): (name, numpy dtype, dtype to restore, byte offset) of each column in the shared memory
+        pickled (DataFrame): The other columns of the group
+        rows (int): Number of rows
+
+    Returns:
+        tuple: (the ColumnProfile of each column, or its to_dict() for an exact profile so the values are not sent
+                back, packed bits of the rows with a missing value)
+    """
+    block = shared_memory.SharedMemory(name=shm_name) if shared else None
+    try:
+        columns, missing = _profile_columns(block, shared, pickled, rows, exact_rows, count_values, approximate,
+                                            percentiles)
+    finally:
+        if block is not None:
+            block.close()
+    return columns, np.packbits(missing)
+
+
+def _profile_columns(block, shared, pickled, rows, exact_rows, count_values, approximate, percentiles):
+    """Profile the columns of a group. The arrays on the shared memory are released when this returns."""
+    profiles = []
+    missing = np.zeros(rows, dtype=bool)
+    columns = [(name, np.ndarray(rows, dtype=np.dtype(dtype), buffer=block.buf, offset=offset), restore)
+               for name, dtype, restore, offset in shared]
+    columns += [(name, pickled[name], None) for name in pickled.columns]
+    for name, values, restore in columns:
+        values = pd.Series(values, name=name, copy=False)
+        if restore is not None:
+            values = values.astype(restore)
+        column = ColumnProfile(name, values.dtype, exact_rows, count_values, approximate)
+        column.update(values)
+        missing |= values.isna().to_numpy()
+        profiles.append(column if approximate else column.to_dict(percentiles))
+    return profiles, missing
+
+
+def profile_parallel(df, workers=None, group_size=None, exact_rows=EXACT_ROWS, max_null_rows=MAX_NULL_ROWS,
+                     approximate=False, percentiles=PERCENTILES):
+    """Profile the columns of a wide DataFrame in a process pool, with the numeric columns in shared memory.
+
+    The columns are split into groups, and each group is profiled in a worker process. The numeric and date columns
+    are copied once into a shared memory block that every worker reads, rather than being pickled and sent to each
+    worker; the other columns are pickled with their group. The workers send back the statistics of each column, and
+    the rows with missing values as packed bits, which are put together into one DataProfile.
+
+    The results are the same as profile_dataframe(df). An exact profile from the workers has the quantiles of the
+    percentiles, but not the values, so merge() with it drops the exact quantiles.
+
+    Args:
+        df (DataFrame): The data
+        workers (int): Optional. Number of processes. Defaults to the number of CPUs
+        group_size (int): Optional. Columns profiled by a worker at a time. Defaults to 4 groups for each worker
+        exact_rows (int): Number of rows up to which the exact quantiles are found
+        max_null_rows (int): Number of rows with missing values to keep
+        approximate (bool): If True, estimate the quantiles and value counts with fixed-size sketches
+        percentiles (list): The quantiles found for an exact profile
+
+    Returns:
+        DataProfile: The profile
+    """
+    workers = workers or os.cpu_count() or 1
+    group_size = group_size or max(1, -(-len(df.columns) // (workers * 4)))
+    profile = DataProfile(exact_rows, max_null_rows, approximate=approximate)
+    # The columns and dtypes, without the statistics of the columns
+    profile.update(df.iloc[:0], columns=[])
+    profile.head, profile.tail = df.head(profile.head_rows), df.tail(profile.head_rows)
+    profile.rows = len(df)
+    count_values = not any(map(_describes_by_default, df.dtypes))
+
+    # Copy the numeric columns into one shared memory block, each at its own offset
+    layout, size = {}, 0
+    for position, name in enumerate(df.columns):
+        shared = _shared_column(df.iloc[:, position])
+        if shared is not None:
+            layout[position] = (name, *shared, size)
+            size += np.dtype(shared[0]).itemsize * len(df)
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1)) if layout else None
+    try:
+        for position, (name, dtype, restore, offset) in layout.items():
+            values = df.iloc[:, position]
+            target = np.ndarray(len(df), dtype=np.dtype(dtype), buffer=block.buf, offset=offset)
+            target[:] = values.to_numpy(dtype='float64', na_value=np.nan) if restore else values.to_numpy()
+            del target
+
+        groups = [range(start, min(start + group_size, len(df.columns)))
+                  for start in range(0, len(df.columns), group_size)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups) or 1)) as executor:
+            futures = [executor.submit(_profile_column_group, block.name if block else None,
+                                       [layout[position] for position in group if position in layout],
+                                       df.iloc[:, [position for position in group if position not in layout]],
+                                       len(df), exact_rows, count_values, approximate, percentiles)
+                       for group in groups]
+            results = [future.result() for future in futures]
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+
+    missing = np.zeros(len(df), dtype=bool)
+    for columns, packed_missing in results:
+        for column in columns:
+            column = ColumnProfile.from_dict(column) if isinstance(column, dict) else column
+            profile.column_profiles[column.name] = column
+        missing |= np.unpackbits(packed_missing, count=len(df)).astype(bool)
+    for name, memory in zip(df.columns, df.memory_usage(index=False, deep=False)):
+        profile.column_profiles[name].memory = int(memory)
+    profile.null_rows = df[missing].head(max_null_rows)
+    profile._index_parts = [_index_part(df.index)]
+    return profile
@@ -0,0 +1,158 @@
+"""Profile reports saved as JSON and keyed by a fingerprint of the data, rendered as text or HTML.
+
+describe_dataframe() profiles the data every time it is called, even when the data has not changed. profile_report()
+saves each profile as a JSON file in the cache directory, named by the fingerprint of the data:
+    for a file, the sha256 of its contents and the schema it is read with
+    for a DataFrame, a hash of each column's values and dtype, and of the index
+
+If a report with the same fingerprint has been saved then it is read and returned, without reading or profiling the
+data. Otherwise, the report last saved for the same source (the same file, or a DataFrame with the same column names)
+is compared column by column, and only the columns whose hash changed are profiled again. The head, tail and rows with
+missing values are always found again, as they depend on every column.
+
+    profile, status = profile_report(df)       status is 'cached', 'updated' or 'new'
+    print(render_text(profile))
+"""
+import hashlib
+import html
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from tutorialpkg.data_tools.cache import CACHE_DIR, file_hash
+from tutorialpkg.data_tools.manifest import fingerprint
+from tutorialpkg.data_tools.profile import DataProfile, profile_dataframe
+from tutorialpkg.data_tools.schema import read_with_schema
+
+REPORT_CACHE_DIR = CACHE_DIR.joinpath('reports')
+# File with the fingerprint of the latest report of each source
+_LATEST_FILE = 'latest.json'
+
+
+def column_hashes(df):
+    """Return a hex digest of the values and dtype of each column, which changes when the column changes."""
+    hashes = {}
+    for position, name in enumerate(df.columns):
+        values = df.iloc[:, position]
+        sha = hashlib.sha256(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+        sha.update(str(values.dtype).encode('utf-8'))
+        hashes[str(name)] = sha.hexdigest()
+    return hashes
+
+
+def _source_key(source):
+    """Key of the latest report of a source: the file path, or the column names of a DataFrame."""
+    if isinstance(source, pd.DataFrame):
+        return fingerprint(['columns', *map(str, source.columns)])
+    return str(Path(source).resolve())
+
+
+def _read_json(path):
+    """Read a JSON file, or return None if it does not exist or cannot be read."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_json(path, values):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f'{path.name}.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(values, f)
+    temp_path.replace(path)
+
+
+def profile_report(source, schema=None, cache_dir=REPORT_CACHE_DIR):
+    """Return the profile of a file or DataFrame, from the saved report if the data has not changed.
+
+    Args:
+        source (Path or DataFrame): A csv or xlsx file, or a DataFrame
+        schema (dict): Optional. The schema to read the file with, from tutorialpkg.data_tools.schema. Files are read
+            with pd.read_csv or pd.read_excel if None
+        cache_dir (Path): Directory of the saved reports
+
+    Returns:
+        tuple: (DataProfile, 'cached' if the saved report was used, 'updated' if only the changed columns were
+                profiled, or 'new')
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    cache_dir = Path(cache_dir)
+    source_key = _source_key(source)
+    if isinstance(source, pd.DataFrame):
+        df = source
+        hashes = column_hashes(df)
+        index_hash = hashlib.sha256(pd.util.hash_pandas_object(df.index).to_numpy().tobytes()).hexdigest()
+        key = fingerprint(['dataframe', index_hash], hashes.items())
+    else:
+        df = None
+        key = fingerprint([file_hash(source)], [json.dumps(schema, sort_keys=True, default=str)])
+
+    report_path = cache_dir.joinpath(f'{key}.json')
+    report = _read_json(report_path)
+    if report is not None:
+        return DataProfile.from_dict(report['profile']), 'cached'
+
+    if df is None:
+        if schema is not None:
+            df = read_with_schema(source, schema)
+        elif Path(source).suffix == '.xlsx':
+            df = pd.read_excel(source)
+        else:
+            df = pd.read_csv(source)
+        hashes = column_hashes(df)
+
+    # Only the columns that are not the same as in the latest report of the source are profiled again
+    latest = _read_json(cache_dir.joinpath(_LATEST_FILE)) or {}
+    previous = _read_json(cache_dir.joinpath(f'{latest[source_key]}.json')) if source_key in latest else None
+    reused = {}
+    if previous is not None:
+        saved = {column['name']: column for column in previous['profile']['columns']}
+        reused = {name: saved[name] for name, column_hash in hashes.items()
+                  if previous['column_hashes'].get(name) == column_hash and name in saved}
+    changed = [name for name in df.columns if str(name) not in reused]
+    profile = profile_dataframe(df, columns=changed)
+    if reused:
+        profile_values = profile.to_dict()
+        profile_values['columns'] = [reused.get(str(column['name']), column) for column in profile_values['columns']]
+        profile = DataProfile.from_dict(profile_values)
+
+    _write_json(report_path, {'fingerprint': key, 'column_hashes': hashes, 'profile': profile.to_dict()})
+    latest[source_key] = key
+    _write_json(cache_dir.joinpath(_LATEST_FILE), latest)
+    return profile, 'updated' if reused else 'new'
+
+
+def render_text(profile):
+    """Return the description of the data as text, as printed by describe_dataframe()."""
+    sections = [
+        ('\nShape of the dataframe:', profile.shape),
+        ('First 5 rows of the dataframe:', profile.head),
+        ('Last 5 rows of the dataframe:', profile.tail),
+        ('\nColumn names:', profile.columns),
+        ('\nData types of the columns:', profile.dtypes),
+        ('\nSummary statistics:', profile.describe()),
+        ('Rows with missing values:', profile.null_rows),
+        ('\nColumns with missing values:', profile.null_counts),
+    ]
+    return ''.join(f'{title}\n{value}\n' for title, value in sections)
+
+
+def render_html(profile, title='Data profile'):
+    """Return the description of the data as an HTML page, with the tables as HTML tables."""
+    sections = [
+        ('Shape', f'<p>{profile.shape[0]} rows, {profile.shape[1]} columns</p>'),
+        ('First 5 rows', profile.head.to_html()),
+        ('Last 5 rows', profile.tail.to_html()),
+        ('Columns', f'<pre>{html.escape(profile.info_text())}</pre>'),
+        ('Summary statistics', profile.describe().to_html()),
+        ('Rows with missing values', profile.null_rows.to_html()),
+        ('Columns with missing values', profile.null_counts.to_frame('missing values').to_html()),
+    ]
+    body = ''.join(f'<h2>{heading}</h2>\n{content}\n' for heading, content in sections)
+    return (f'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>\n'
+            f'<body>\n<h1>{html.escape(title)}</h1>\n{body}</body>\n</html>\n')
@@ -0,0 +1,177 @@
+"""Access the data files in the package using importlib.resources, with memory-mapped reads.
+
+Building paths with Path(__file__).parent only works when the package is a folder of files. importlib.resources
+also works when the package is installed as a zip or wheel; as_file() then gives a temporary copy of the file on
+disk. See sample_code/example_filepath.py for a comparison of the two approaches.
+
+The resolved path of each file is cached, so each file is found (and if needed copied) once per program run.
+resource_path() is only for reading: for a zipped install the temporary copy is deleted when the program ends, so
+anything written to it is lost. Files that are written, e.g. the prepared data or the query database, go to
+output_path(), in the current working directory unless a directory is given.
+The files are read through read-only memory maps, so the operating system pages the data in from the file as it is
+used rather than the program reading a copy of the whole file into memory.
+
+pandas is imported in the read functions rather than at the top so that the command line module can use the paths
+without importing pandas.
+"""
+import atexit
+import contextlib
+import functools
+import mmap
+import sqlite3
+from importlib.resources import as_file, files
+from pathlib import Path
+
+DATA_PACKAGE = 'tutorialpkg.data'
+DB_DATA_PACKAGE = 'tutorialpkg.data_db_activity'
+
+# Keeps any temporary copies made by as_file() until the program ends
+_resource_files = contextlib.ExitStack()
+atexit.register(_resource_files.close)
+
+
+@functools.lru_cache(maxsize=None)
+def resource_path(name, package=DATA_PACKAGE):
+    """Return a file system path for a data file in the package.
+
+    Args:
+        name (str): File name, e.g. 'npc_codes.csv'
+        package (str): Package that contains the file. Defaults to 'tutorialpkg.data'
+
+    Returns:
+        Path: Path to the file, which stays valid until the program ends
+    """
+    return _resource_files.enter_context(as_file(files(package).joinpath(name)))
+
+
+def output_path(name, directory=None):
+    """Return the path to write a data file to, as resource_path() may be a temporary copy of the file.
+
+    Args:
+        name (str): File name, e.g. 'para_queries.db'
+        directory (Path): Optional. Directory for the file. Defaults to the current working directory
+
+    Returns:
+        Path: Path of the file in the directory
+    """
+    return Path(directory or Path.cwd()).joinpath(name)
+
+
+def find_data_file(name, package=DATA_PACKAGE):
+    """Return the path of a data file to read, preferring a copy written to the current working directory.
+
+    A file made by a command, e.g. the database from 'paralympics build-db', is used by the next command. If there is
+    no such file, the package's file is used.
+
+    Args:
+        name (str): File name
+        package (str): Package that contains the file
+
+    Returns:
+        Path: output_path(name) if that file exists, otherwise resource_path(name, package)
+    """
+    written = output_path(name)
+    return written if written.is_file() else resource_path(name, package)
+
+
+@functools.lru_cache(maxsize=None)
+def resource_buffer(name, package=DATA_PACKAGE):
+    """Return a read-only memoryview of a data file, backed by a memory map.
+
+    Slicing the memoryview does not copy the data. The same buffer is returned for each call.
+
+    Args:
+        name (str): File name
+        package (str): Package that contains the file
+
+    Returns:
+        memoryview: The contents of the file
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with open(resource_path(name, package), 'rb') as f:
+        # The memory map stays valid after the file is closed
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def open_resource(name, package=DATA_PACKAGE):
+    """Open a data file as a binary file object that reads from the memory-mapped buffer.
+
+    Each call gives a new file object with its own position, and none of them copy the buffer.
+    It can be passed to readers that need a file object, e.g. pd.read_excel() or openpyxl.load_workbook().
+
+    Args:
+        name (str): File name
+        package (str): Package that contains the file
+
+    Returns:
+        pyarrow.BufferReader: Seekable, read-only file object
+    """
+    import pyarrow as pa
+
+    return pa.BufferReader(resource_buffer(name, package))
+
+
+def read_csv_resource(name, package=DATA_PACKAGE, **kwargs):
+    """Read a csv data file into a DataFrame from its memory map.
+
+    Args:
+        name (str): File name
+        package (str): Package that contains the file
+        **kwargs: Keyword arguments for pd.read_csv
+
+    Returns:
+        DataFrame: The data
+    """
+    import pandas as pd
+
+    if kwargs.get('engine') == 'pyarrow':
+        # The pyarrow parser reads straight from the buffer
+        return pd.read_csv(open_resource(name, package), **kwargs)
+    return pd.read_csv(resource_path(name, package), memory_map=True, **kwargs)
+
+
+def read_excel_resource(name, package=DATA_PACKAGE, **kwargs):
+    """Read an Excel data file into a DataFrame from a memory map of the file.
+
+    Args:
+        name (str): File name
+        package (str): Package that contains the file
+        **kwargs: Keyword arguments for pd.read_excel, e.g. sheet_name
+
+    Returns:
+        DataFrame, or dict of DataFrames if more than one sheet is read
+    """
+    import pandas as pd
+
+    with open_resource(name, package) as f:
+        return pd.read_excel(f, **kwargs)
+
+
+def connect_db(name, package=DB_DATA_PACKAGE, mmap_size=256 * 1024 * 1024):
+    """Connect to a SQLite database file in the package, with memory-mapped I/O enabled.
+
+    With mmap_size set, SQLite reads the database pages from a memory map of the file rather than copying them.
+
+    Args:
+        name (str): Database file name, e.g. 'para_queries.db'
+        package (str): Package that contains the file. Defaults to 'tutorialpkg.data_db_activity'
+        mmap_size (int): Maximum number of bytes of the file to memory map
+
+    Returns:
+        tuple: The connection and cursor objects
+
+    Raises:
+        FileNotFoundError: If the database file does not exist
+    """
+    db_path = resource_path(name, package)
+    if not db_path.is_file():
+        # sqlite3.connect would create a new empty database
+        raise FileNotFoundError(f'Database file {db_path} does not exist.')
+    con = sqlite3.connect(db_path)
+    cur = con.cursor()
+    cur.execute(f'PRAGMA mmap_size = {int(mmap_size)};')
+    cur.execute('PRAGMA foreign_keys = ON;')
+    con.commit()
+    return con, cur
@@ -0,0 +1,134 @@
+"""Declared schemas for the paralympics data files and a reader that applies them.
+
+Reading a file with default settings and then converting the columns (float64 to int, object to datetime) decodes
+each column twice. The schemas below give pandas the columns to read, the final data type of each column and the
+date format, so each column is decoded once by the reader into its final type.
+
+Each schema is a dictionary with:
+    columns: dictionary of column name to pandas data type, in file order.
+        'Int64' is the nullable integer type, used for counts that have missing values in the raw data.
+        'category' is used for columns with a small number of repeated values.
+    dates: dictionary of column name to date format, for dates stored as text in csv files
+    sheet_name: the sheet to read when the file is an Excel workbook
+    read_options: any other keyword arguments for the pandas reader
+"""
+from pathlib import Path
+
+import pandas as pd
+
+from tutorialpkg.data_tools.cache import cached_read
+
+EVENTS_SCHEMA = {
+    'columns': {
+        'type': 'category',
+        'year': 'int64',
+        'country': 'category',
+        'host': 'str',
+        'start': 'datetime64[us]',
+        'end': 'datetime64[us]',
+        'disabilities_included': 'str',
+        'countries': 'Int64',
+        'events': 'Int64',
+        'sports': 'int64',
+        'participants_m': 'Int64',
+        'participants_f': 'Int64',
+        'participants': 'Int64',
+        'highlights': 'str',
+        'URL': 'str',
+    },
+    'dates': {'start': '%d/%m/%Y', 'end': '%d/%m/%Y'},
+    'sheet_name': 'events',
+    # The pyarrow csv parser decodes the nullable integer and date columns much faster than the default parser
+    'read_options': {'engine': 'pyarrow'},
+}
+
+MEDALS_SCHEMA = {
+    'columns': {
+        'Location': 'category',
+        'Year': 'int64',
+        'Rank': 'Int64',
+        'Team': 'category',
+        'NPC': 'category',
+        'Gold': 'int64',
+        'Silver': 'int64',
+        'Bronze': 'int64',
+        'Total': 'int64',
+    },
+    'dates': {},
+    'sheet_name': 'medal_standings',
+    'read_options': {'engine': 'pyarrow'},
+}
+
+NPC_SCHEMA = {
+    'columns': {
+        'Code': 'category',
+        'Name': 'str',
+        'Region': 'category',
+        'Sub-Region': 'category',
+        'Member Type': 'category',
+        'Notes': 'str',
+    },
+    'dates': {},
+    'sheet_name': 'npc_codes',
+    # The npc_codes.csv file has some characters that are not valid utf-8
+    'read_options': {'encoding': 'utf-8', 'encoding_errors': 'ignore'},
+}
+
+
+def schema_read_kwargs(schema, file_type='csv', columns=None):
+    """Keyword arguments for pd.read_csv or pd.read_excel that apply a schema.
+
+    Args:
+        schema (dict): One of the schemas in this module
+        file_type (str): 'csv' or 'xlsx'
+        columns (list): Optional. Subset of the schema columns to read, all schema columns are read if None
+
+    Returns:
+        dict: Keyword arguments for the pandas reader
+
+    Raises:
+        ValueError: If a column is not in the schema or the file type is not supported
+    """
+    columns = list(columns) if columns else list(schema['columns'])
+    unknown = [col for col in columns if col not in schema['columns']]
+    if unknown:
+        raise ValueError(f'Columns {unknown} are not in the schema.')
+
+    dates = {col: fmt for col, fmt in schema['dates'].items() if col in columns}
+    # The date columns are decoded by the date parser, not the dtype
+    dtype = {col: schema['columns'][col] for col in columns if col not in dates}
+
+    if file_type == 'csv':
+        kwargs = {'usecols': columns, 'dtype': dtype, **schema['read_options']}
+        if dates:
+            kwargs['parse_dates'] = list(dates)
+            kwargs['date_format'] = dates
+    elif file_type == 'xlsx':
+        # Dates in Excel are stored as dates, so they are already read as datetime
+        kwargs = {'sheet_name': schema['sheet_name'], 'usecols': columns, 'dtype': dtype}
+    else:
+        raise ValueError("Invalid file type. Please specify 'csv' or 'xlsx'.")
+    return kwargs
+
+
+def read_with_schema(source, schema, columns=None, cache=False):
+    """Read a csv or xlsx file with each column decoded into the type given in the schema.
+
+    Args:
+        source (Path): Path to the csv or xlsx file
+        schema (dict): One of the schemas in this module
+        columns (list): Optional. Subset of the schema columns to read
+        cache (bool): If True, read through the columnar cache in tutorialpkg.data_tools.cache
+
+    Returns:
+        DataFrame: The data, with the columns in the order they are in the file
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    file_type = 'xlsx' if Path(source).suffix == '.xlsx' else 'csv'
+    reader = pd.read_excel if file_type == 'xlsx' else pd.read_csv
+    kwargs = schema_read_kwargs(schema, file_type, columns)
+    if cache:
+        return cached_read(source, reader, **kwargs)
+    return reader(source, **kwargs)
@@ -0,0 +1,93 @@
+"""Read several sheets of an Excel workbook while opening the file only once.
+
+Each call to pd.read_excel opens and unzips the workbook again, so reading three sheets from the same file does the
+work three times. read_workbook() opens the workbook once in openpyxl read-only mode, streams the rows of the requested
+sheets with iter_rows(), keeps only the requested columns and returns a dictionary of DataFrames.
+
+The rows are passed to the same pandas parser that pd.read_excel uses, so the column data types are the same.
+"""
+import openpyxl
+from pandas.io.parsers import TextParser
+
+
+def _cell_value(value):
+    """Convert a cell value in the same way as the pandas openpyxl reader.
+
+    Empty cells become an empty string (read as NaN by the parser) and whole number floats become int.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _read_sheet(worksheet, columns=None):
+    """Stream the rows of one worksheet into a DataFrame.
+
+    Args:
+        worksheet: openpyxl worksheet opened in read-only mode
+        columns (list): Optional. Names of the columns to keep, all columns are kept if None
+
+    Returns:
+        DataFrame: The sheet data with the first row used as the column names
+
+    Raises:
+        ValueError: If a requested column is not in the sheet
+    """
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return TextParser([[]], header=0).read()
+
+    # Trailing empty header cells are formatting only, unnamed columns in the middle are kept as pandas would
+    header = list(header)
+    while header and header[-1] is None:
+        header.pop()
+    header = [name if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+
+    if columns is None:
+        positions = list(range(len(header)))
+    else:
+        missing = [col for col in columns if col not in header]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in sheet '{worksheet.title}'")
+        positions = [header.index(col) for col in columns]
+
+    data = [[header[i] for i in positions]]
+    for row in rows:
+        values = [_cell_value(row[i]) if i < len(row) else '' for i in positions]
+        # Skip blank rows, as pd.read_excel does
+        if any(value != '' for value in values):
+            data.append(values)
+
+    return TextParser(data, header=0).read()
+
+
+def read_workbook(source, sheets, columns=None):
+    """Read the requested sheets of an Excel workbook, opening the file once.
+
+    Args:
+        source (Path): Path to the xlsx file
+        sheets (list): Sheet names (str) or positions (int) to read
+        columns (dict): Optional. Maps a sheet in 'sheets' to the list of columns to read from it.
+            Sheets that are not in the dictionary are read with all columns.
+
+    Returns:
+        dict: The DataFrame for each sheet, keyed by the values given in 'sheets'
+
+    Raises:
+        FileNotFoundError: If the workbook does not exist
+        KeyError: If a sheet name is not in the workbook
+    """
+    columns = columns or {}
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        dfs = {}
+        for sheet in sheets:
+            worksheet = workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+            dfs[sheet] = _read_sheet(worksheet, columns.get(sheet))
+        return dfs
+    finally:
+        # Read-only workbooks keep the file open until they are closed
+        workbook.close()
@@ -16,6 +16,13 @@ from pathlib import Path
 
 import pandas as pd
 
+from tutorialpkg.data_tools.countries import resolve_country_names
+from tutorialpkg.data_tools.export import export_dataframe
+from tutorialpkg.data_tools.npc import load_npc_codes
+from tutorialpkg.data_tools.nulls import null_profile
+from tutorialpkg.data_tools.profile import profile_dataframe
+from tutorialpkg.data_tools.reports import profile_report
+
 # Set the pandas display options to display all columns
 pd.set_option('display.expand_frame_repr', False)
 # Alternative method to display all columns, wraps to the next line
@@ -39,45 +46,70 @@ def describe_dataframe(df):
 
     """
 
+    # Find everything below in one pass over the data, or read it from the saved report if the data has not changed
+    profile, _ = profile_report(df)
+
     # Display the shape of the dataframe
     print("\nShape of the dataframe:")
-    print(df.shape)
+    print(profile.shape)
 
     # Display the first 5 rows of the dataframe
     print("First 5 rows of the dataframe:")
-    print(df.head())
+    print(profile.head)
 
     # Display the last 5 rows of the dataframe
     print("Last 5 rows of the dataframe:")
-    print(df.tail())
+    print(profile.tail)
 
     # Display the column names
     print("\nColumn names:")
-    print(df.columns)
+    print(profile.columns)
 
     # Display the data types of the columns
     print("\nData types of the columns:")
-    print(df.dtypes)
+    print(profile.dtypes)
 
     # Display summary statistics
     print("\nSummary statistics:")
-    print(df.describe())
+    print(profile.describe())
 
-    # Display any missing values in the dataframe
+    # Display the rows and columns with missing values
     print("Rows with missing values:")
-    print(df[df.isna().any(axis=1)])
+    print(profile.null_rows)
 
     # Print columns with missing values
     print("\nColumns with missing values:")
-    print(df.isnull().sum())
+    print(profile.null_counts)
+
 
+def print_type_values(values, approximate=False, unique_first=False):
+    """Print the count of each value of a column and the different values.
 
-def prepare_event_data(df_raw, df_npc=None):
+    Parameters:
+    values (Series): The column, e.g. 'type'
+    approximate (bool): Optional. Estimate the counts and the number of different values with fixed-size sketches,
+        which use the same memory however large the data is
+    unique_first (bool): Optional. Print the different values before the counts
+    """
+    if approximate:
+        profile = profile_dataframe(values.to_frame(), approximate=True)
+        print(profile.value_counts(values.name))  # estimated count of the most common values
+        print(f"About {profile.nunique()[values.name]} different values")
+    elif unique_first:
+        print(values.unique())  # prints the unique values
+        print(values.value_counts())  # counts the number of each unique value
+    else:
+        print(values.value_counts())  # counts the number of each unique value
+        print(values.unique())  # prints the unique values
+
+
+def prepare_event_data(df_raw, df_npc=None, approximate=False):
     """Prepare the event data for analysis
 
     Parameters:
     df_raw (DataFrame): Pandas DataFrame with the event data
     df_npc (DataFrame): Optional. Pandas DataFrame with the NPC codes data
+    approximate (bool): Optional. Estimate the counts of the 'type' values with fixed-size sketches, for very large data
 
     Returns:
     df_prepared (DataFrame): Pandas DataFrame
@@ -113,14 +145,8 @@ def prepare_event_data(df_raw, df_npc=None):
     # The fields to join on are 'Name' in the NPC data and 'country' in the event data
 
     # Activity 7: Correct the country names before doing the merge
-    replacement_names = {
-        'UK': 'Great Britain',
-        'USA': 'United States of America',
-        'Korea': 'Republic of Korea',
-        'Russia': 'Russian Federation',
-        'China': "People's Republic of China"
-    }
-    df_raw['country'] = df_raw['country'].replace(replacement_names)
+    # The names to replace, e.g. 'UK' with 'Great Britain', are in data/country_aliases.csv
+    df_raw['country'] = resolve_country_names(df_raw['country'])
 
     if df_npc is not None:
         df_merge = df_raw.merge(df_npc, left_on='country', right_on='Name', how='left')
@@ -134,24 +160,24 @@ def prepare_event_data(df_raw, df_npc=None):
     print(df_prepared.columns)
 
     # Activity 7: Display any missing values in the dataframe
+    # null_profile finds the missing values in one pass, in place of calling isna() for each of the results below
+    nulls = null_profile(df_prepared)
     print("\nRows with missing values:")
-    # print(df_prepared.isna().any(axis=1))  # this version print all rows with True or False
-    print(df_prepared[df_prepared.isna().any(axis=1)])
+    # print(nulls.row_mask)  # this version print all rows with True or False
+    print(nulls.rows)
     print("\nColumns with missing values:")
-    print(df_prepared.isnull().any(axis=0))  # this version prints all columns with True or False
-    print(df_prepared.columns[df_prepared.isna().any()].tolist())  # prints only the columns names with missing values
+    print(nulls.column_mask)  # this version prints all columns with True or False
+    print(nulls.columns)  # prints only the columns names with missing values
     print("\nTotal number of missing values:")
-    print(df_prepared.isnull().sum().sum())
+    print(nulls.total)
 
     # Activity 8: Correct values in a categorical column ['type']
     print("\nUnique values in the 'type' column:")
-    print(df_prepared['type'].value_counts())  # counts the number of each unique value
-    print(df_prepared['type'].unique())  # prints the unique values
+    print_type_values(df_prepared['type'], approximate)
     # remove whitespace and convert all to lowercase
     df_prepared['type'] = df_prepared['type'].str.strip().str.lower()
     print("\nUnique values in the 'type' column after corrections made:")
-    print(df_prepared['type'].unique())  # prints the unique values
-    print(df_prepared['type'].value_counts())  # counts the number of each unique value
+    print_type_values(df_prepared['type'], approximate, unique_first=True)
 
     # Activity 9: Insery a new column, duration, after the start and end columns
     insert_loc = df_prepared.columns.get_loc('end')
@@ -160,11 +186,9 @@ def prepare_event_data(df_raw, df_npc=None):
     print("\nColumns after inserting the 'duration' column:")
     print(df_prepared.columns)
 
-    # Activity 10: Save the prepared data to a csv file and excel file
+    # Activity 10: Save the prepared data to a csv file and excel file, written at the same time
     filepath_to_save = Path(__file__).parent.parent.joinpath("data", "paralympics_events_prepared.csv")
-    df_prepared.to_csv(filepath_to_save, index=False)
-    filepath_to_save_e = Path(__file__).parent.parent.joinpath("data", "paralympics_events_prepared.xlsx")
-    df_prepared.to_excel(filepath_to_save_e, index=False)
+    export_dataframe(df_prepared, filepath_to_save, formats=('csv', 'xlsx'))
 
     return df_prepared
 
@@ -220,7 +244,8 @@ if __name__ == "__main__":
     # prepare_event_data(events_csv_df)
 
     # Activities 5-8: Call the function to prepare the data and merge the event data with the NPC data
-    df_npc_codes = pd.read_csv(npc_csv, usecols=['Code', 'Name'], encoding='utf-8', encoding_errors='ignore')
+    # The normalised copy of npc_codes.csv is built on the first run, so the encoding errors are not dealt with each time
+    df_npc_codes = load_npc_codes(['Code', 'Name'], npc_csv)
     # merged_df = prepare_event_data(events_csv_df, df_npc_codes)
 
     # Activity 10: Final call to the function to return the prepared data to a dataframe and save to file
@@ -2,11 +2,19 @@
 
 Introduced smaller functions to some aspects to allow for more tests.
 """
-from contextlib import redirect_stdout
 from pathlib import Path
 
 import pandas as pd
 
+from tutorialpkg.data_tools.cache import CACHE_DIR, file_hash
+from tutorialpkg.data_tools.countries import COUNTRY_ALIASES_CSV, resolve_country_names
+from tutorialpkg.data_tools.dates import get_date_codec
+from tutorialpkg.data_tools.dtypes import describe_savings, optimise_dtypes
+from tutorialpkg.data_tools.export import export_dataframe, write_dataframe, write_xlsx
+from tutorialpkg.data_tools.npc import NPC_JOIN_VERSION, NpcJoinIndex
+from tutorialpkg.data_tools.pipeline import Pipeline
+from tutorialpkg.data_tools.reports import profile_report, render_html, render_text
+
 
 def describe_dataframe(df, output_file):
     """ Description of the contents of the data using Pandas dataframe functions.
@@ -19,35 +27,26 @@ def describe_dataframe(df, output_file):
             - Display summary statistics
             - Display any missing values in the dataframe
 
+            The profile is read from the saved report if the data has not changed, and only the changed columns are
+            profiled again if it has.
+
         Args:
-           output_file (Path) : Filepath of the file to save the description to
+           output_file (Path) : Filepath of the file to save the description to, as HTML if it ends in .html
            df (DataFrame) : Pandas dataframe with the data in
     """
+    profile, _ = profile_report(df)
+    text = render_html(profile) if Path(output_file).suffix == '.html' else render_text(profile)
     with open(output_file, mode='w', encoding='UTF-8') as output:
-        with redirect_stdout(output):
-            print("\nShape of the dataframe:")
-            print(df.shape)
-            print("First 5 rows of the dataframe:")
-            print(df.head())
-            print("Last 5 rows of the dataframe:")
-            print(df.tail())
-            print("\nColumn names:")
-            print(df.columns)
-            print("\nData types of the columns:")
-            print(df.dtypes)
-            print("\nSummary statistics:")
-            print(df.describe())
-            print("Rows with missing values:")
-            print(df[df.isna().any(axis=1)])
-            print("\nColumns with missing values:")
-            print(df.isnull().sum())
-
-
-def convert_float_to_int(df):
+        output.write(text)
+
+
+def convert_float_to_int(df, optimise=False):
     """Convert float64 columns to int.
 
     Args:
         df (DataFrame): DataFrame with float64 columns to be converted.
+        optimise (bool): Also downcast the integer columns to the smallest integer type and make text columns with
+            few different values categorical, printing the memory saved for each column.
 
     Returns:
         DataFrame: DataFrame with float64 columns converted to int.
@@ -58,6 +57,9 @@ def convert_float_to_int(df):
             df[col] = df[col].astype('int')
         except ValueError as e:
             print(f"Error converting column {col} to int: {e}")
+    if optimise:
+        df, savings = optimise_dtypes(df)
+        print(describe_savings(savings))
     return df
 
 
@@ -73,8 +75,10 @@ def convert_to_datetime(df, columns, date_format='%d/%m/%Y'):
         df : DataFrame with columns converted to datetime format
 
     """
+    # Each different date string is parsed once, and remembered for the next call
+    codec = get_date_codec(date_format)
     for col in columns:
-        df[col] = pd.to_datetime(df[col], format=date_format)
+        df[col] = codec.to_datetime(df[col])
     return df
 
 
@@ -93,20 +97,91 @@ def add_duration_column(df, start_col, end_col):
 
 def save_dataframe_to_file(df, file_path, file_type):
     """
-    Save the dataframe to a CSV and Excel file.
+    Save the dataframe to a CSV, Excel, parquet or feather file.
     Args:
         df (pd.DataFrame): DataFrame to save
-        file_path (str): Path to save the CSV or XLSX file
-        file_type (str): 'csv' or 'xlsx' to specify the file type
+        file_path (str): Path to save the file
+        file_type (str): 'csv', 'csv.gz', 'csv.zst', 'parquet', 'feather' or 'xlsx' to specify the file type
     Raises:
         ValueError: If an invalid file type is specified
     """
-    if file_type is 'csv':
-        df.to_csv(file_path, index=False)
-    elif file_type is 'xlsx':
-        df.to_excel(file_path, index=False)
-    else:
-        raise ValueError("Invalid file type. Please specify 'csv' or 'xlsx'.")
+    write_dataframe(df, file_path, file_type)
+
+
+def replace_country_names(df):
+    """Replace the short country names, e.g. 'UK' for 'Great Britain', using data/country_aliases.csv."""
+    df['country'] = resolve_country_names(df['country'])
+    return df
+
+
+def merge_npc_codes(df, df_npc):
+    """Add the NPC code columns to the event data with a left join on the country name.
+
+    The rows are found with a join index on the NPC names rather than a merge, and each NPC column is spread to the
+    event rows with a take. Countries that have no NPC are printed.
+
+    Args:
+        df (DataFrame): Event data with a 'country' column
+        df_npc (DataFrame): NPC data with a 'Name' column
+
+    Returns:
+        DataFrame: The event data with the NPC columns added, missing where the country has no NPC
+    """
+    positions, unmatched = NpcJoinIndex.from_names(df_npc['Name']).join(df['country'])
+    if unmatched:
+        print(f"Countries with no NPC code: {', '.join(f'{name} ({rows} rows)' for name, rows in unmatched.items())}")
+    # A merge gives a new RangeIndex, which the saved files and the later stages expect
+    df = df.reset_index(drop=True)
+    for col in df_npc.columns:
+        df[col] = pd.api.extensions.take(df_npc[col].array, positions, allow_fill=True)
+    return df
+
+
+def drop_columns(df, columns):
+    """Remove the columns from the dataframe."""
+    return df.drop(columns=list(columns))
+
+
+def create_event_pipeline(merge_npc=True, cache_dir=None):
+    """Declare the steps that prepare the event data as the stages of a pipeline.
+
+    Args:
+        merge_npc (bool): Whether to add the NPC codes from the 'npc' source
+        cache_dir (Path): Optional. Directory for the cached stage results
+
+    Returns:
+        Pipeline: Stages that use the sources 'events' and, if merge_npc is True, 'npc'. The last stage is 'duration'
+    """
+    cols_to_drop = ('URL', 'disabilities_included', 'highlights', 'Name') if merge_npc else (
+        'URL', 'disabilities_included', 'highlights')
+    pipeline = Pipeline(cache_dir)
+    pipeline.add('int_columns', convert_float_to_int, ['events'])
+    pipeline.add('dates', convert_to_datetime, ['int_columns'], {'columns': ('start', 'end')})
+    # The versions change when the alias table or the NPC join changes, so the cached results are not used
+    pipeline.add('country_names', replace_country_names, ['dates'], version=file_hash(COUNTRY_ALIASES_CSV))
+    if merge_npc:
+        pipeline.add('npc_codes', merge_npc_codes, ['country_names', 'npc'], version=NPC_JOIN_VERSION)
+    pipeline.add('drop_columns', drop_columns, ['npc_codes' if merge_npc else 'country_names'],
+                 {'columns': cols_to_drop})
+    pipeline.add('type_column', clean_type_column, ['drop_columns'])
+    pipeline.add('duration', add_duration_column, ['type_column'], {'start_col': 'start', 'end_col': 'end'})
+    return pipeline
+
+
+def prepare_event_chunk(df, df_npc=None):
+    """Prepare a block of event data that already has the unwanted rows removed.
+
+    Used for each chunk by prepare_event_data_streaming(), so the stages are not cached.
+
+    Args:
+        df (DataFrame): Event data
+        df_npc (DataFrame): Optional. Dataframe with paralympics country code data
+
+    Returns:
+        DataFrame: Prepared event data
+    """
+    pipeline = create_event_pipeline(merge_npc=df_npc is not None)
+    return pipeline.run({'events': df, 'npc': df_npc}, use_cache=False)['duration']
 
 
 def prepare_event_data(df_raw, df_npc=None):
@@ -120,30 +195,44 @@ def prepare_event_data(df_raw, df_npc=None):
         df_prepared (DataFrame): DataFrame for use in  the project
     """
     df_prepared = df_raw.drop(index=[0, 17, 31]).reset_index(drop=True)
-    df_prepared = convert_float_to_int(df_prepared)
-    df_prepared = convert_to_datetime(df_prepared, ['start', 'end'])
+    # Cached, so running again only repeats the stages after a change to the data or the steps
+    pipeline = create_event_pipeline(merge_npc=df_npc is not None, cache_dir=CACHE_DIR.joinpath('pipeline'))
+    df_prepared = pipeline.run({'events': df_prepared, 'npc': df_npc})['duration']
 
-    replacements = {
-        'UK': 'Great Britain',
-        'USA': 'United States of America',
-        'Korea': 'Republic of Korea',
-        'Russia': 'Russian Federation',
-        'China': "People's Republic of China"
-    }
-    df_prepared = df_prepared['country'] = df_prepared['country'].replace(replacements)
+    # The csv and xlsx files are written at the same time
+    csv_path = Path(__file__).parent.parent.joinpath("data", "paralympics_events_prepared.csv")
+    export_dataframe(df_prepared, csv_path, formats=('csv', 'xlsx'))
 
-    if df_npc is not None:
-        df_prepared = df_prepared.merge(df_npc, left_on='country', right_on='Name', how='left')
+    return df_prepared
 
-    cols_to_drop = ['URL', 'disabilities_included', 'highlights', 'Name']
-    df_prepared = df_prepared.drop(columns=cols_to_drop)
 
-    df_prepared = clean_type_column(df_prepared)
-    df_prepared = add_duration_column(df_prepared, 'start', 'end')
+def prepare_event_data_streaming(raw_csv, csv_path, df_npc=None, chunksize=100_000, drop_rows=(0, 17, 31),
+                                 excel_path=None):
+    """Prepare the event data csv file in chunks and append each prepared chunk to the output csv file.
 
-    csv_path = Path(__file__).parent.parent.joinpath("data", "paralympics_events_prepared.csv")
-    excel_path = Path(__file__).parent.parent.joinpath("data", "paralympics_events_prepared.xlsx")
-    save_dataframe_to_file(df_prepared, csv_path, file_type='csv')
-    save_dataframe_to_file(df_prepared, excel_path, file_type='xlsx')
+    Peak memory depends on the chunk size rather than the size of the raw file.
 
-    return df_prepared
+    Args:
+        raw_csv (Path): Csv file with the raw event data
+        csv_path (Path): Csv file to save the prepared data to
+        df_npc (DataFrame): Optional. Dataframe with paralympics country code data
+        chunksize (int): Number of rows read at a time
+        drop_rows (list): Row numbers in the raw file to remove
+        excel_path (Path): Optional. Excel file to also save the prepared chunks to
+
+    Returns:
+        int: Number of rows written
+    """
+    def prepared_chunks():
+        with pd.read_csv(raw_csv, chunksize=chunksize) as reader:
+            for i, chunk in enumerate(reader):
+                # The chunk index continues from the previous chunk so it can be matched to drop_rows
+                chunk = chunk.drop(index=chunk.index.intersection(list(drop_rows)))
+                df_prepared = prepare_event_chunk(chunk, df_npc)
+                df_prepared.to_csv(csv_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+                yield df_prepared
+
+    if excel_path is not None:
+        # The xlsx sheet is written a chunk at a time, in step with the csv file
+        return write_xlsx(prepared_chunks(), excel_path)
+    return sum(len(df_prepared) for df_prepared in prepared_chunks())
@@ -8,6 +8,8 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 import pandas as pd
 
+from tutorialpkg.data_tools.dataset import ParalympicsDataset
+
 
 def draw_sample_plot(df):
     """Draw a sample plot using pandas.plot."""
@@ -75,8 +77,8 @@ def view_timeseries(df, date_column, value_column, filter_value=None):
 
     """
 
-    # Sort the DataFrame by the date column
-    df = df.sort_values(by=date_column)
+    # Select the columns used in the plot and sort the DataFrame by the date column
+    df = df[[date_column, value_column, 'type']].sort_values(by=date_column)
 
     if filter_value:
         df = df[df['column_name'] == filter_value]
@@ -107,7 +109,8 @@ if __name__ == '__main__':
     try:
         prepared_data_fp = Path(__file__).parent.parent.joinpath("data",
                                                                  "paralympics_events_prepared.csv")
-        prepared_df = pd.read_csv(prepared_data_fp)
+        # The dataset reads each column from the file the first time it is used
+        prepared_df = ParalympicsDataset(prepared_data_fp)
 
         # Activity 2: Draw histograms of the DataFrame using the prepared data
         # view_distribution(prepared_df)
@@ -4,6 +4,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from tutorialpkg.data_tools.instrument import instrumented
+
 
 # This is the same function as for the student database.
 def create_not_normalised_db(df, db_path, table_name):
@@ -121,6 +123,7 @@ def create_paralympics_db_structure(db_path):
             connection.close()
 
 
+@instrumented()
 def add_country_data(df, db_path):
     """
     Add the country data to the normalised paralympics database.
@@ -169,6 +172,7 @@ def add_country_data(df, db_path):
             connection.close()  # Close the connection.
 
 
+@instrumented()
 def add_event_data(df, db_path):
     """
     Add event data to the normalised paralympics database.
@@ -229,6 +233,7 @@ def add_event_data(df, db_path):
             connection.close()  # Close the connection.
 
 
+@instrumented()
 def add_host_data(df_events, db_path):
     """
     Add data to the normalised paralympics database.
@@ -294,6 +299,7 @@ def add_host_data(df_events, db_path):
             connection.close()  # Close the connection.
 
 
+@instrumented()
 def add_host_event_data(df, db_path):
     """
     Add host_event data to the normalised paralympics database.
@@ -10,6 +10,8 @@ I have done this to provide functions to test in next week's tutorial.
 import sqlite3
 from pathlib import Path
 
+from tutorialpkg.data_tools.instrument import instrumented
+
 
 def get_db_con(db_path):
     """Returns a connection and cursor to the chinook database."""
@@ -39,30 +41,35 @@ def execute_select_query(cursor, sql):
         print(f"An error occurred: {e}")
 
 
+@instrumented()
 def select_sorted_disability(cursor, column, table_name, sort_order):
     """1. Query to find the disability categories sorted alphabetically."""
     sql = f"SELECT {column} FROM {table_name} ORDER BY {column} {sort_order};"
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_unique(cursor, column, table_name):
     """ 2. Query to find the unique values in a column of a table."""
     sql = f"SELECT DISTINCT {column} FROM {table_name};"
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_event_date_range(cursor, start, end):
     """3. Find the start and end dates of events that in years between 1960 and 1969."""
     sql = f"SELECT start, end FROM Event WHERE year BETWEEN {start} AND {end};"
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_limit(cursor, table, column, limit):
     """4. Find 5 country codes from the 'Host' table."""
     sql = f"SELECT {column} FROM {table} LIMIT {limit};"
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_groupby(cursor, table, group_column, count_column, id=None):
     """5. Find the event_id and number of teams in the MedalResult table for each Event.
     6. Find the event_id and number of teams in the MedalResult table for event with event_id 27.
@@ -77,6 +84,7 @@ def select_groupby(cursor, table, group_column, count_column, id=None):
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_join_groupby(cursor):
     """7. the event name and number of teams in the MedalResult table for event with event_id 27."""
     sql = (
@@ -91,6 +99,7 @@ def select_join_groupby(cursor):
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_event_participants_winter(cursor):
     """8. Find the year, host name, number of male participants and number of female participants in all winter games."""
     sql = (
@@ -104,6 +113,7 @@ def select_event_participants_winter(cursor):
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_faroe_results(cursor):
     """9. Find the year, event name, event type and rank where the Faroe Islands appear in the MedalResults."""
     sql = ('SELECT Country.name, Event.year, Event.type, Host.host, MedalResult.rank '
@@ -116,6 +126,7 @@ def select_faroe_results(cursor):
     return execute_select_query(cursor, sql)
 
 
+@instrumented()
 def select_intellectual_ability_events(cursor):
     """
     10. Find the events that included the disability category 'Intellectual Disability' and sort alphabetically.
@@ -1,9 +1,14 @@
 """ Version of the paralympics database for use in week 8 (queries) and 9 (unit testing)"""
 import sqlite3
-from pathlib import Path
 
 import pandas as pd
 
+from tutorialpkg.data_tools.cache import read_workbook_cached
+from tutorialpkg.data_tools.dates import format_dates
+from tutorialpkg.data_tools.instrument import instrumented
+from tutorialpkg.data_tools.npc import NpcLookup
+from tutorialpkg.data_tools.resources import DB_DATA_PACKAGE, output_path, resource_path
+
 
 def create_paralympics_db_structure(cursor, connection):
     """Create the paralympics database structure."""
@@ -156,14 +161,13 @@ def create_paralympics_db_structure(cursor, connection):
             connection.rollback()
 
 
+@instrumented()
 def add_country_data(df, cursor, connection):
     """Add the country data to the paralympics database."""
     # Insert all values into the country table
     try:
-        for index, row in df.iterrows():
-            # The row is pandas series, we want the series as a list of values
-            row_values = row.tolist()
-            cursor.execute('INSERT INTO Country VALUES (?,?,?,?,?,?)', row_values)
+        # Pass all the rows as tuples in one call rather than creating a pandas series for each row
+        cursor.executemany('INSERT INTO Country VALUES (?,?,?,?,?,?)', df.itertuples(index=False, name=None))
 
         connection.commit()
 
@@ -173,12 +177,14 @@ def add_country_data(df, cursor, connection):
             connection.rollback()  # Rollback the changes on error
 
 
+@instrumented()
 def add_event_data(df, cursor, connection):
     """Add event and participant data to the paralympics database."""
     try:
-        # Convert the dates to strings
-        df['start'] = df['start'].dt.strftime('%d/%m/%Y')
-        df['end'] = df['end'].dt.strftime('%d/%m/%Y')
+        # Convert the dates to strings, formatting each different date once
+        # The database stores dd/mm/YYYY text. format_dates(df['start']) would give ISO text for SQLite date functions
+        df['start'] = format_dates(df['start'], '%d/%m/%Y')
+        df['end'] = format_dates(df['end'], '%d/%m/%Y')
 
         # Insert the values into the event table
         for index, row in df.iterrows():
@@ -214,8 +220,14 @@ def add_event_data(df, cursor, connection):
             connection.rollback()
 
 
-def add_host_data(df_events, cursor, connection):
-    """Add data to the normalised paralympics database."""
+@instrumented()
+def add_host_data(df_events, cursor, connection, npc_lookup=None):
+    """Add data to the normalised paralympics database.
+
+    If npc_lookup (NpcLookup) is given the country codes are found from its index, otherwise the Country table is
+    queried for each host. Hosts whose country has no NPC code are not added, as the code cannot be null, and their
+    countries are printed.
+    """
 
     try:
         # Extract unique host and country pairs
@@ -232,16 +244,27 @@ def add_host_data(df_events, cursor, connection):
         # Remove duplicate hosts from the dataframe
         host_country_df = host_country_df.drop_duplicates(subset=['host', 'country'])
 
+        # Number of hosts for each country that has no code
+        unmatched = {}
         # Iterate over the dataframe, add the host and country to the host table
         for index, row in host_country_df.iterrows():
             # Get the country code from the country table
             country_name = row['country']
-            select_sql = f'SELECT code from Country where name="{country_name}"'
-            result = cursor.execute(select_sql).fetchone()
-            country_code = result[0]
+            if npc_lookup:
+                country_code = npc_lookup.code(country_name)
+                if country_code is None:
+                    unmatched[country_name] = unmatched.get(country_name, 0) + 1
+                    continue
+            else:
+                select_sql = f'SELECT code from Country where name="{country_name}"'
+                result = cursor.execute(select_sql).fetchone()
+                country_code = result[0]
             # Insert into the host table
             host = row['host']
             cursor.execute('INSERT INTO Host (country_code, host) VALUES (?, ?)', (country_code, host))
+        if unmatched:
+            print(f"Host countries with no npc code: "
+                  f"{', '.join(f'{name} ({hosts} hosts)' for name, hosts in unmatched.items())}")
 
         # Commit the changes
         connection.commit()
@@ -252,6 +275,7 @@ def add_host_data(df_events, cursor, connection):
             connection.rollback()  # Rollback the changes on error
 
 
+@instrumented()
 def add_host_event_data(df, cursor, connection):
     """Add HostEvent data to the paralympics database."""
 
@@ -278,6 +302,7 @@ def add_host_event_data(df, cursor, connection):
             connection.rollback()
 
 
+@instrumented()
 def add_disabilities_data(df, cursor, connection):
     """Add Disability and DisabilityEvent data."""
 
@@ -318,6 +343,7 @@ def add_disabilities_data(df, cursor, connection):
             connection.rollback()
 
 
+@instrumented()
 def add_medal_result_data(df, cursor, connection):
     """Add MedalResult data to the paralympics database."""
 
@@ -340,6 +366,7 @@ def add_medal_result_data(df, cursor, connection):
             connection.rollback()
 
 
+@instrumented()
 def create_db(data_path, db_path, empty=False):
     """Creates a database in the specified directory.
 
@@ -360,14 +387,17 @@ def create_db(data_path, db_path, empty=False):
     create_paralympics_db_structure(cur, conn)
 
     if not empty:
-        # Read data and create pandas dataframes
-        events_df = pd.read_excel(data_path, sheet_name='events')
-        medals_df = pd.read_excel(data_path, sheet_name='medal_standings')
-        npc_df = pd.read_excel(data_path, sheet_name='npc_codes')
+        # Read data and create pandas dataframes. The workbook is opened once for all three sheets, and the parsed
+        # sheets are cached until the workbook changes.
+        sheets = read_workbook_cached(data_path, ['events', 'medal_standings', 'npc_codes'])
+        events_df = sheets['events']
+        medals_df = sheets['medal_standings']
+        npc_df = sheets['npc_codes']
 
         # add data to the tables
         add_country_data(npc_df, cur, conn)
-        add_host_data(events_df, cur, conn)
+        npc_lookup = NpcLookup.from_dataframe(npc_df, code_column='code', name_column='name')
+        add_host_data(events_df, cur, conn, npc_lookup)
         add_event_data(events_df, cur, conn)
         add_host_event_data(events_df, cur, conn)
         add_disabilities_data(events_df, cur, conn)
@@ -376,8 +406,13 @@ def create_db(data_path, db_path, empty=False):
     return cur, conn
 
 
-def create_paralympics_query_db():
-    """Create the paralympics query database."""
-    db_path = Path(__file__).parent.parent.joinpath('data_db_activity', 'para_queries.db')
-    data_path = Path(__file__).parent.parent.joinpath('data_db_activity', 'paralympics_all.xlsx')
+def create_paralympics_query_db(db_path=None):
+    """Create the paralympics query database.
+
+    Args:
+        db_path (Path): Optional. Database file to create. Defaults to para_queries.db in the current working directory,
+            as the package's data files may be temporary copies that are deleted when the program ends
+    """
+    db_path = db_path or output_path('para_queries.db')
+    data_path = resource_path('paralympics_all.xlsx', DB_DATA_PACKAGE)
     create_db(data_path, db_path)
@@ -1,9 +1,21 @@
 import os
+import shutil
+import tempfile
 from pathlib import Path
 
 import pytest
 
-from tutorialpkg.week8_queries.create_query_db import create_db
+# The caches are written to a temporary directory rather than the user's cache directory. This is set before the
+# package is imported, as the cache directories are found when the modules are imported.
+TEST_CACHE_DIR = tempfile.mkdtemp(prefix='paralympics-test-cache-')
+os.environ['PARALYMPICS_CACHE_DIR'] = TEST_CACHE_DIR
+
+from tutorialpkg.week8_queries.create_query_db import create_db  # noqa: E402
+
+
+def pytest_unconfigure(config):
+    """Delete the temporary cache directory when the tests have finished."""
+    shutil.rmtree(TEST_CACHE_DIR, ignore_errors=True)
 
 
 @pytest.fixture
@@ -0,0 +1,49 @@
+import sqlite3
+import subprocess
+import sys
+
+from tutorialpkg import cli
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    """
+    GIVEN the command line module
+    WHEN it is imported in a new python process with -X importtime
+    THEN pandas, numpy and matplotlib should not be in the list of imported modules
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import tutorialpkg.cli'],
+                            capture_output=True, text=True, check=True)
+    # Each import time line ends with '| <module name>', nested modules are indented
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines() if '|' in line}
+    for heavy in ['pandas', 'numpy', 'matplotlib']:
+        assert heavy not in imported
+
+
+def test_cli_query_prints_rows(tmp_path, capsys):
+    """
+    GIVEN a database with a table of two rows
+    WHEN the 'query' command is run with a SELECT query
+    THEN each row should be printed and the exit status should be 0
+    """
+    db_path = tmp_path.joinpath('test.db')
+    con = sqlite3.connect(db_path)
+    con.execute('CREATE TABLE suits (suit TEXT)')
+    con.executemany('INSERT INTO suits VALUES (?)', [('Clubs',), ('Hearts',)])
+    con.commit()
+    con.close()
+
+    status = cli.main(['query', 'SELECT suit FROM suits ORDER BY suit', '--db', str(db_path)])
+
+    assert status == 0
+    assert capsys.readouterr().out == "('Clubs',)\n('Hearts',)\n"
+
+
+def test_cli_query_missing_database(tmp_path):
+    """
+    GIVEN a database path that does not exist
+    WHEN the 'query' command is run
+    THEN the exit status should be 1 and no database file should be created
+    """
+    db_path = tmp_path.joinpath('missing.db')
+    assert cli.main(['query', 'SELECT 1', '--db', str(db_path)]) == 1
+    assert not db_path.exists()
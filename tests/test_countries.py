@@ -0,0 +1,22 @@
+import pandas as pd
+
+from tutorialpkg.data_tools.countries import load_country_aliases, resolve_country_names
+
+
+def test_resolve_country_names_matches_replace():
+    """
+    GIVEN a column of country names with aliases and missing values, as strings and as categorical
+    WHEN resolve_country_names() is called
+    THEN the names should be the same as using Series.replace() with the alias table
+    AND the dtype of the column should not change
+    """
+    countries = pd.Series(['UK', 'Japan', None, 'USA', 'Great Britain', 'UK'], index=[3, 5, 7, 9, 11, 13])
+    expected = countries.replace(load_country_aliases())
+
+    resolved = resolve_country_names(countries)
+    resolved_category = resolve_country_names(countries.astype('category'))
+
+    pd.testing.assert_series_equal(resolved, expected)
+    assert isinstance(resolved_category.dtype, pd.CategoricalDtype)
+    pd.testing.assert_series_equal(resolved_category.astype(expected.dtype), expected)
+    assert list(resolved_category.cat.categories).count('Great Britain') == 1
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from tutorialpkg.data_tools import cache
+
+
+def test_cached_read_returns_same_data(tmp_path):
+    """
+    GIVEN a csv file
+    WHEN read_csv_cached() is called twice
+    THEN both reads should give a dataframe equal to the one read with pd.read_csv
+    AND a feather file should be created in the cache directory
+    """
+    csv_path = tmp_path.joinpath('data.csv')
+    pd.DataFrame({'A': [1, 2, 3], 'B': ['x', 'y', 'z']}).to_csv(csv_path, index=False)
+    cache_dir = tmp_path.joinpath('cache')
+
+    first = cache.read_csv_cached(csv_path, cache_dir=cache_dir)
+    second = cache.read_csv_cached(csv_path, cache_dir=cache_dir)
+
+    expected = pd.read_csv(csv_path)
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+    assert len(list(cache_dir.glob('*.feather'))) == 1
+
+
+def test_cached_read_reparses_changed_source(tmp_path):
+    """
+    GIVEN a csv file that has been read into the cache
+    WHEN the contents of the csv file change and read_csv_cached() is called again
+    THEN the new contents should be returned
+    """
+    csv_path = tmp_path.joinpath('data.csv')
+    cache_dir = tmp_path.joinpath('cache')
+    pd.DataFrame({'A': [1, 2, 3]}).to_csv(csv_path, index=False)
+    cache.read_csv_cached(csv_path, cache_dir=cache_dir)
+
+    pd.DataFrame({'A': [4, 5, 6, 7]}).to_csv(csv_path, index=False)
+    df = cache.read_csv_cached(csv_path, cache_dir=cache_dir)
+
+    assert df['A'].tolist() == [4, 5, 6, 7]
+
+
+def test_parsed_and_cached_reads_are_identical(tmp_path):
+    """
+    GIVEN a csv file read with an index column, and a csv file read without a header
+    WHEN read_csv_cached() parses each file and then reads it from the cache
+    THEN the cached dataframe should have the same index, column names and dtypes as the parsed one
+    """
+    csv_path = tmp_path.joinpath('data.csv')
+    csv_path.write_text('year,host,start\n2012,London,2012-08-29\n2016,Rio,2016-09-07\n')
+    cache_dir = tmp_path.joinpath('cache')
+
+    for kwargs in [{'index_col': 'year', 'parse_dates': ['start']}, {'header': None}]:
+        parsed = cache.read_csv_cached(csv_path, cache_dir=cache_dir, **kwargs)
+        cached = cache.read_csv_cached(csv_path, cache_dir=cache_dir, **kwargs)
+        pd.testing.assert_frame_equal(parsed, pd.read_csv(csv_path, **kwargs))
+        pd.testing.assert_frame_equal(cached, parsed)
+
+
+def test_interrupted_write_leaves_no_cache_entry(tmp_path, monkeypatch):
+    """
+    GIVEN a csv file
+    WHEN writing its cache entry fails part way through
+    THEN there should be no cache entry or temporary file left, and the next read should parse the file
+    """
+    csv_path = tmp_path.joinpath('data.csv')
+    pd.DataFrame({'A': [1, 2, 3]}).to_csv(csv_path, index=False)
+    cache_dir = tmp_path.joinpath('cache')
+
+    def fail_write(df, path, **kwargs):
+        path.write_bytes(b'partial')
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as m:
+        m.setattr(cache.feather, 'write_feather', fail_write)
+        with pytest.raises(KeyboardInterrupt):
+            cache.read_csv_cached(csv_path, cache_dir=cache_dir)
+
+    assert list(cache_dir.iterdir()) == []
+    assert cache.read_csv_cached(csv_path, cache_dir=cache_dir)['A'].tolist() == [1, 2, 3]
@@ -45,3 +45,25 @@ def test_save_dataframe_incorrect_type_raises_error(db):
     path_to_save = Path(__file__).joinpath('incorrect_file.txt')
     with pytest.raises(ValueError):
         tutorial2_refactored.save_dataframe_to_file(df, str(path_to_save), file_type='txt')
+
+
+def test_prepare_event_data_streaming_matches_whole_file(tmp_path):
+    """
+    GIVEN the raw paralympics events csv file and the npc codes
+    WHEN prepare_event_data_streaming() is called with a chunk size smaller than the file
+    THEN the saved csv should be the same as preparing the whole dataframe at once
+    """
+    data_dir = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data')
+    raw_csv = data_dir.joinpath('paralympics_events_raw.csv')
+    df_npc = pd.read_csv(data_dir.joinpath('npc_codes.csv'), usecols=['Code', 'Name'], encoding='utf-8',
+                         encoding_errors='ignore')
+    output_csv = tmp_path.joinpath('prepared.csv')
+
+    rows = tutorial2_refactored.prepare_event_data_streaming(raw_csv, output_csv, df_npc, chunksize=10)
+
+    df_raw = pd.read_csv(raw_csv).drop(index=[0, 17, 31]).reset_index(drop=True)
+    expected = tutorial2_refactored.prepare_event_chunk(df_raw, df_npc)
+    expected_csv = tmp_path.joinpath('expected.csv')
+    expected.to_csv(expected_csv, index=False)
+    assert rows == len(expected)
+    assert output_csv.read_text() == expected_csv.read_text()
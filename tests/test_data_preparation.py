@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pandas as pd
+
+import data_preparation
+
+DATA_DIR = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data')
+
+
+def _read_npc():
+    return pd.read_csv(DATA_DIR.joinpath('npc_codes.csv'), usecols=['Code', 'Name'], encoding='utf-8',
+                       encoding_errors='ignore')
+
+
+def test_prepare_data_incremental_appends_row_with_same_contents(tmp_path):
+    """
+    GIVEN the raw events prepared incrementally to a csv file
+    WHEN a row with the same contents as an earlier row is added to the end of the raw data and it is prepared again
+    THEN the row should be reported as added and appended to the prepared csv
+    AND the next run should find every row unchanged
+    """
+    raw = pd.read_csv(DATA_DIR.joinpath('paralympics_events_raw.csv'))
+    npc = _read_npc()
+    output_csv = tmp_path.joinpath('prepared.csv')
+    data_preparation.prepare_data_incremental(raw, npc, output_csv)
+    rows = len(pd.read_csv(output_csv))
+
+    raw_appended = pd.concat([raw, raw.iloc[[5]]], ignore_index=True)
+    changes = data_preparation.prepare_data_incremental(raw_appended, npc, output_csv)
+    prepared = pd.read_csv(output_csv)
+
+    assert changes['added'] == [len(raw)]
+    assert len(prepared) == rows + 1
+    assert prepared.iloc[-1].equals(prepared.iloc[4])    # raw row 0 is dropped, so raw row 5 is prepared row 4
+    changes = data_preparation.prepare_data_incremental(raw_appended, npc, output_csv)
+    assert not changes['added'] and not changes['changed'] and len(changes['unchanged']) == rows + 1
+
+
+def test_prepare_batch_matches_preparing_the_whole_file(tmp_path):
+    """
+    GIVEN the raw events csv split into several files
+    WHEN prepare_batch() prepares the files with 2 worker processes
+    THEN the joined data should be the same as prepare_chunk() on the whole file
+    AND there should be a timing for each file
+    """
+    raw = pd.read_csv(DATA_DIR.joinpath('paralympics_events_raw.csv')).drop(index=[0, 17, 31])
+    source = tmp_path.joinpath('events')
+    source.mkdir()
+    for part, start in enumerate(range(0, len(raw), 10)):
+        raw.iloc[start:start + 10].to_csv(source.joinpath(f'events_{part}.csv'), index=False)
+
+    df_prepared, timings = data_preparation.prepare_batch(source, workers=2)
+
+    expected = data_preparation.prepare_chunk(raw, _read_npc(), drop_rows=()).reset_index(drop=True)
+    pd.testing.assert_frame_equal(df_prepared, expected)
+    assert sorted(path.name for path in timings) == sorted(path.name for path in source.iterdir())
+    assert sum(timing['rows'] for timing in timings.values()) == len(expected)
+
+
+def test_prepare_batch_uses_the_npc_csv_given(tmp_path):
+    """
+    GIVEN the raw events csv and a copy of npc_codes.csv in which Great Britain has the code ZZZ
+    WHEN prepare_batch() prepares the events with the copy as the npc_csv
+    THEN the events in Great Britain should have the code ZZZ, from the copy rather than the default file
+    AND preparing them again with the default npc_csv should give the code GBR
+    """
+    npc_csv = tmp_path.joinpath('npc_codes.csv')
+    npc_bytes = DATA_DIR.joinpath('npc_codes.csv').read_bytes()
+    npc_csv.write_bytes(npc_bytes.replace(b'GBR,Great Britain', b'ZZZ,Great Britain'))
+    source = tmp_path.joinpath('events.csv')
+    source.write_bytes(DATA_DIR.joinpath('paralympics_events_raw.csv').read_bytes())
+
+    df_prepared, _ = data_preparation.prepare_batch(source, npc_csv=npc_csv, workers=1, drop_rows=[0, 17, 31])
+
+    codes = df_prepared.loc[df_prepared['country'] == 'Great Britain', 'Code']
+    assert len(codes) > 0 and (codes == 'ZZZ').all()
+    assert 'GBR' not in df_prepared['Code'].tolist()
+    df_default, _ = data_preparation.prepare_batch(source, workers=1, drop_rows=[0, 17, 31])
+    assert (df_default.loc[codes.index, 'Code'] == 'GBR').all()
+
+
+def test_prepare_data_result_can_be_changed(tmp_path, monkeypatch):
+    """
+    GIVEN the raw events prepared with prepare_data(), whose pipeline keeps the results in memory
+    WHEN a column is added to the returned dataframe and a value changed, and prepare_data() is called again
+    THEN the second result should not have the change, and should not be the same object
+    """
+    monkeypatch.setattr(data_preparation, 'PREPARED_CSV', tmp_path.joinpath('prepared.csv'))
+    data_preparation.create_prepare_pipeline.cache_clear()
+    raw = pd.read_csv(DATA_DIR.joinpath('paralympics_events_raw.csv'))
+    npc = _read_npc()
+    try:
+        first = data_preparation.prepare_data(raw, npc)
+        year = first['year'].iloc[0]
+        first['scratch'] = 1
+        first.loc[first.index[0], 'year'] = 1066
+
+        second = data_preparation.prepare_data(raw, npc)
+    finally:
+        data_preparation.create_prepare_pipeline.cache_clear()
+
+    assert second is not first
+    assert 'scratch' not in second.columns
+    assert second['year'].iloc[0] == year
+
+
+def test_prepare_data_index_starts_at_zero(tmp_path, monkeypatch):
+    """
+    GIVEN the raw events, of which rows 0, 17 and 31 are dropped
+    WHEN they are prepared with prepare_data()
+    THEN the index should be 0 to n-1, without the raw row numbers
+    """
+    monkeypatch.setattr(data_preparation, 'PREPARED_CSV', tmp_path.joinpath('prepared.csv'))
+    data_preparation.create_prepare_pipeline.cache_clear()
+    raw = pd.read_csv(DATA_DIR.joinpath('paralympics_events_raw.csv'))
+    try:
+        df_prepared = data_preparation.prepare_data(raw, _read_npc())
+    finally:
+        data_preparation.create_prepare_pipeline.cache_clear()
+
+    assert df_prepared.index.equals(pd.RangeIndex(len(raw) - 3))
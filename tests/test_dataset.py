@@ -0,0 +1,34 @@
+import pandas as pd
+
+from tutorialpkg.data_tools.dataset import PREPARED_CSV, ParalympicsDataset
+
+
+def test_dataset_loads_columns_when_used():
+    """
+    GIVEN a ParalympicsDataset for the prepared data
+    WHEN two columns are selected
+    THEN only those columns should be loaded
+    AND their values should be the same as reading the whole csv file
+    """
+    ds = ParalympicsDataset(PREPARED_CSV)
+    assert ds.loaded_columns == []
+
+    df = ds[['year', 'participants']]
+
+    assert sorted(ds.loaded_columns) == ['participants', 'year']
+    pd.testing.assert_frame_equal(df, pd.read_csv(PREPARED_CSV)[['year', 'participants']])
+
+
+def test_dataset_filtered_view():
+    """
+    GIVEN a ParalympicsDataset for the prepared data
+    WHEN a view of the winter events is created
+    THEN the view should have the same rows as filtering the DataFrame
+    """
+    ds = ParalympicsDataset(PREPARED_CSV)
+    winter = ds[ds['type'] == 'winter']
+
+    df = pd.read_csv(PREPARED_CSV)
+    expected = df[df['type'] == 'winter']
+    assert len(winter) == len(expected)
+    assert winter['host'].tolist() == expected['host'].tolist()
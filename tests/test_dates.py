@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from tutorialpkg.data_tools.dates import MISSING_DAY, DateCodec, format_dates
+
+
+def test_date_codec_matches_to_datetime():
+    """
+    GIVEN a series of dd/mm/YYYY date strings with repeated dates and a missing value
+    WHEN the dates are parsed with a DateCodec
+    THEN the result should equal pd.to_datetime with the same format
+    AND each different date string should be parsed once, into the memo table
+    AND the day numbers should be int32 with MISSING_DAY for the missing value
+    """
+    text = pd.Series(['18/09/1960', None, '08/11/1964', '18/09/1960'], index=[3, 4, 5, 6], name='start')
+    codec = DateCodec('%d/%m/%Y')
+
+    pd.testing.assert_series_equal(codec.to_datetime(text), pd.to_datetime(text, format='%d/%m/%Y'))
+    assert len(codec) == 2
+    days = codec.day_numbers(text)
+    assert days.dtype == np.int32
+    assert days[1] == MISSING_DAY
+
+
+def test_format_dates_matches_strftime():
+    """
+    GIVEN a series of dates with a missing value
+    WHEN format_dates() is called with the ISO format and with dd/mm/YYYY
+    THEN the text should be the same as .dt.strftime(), with None for the missing date
+    """
+    dates = pd.Series(pd.to_datetime(['1960-09-18', None, '1964-11-08']))
+    for date_format in ['%Y-%m-%d', '%d/%m/%Y']:
+        expected = dates.dt.strftime(date_format).astype(object).where(dates.notna(), None)
+        assert format_dates(dates, date_format).tolist() == expected.tolist()
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from tutorialpkg.data_tools.dtypes import optimise_dtypes
+
+
+def test_optimise_dtypes_keeps_values():
+    """
+    GIVEN a dataframe with int64 counts, a nullable integer column, repeated and unique text and a float column
+    WHEN optimise_dtypes() is called
+    THEN the integers should have the smallest type that holds them, keeping missing values
+    AND only the repeated text should become categorical, and the float column should not change
+    AND the values should be the same, with the bytes saved reported for each column
+    """
+    df = pd.DataFrame({
+        'year': [1960, 2024] * 50,
+        'participants': pd.array([None, 70_000] * 50, dtype='Int64'),
+        'type': ['summer', 'winter'] * 50,
+        'host': [f'city {i}' for i in range(100)],
+        'ratio': [0.5, 1.0] * 50,
+    })
+
+    optimised, savings = optimise_dtypes(df)
+
+    assert optimised.dtypes.astype(str).to_dict() == {'year': 'int16', 'participants': 'Int32', 'type': 'category',
+                                                      'host': df['host'].dtype.name, 'ratio': 'float64'}
+    pd.testing.assert_frame_equal(optimised, df, check_dtype=False, check_categorical=False)
+    assert savings.loc['year', 'bytes_saved'] == 600
+    assert savings.loc['ratio', 'bytes_saved'] == 0
+
+
+def test_optimise_dtypes_does_not_widen_small_integers():
+    """
+    GIVEN a dataframe with uint8, uint16, int8 and nullable 'UInt32' columns
+    WHEN optimise_dtypes() is called
+    THEN the unsigned columns should stay unsigned, and a column should not get a larger type than it has
+    AND no column should be reported with negative bytes saved
+    """
+    df = pd.DataFrame({
+        'events': pd.Series([8, 200] * 50, dtype='uint8'),
+        'participants': pd.Series([209, 4393] * 50, dtype='uint16'),
+        'rank': pd.Series([1, -1] * 50, dtype='int8'),
+        'countries': pd.array([None, 160] * 50, dtype='UInt32'),
+    })
+
+    optimised, savings = optimise_dtypes(df)
+
+    assert optimised.dtypes.astype(str).to_dict() == {'events': 'uint8', 'participants': 'uint16', 'rank': 'int8',
+                                                      'countries': 'UInt8'}
+    pd.testing.assert_frame_equal(optimised, df, check_dtype=False)
+    assert (savings['bytes_saved'] >= 0).all()
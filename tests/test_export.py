@@ -0,0 +1,73 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from tutorialpkg.data_tools.export import EXPORT_FORMATS, export_dataframe, export_path, write_xlsx
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'type': ['Summer', 'Winter', None],
+        'country': ['Great Britain', 'A & <B>', ' Japan '],
+        'start': pd.to_datetime(['2012-08-29', '2014-03-07', None]),
+        'participants': [4302, 547, 0],
+        'ratio': [0.5, None, 1.25],
+        'summer': [True, False, True],
+    })
+
+
+def test_write_xlsx_reads_back_like_to_excel(df, tmp_path):
+    """
+    GIVEN a dataframe with text, dates, integers, floats, booleans and missing values
+    WHEN it is saved with write_xlsx() in blocks of rows and with DataFrame.to_excel()
+    THEN reading both files with pd.read_excel() should give the same dataframe
+    """
+    df.to_excel(tmp_path.joinpath('openpyxl.xlsx'), index=False)
+    rows = write_xlsx(df, tmp_path.joinpath('streamed.xlsx'), chunksize=2)
+
+    assert rows == 3
+    pd.testing.assert_frame_equal(pd.read_excel(tmp_path.joinpath('streamed.xlsx')),
+                                  pd.read_excel(tmp_path.joinpath('openpyxl.xlsx')))
+
+
+def test_export_dataframe_all_formats(df, tmp_path):
+    """
+    GIVEN a dataframe
+    WHEN export_dataframe() is called with every format
+    THEN each file should read back to the same data
+    AND the time and size of each format should be returned
+    """
+    results = export_dataframe(df, tmp_path.joinpath('prepared.csv'), EXPORT_FORMATS)
+
+    expected = pd.read_csv(tmp_path.joinpath('prepared.csv'))
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path.joinpath('prepared.csv.gz')), expected)
+    with pa.CompressedInputStream(pa.OSFile(str(tmp_path.joinpath('prepared.csv.zst'))), 'zstd') as stream:
+        pd.testing.assert_frame_equal(pd.read_csv(stream), expected)
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path.joinpath('prepared.parquet')), df)
+    pd.testing.assert_frame_equal(pd.read_feather(tmp_path.joinpath('prepared.feather')), df)
+    assert set(results) == set(EXPORT_FORMATS)
+    assert all(result['bytes'] > 0 and result['seconds'] >= 0 for result in results.values())
+
+
+def test_export_dataframe_unknown_format_raises_error(df, tmp_path):
+    """
+    GIVEN a dataframe
+    WHEN export_dataframe() is called with a format that is not supported
+    THEN a ValueError should be raised before any file is written
+    """
+    with pytest.raises(ValueError):
+        export_dataframe(df, tmp_path.joinpath('prepared'), ('csv', 'txt'))
+    assert not tmp_path.joinpath('prepared.csv').exists()
+
+
+def test_export_path_keeps_dots_in_the_name():
+    """
+    GIVEN file names with dots that are not export suffixes, and names ending in an export suffix
+    WHEN export_path() gives the path for another format
+    THEN only the export suffix should be replaced
+    """
+    assert export_path('out/events.v2.csv', 'parquet').as_posix() == 'out/events.v2.parquet'
+    assert export_path('events.v2.csv.gz', 'xlsx').name == 'events.v2.xlsx'
+    assert export_path('events.v2', 'csv.zst').name == 'events.v2.csv.zst'
+    assert export_path('prepared.csv', 'csv.gz').name == 'prepared.csv.gz'
@@ -0,0 +1,52 @@
+import json
+import tracemalloc
+
+import pandas as pd
+
+from tutorialpkg.data_tools import instrument
+from tutorialpkg.data_tools.instrument import instrumented
+
+
+@instrumented('inner')
+def _inner(df):
+    # Allocate about 8 MB, which should be in the peak memory of both stages
+    values = list(range(200_000))
+    del values
+    return df.head(3)
+
+
+@instrumented('outer')
+def _outer(df):
+    return _inner(df)
+
+
+def test_instrumented_stages_are_recorded_only_when_enabled(tmp_path):
+    """
+    GIVEN an instrumented stage that calls another instrumented stage with a dataframe
+    WHEN it is called with instrumentation off, then on with cProfile
+    THEN nothing should be written while it is off
+    AND each stage should have a JSON line with its parent, times, peak memory and rows in and out
+    AND the collapsed-stack file should have the stack of each stage, and the outer stage a cProfile file
+    AND tracemalloc should be stopped again when instrumentation is disabled
+    """
+    df = pd.DataFrame({'year': range(10)})
+
+    _outer(df)
+    assert not list(tmp_path.iterdir())
+
+    instrument.enable(tmp_path, cprofile=True)
+    try:
+        _outer(df)
+    finally:
+        instrument.disable()
+
+    records = [json.loads(line) for line in tmp_path.joinpath('stages.jsonl').read_text().splitlines()]
+    collapsed = [line.rsplit(' ', 1)[0] for line in tmp_path.joinpath('stages.collapsed').read_text().splitlines()]
+    assert [(r['stage'], r['parent'], r['rows_in'], r['rows_out']) for r in records] == [
+        ('inner', 'outer', 10, 3), ('outer', None, 10, 3)]
+    assert all(r['wall_seconds'] > 0 and r['cpu_seconds'] >= 0 for r in records)
+    assert all(r['peak_memory_bytes'] > 5_000_000 for r in records)
+    assert collapsed == ['outer;inner', 'outer']
+    assert records[0]['profile'] is None
+    assert tmp_path.joinpath(records[1]['profile']).is_file()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from tutorialpkg.data_tools.loading import load_concurrently
+
+
+def test_load_concurrently_reports_missing_file(tmp_path):
+    """
+    GIVEN one csv file that exists and one that does not
+    WHEN load_concurrently() is called with a loader for each file
+    THEN the existing file should be in the results
+    AND the missing file should be in the errors as a FileNotFoundError
+    """
+    csv_path = tmp_path.joinpath('data.csv')
+    pd.DataFrame({'A': [1, 2]}).to_csv(csv_path, index=False)
+    loaders = {
+        'found': lambda: pd.read_csv(csv_path),
+        'missing': lambda: pd.read_csv(tmp_path.joinpath('missing.csv')),
+    }
+
+    results, errors = load_concurrently(loaders)
+
+    assert results['found']['A'].tolist() == [1, 2]
+    assert 'missing' not in results
+    assert isinstance(errors['missing'], FileNotFoundError)
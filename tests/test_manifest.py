@@ -0,0 +1,34 @@
+import pandas as pd
+
+from tutorialpkg.data_tools import manifest
+
+
+def test_compare_finds_added_changed_and_removed_rows(tmp_path):
+    """
+    GIVEN a manifest saved for a dataframe
+    WHEN one row is changed, one row is removed and one row is added, and the hashes are compared with the manifest
+    THEN each row should be reported under 'added', 'changed', 'removed' or 'unchanged'
+    """
+    df = pd.DataFrame({'year': [1964, 1968, 1972], 'country': ['Japan', 'Israel', 'Germany']})
+    manifest_file = manifest.manifest_path(tmp_path.joinpath('prepared.csv'))
+    inputs = manifest.fingerprint(df.columns)
+    manifest.write_manifest(manifest_file, manifest.row_hashes(df), inputs)
+
+    df_new = pd.DataFrame({'year': [1964, 1968, 1976], 'country': ['Japan', 'Israel', 'Canada']}, index=[0, 1, 3])
+    df_new.loc[1, 'country'] = 'Tel Aviv'
+    changes = manifest.compare(manifest.read_manifest(manifest_file, inputs), manifest.row_hashes(df_new))
+
+    assert manifest_file.name == 'prepared.manifest.feather'
+    assert changes == {'added': [3], 'changed': [1], 'removed': [2], 'unchanged': [0]}
+
+
+def test_read_manifest_ignores_different_inputs(tmp_path):
+    """
+    GIVEN a manifest saved with the fingerprint of one set of inputs
+    WHEN it is read with a different fingerprint
+    THEN None should be returned so that every row is prepared again
+    """
+    df = pd.DataFrame({'year': [1964, 1968]})
+    manifest_file = tmp_path.joinpath('prepared.manifest.feather')
+    manifest.write_manifest(manifest_file, manifest.row_hashes(df), manifest.fingerprint(['GBR']))
+    assert manifest.read_manifest(manifest_file, manifest.fingerprint(['GBR', 'JPN'])) is None
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from tutorialpkg.data_tools.metrics import METRICS, DerivedMetrics, clear_memo
+
+
+def events():
+    return pd.DataFrame({
+        'type': ['summer', 'winter', 'summer', 'winter'],
+        'year': [2016, 2018, 2020, 2022],
+        'host': ['Rio', 'PyeongChang', 'Tokyo', 'Beijing'],
+        'countries': [160, 49, 162, 0],
+        'participants_f': [1670, 133, 1846, 136],
+        'participants': [4327, 563, 4393, 558],
+    }, index=[10, 11, 12, 13])
+
+
+def test_metrics_are_computed_once_per_version(tmp_path):
+    """
+    GIVEN a dataframe of events and medal standings
+    WHEN the metrics are asked for twice, the second time by a new DerivedMetrics of the same data
+    THEN the values should be correct, with the index of the data and missing values where they cannot be found
+    AND the second DerivedMetrics should use the same memoised arrays, also after clear_memo() from the saved file
+    """
+    medals = pd.DataFrame({'Year': [2018, 2018, 2020], 'Location': ['Pyeongchang', 'Pyeongchang', 'Tokyo'],
+                           'Total': [200, 41, 1668]})
+    metrics = DerivedMetrics(events(), medals=medals, cache_dir=tmp_path)
+
+    df = metrics.to_frame()
+
+    assert df.index.tolist() == [10, 11, 12, 13]
+    np.testing.assert_allclose(df['female_share'], [1670 / 4327, 133 / 563, 1846 / 4393, 136 / 558])
+    assert np.isnan(df.loc[13, 'participants_per_country'])
+    np.testing.assert_allclose(df['medals_per_participant'], [np.nan, 241 / 563, 1668 / 4393, np.nan])
+    np.testing.assert_allclose(df['growth'], [np.nan, np.nan, 4393 / 4327 - 1, 558 / 563 - 1])
+
+    again = DerivedMetrics(events(), medals=medals, cache_dir=tmp_path)
+    assert again._values('growth') is metrics._values('growth')
+    clear_memo()
+    pd.testing.assert_frame_equal(DerivedMetrics(events(), medals=medals, cache_dir=tmp_path).to_frame(), df)
+
+
+def test_metrics_saved_by_earlier_runs_are_kept(tmp_path):
+    """
+    GIVEN the female_share metric computed and saved for a dataframe of events
+    WHEN the memo is cleared, as in a new program, and the growth metric is computed
+    THEN the saved file should have both metrics, so female_share is loaded rather than computed again
+    """
+    DerivedMetrics(events(), cache_dir=tmp_path)['female_share']
+    clear_memo()
+    metrics = DerivedMetrics(events(), cache_dir=tmp_path)
+
+    metrics['growth']
+
+    saved = pd.read_feather(metrics._cache_file())
+    assert sorted(saved.columns) == ['female_share', 'growth']
+    np.testing.assert_allclose(saved['female_share'], [1670 / 4327, 133 / 563, 1846 / 4393, 136 / 558])
+
+
+def test_metrics_version_changes_with_medals_and_metric_code(tmp_path):
+    """
+    GIVEN the metrics of a dataframe of events
+    WHEN the medal standings are different, or a registered metric function is replaced by one with different code
+    THEN the version should be different, so the saved metrics are not used
+    """
+    medals = pd.DataFrame({'Year': [2020], 'Location': ['Tokyo'], 'Total': [1668]})
+    version = DerivedMetrics(events(), medals=medals, cache_dir=tmp_path).version
+    assert DerivedMetrics(events(), medals=medals.assign(Total=[1669]), cache_dir=tmp_path).version != version
+
+    female_share = METRICS['female_share']
+    METRICS['female_share'] = female_share._replace(func=lambda metrics: metrics.column('participants_f') * 0)
+    try:
+        assert DerivedMetrics(events(), medals=medals, cache_dir=tmp_path).version != version
+    finally:
+        METRICS['female_share'] = female_share
+    assert DerivedMetrics(events(), medals=medals, cache_dir=tmp_path).version == version
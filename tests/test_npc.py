@@ -0,0 +1,113 @@
+import sqlite3
+
+import pandas as pd
+
+from tutorialpkg.data_tools.npc import (NpcLookup, build_npc_table, get_npc_lookup, load_npc_codes,
+                                        load_npc_join_index, load_npc_table)
+from tutorialpkg.week8_queries.create_query_db import add_host_data, create_paralympics_db_structure
+
+
+def test_npc_table_decodes_names(tmp_path):
+    """
+    GIVEN the npc_codes.csv file, which has some names that are not utf-8
+    WHEN the normalised table is built and loaded
+    THEN the names should be decoded in full rather than having characters removed
+    """
+    table_path = build_npc_table(table_path=tmp_path.joinpath('npc.feather'))
+    table = load_npc_table(table_path=table_path)
+    lookup = NpcLookup.from_table(table)
+    assert lookup.name('CIV') == "Côte d'Ivoire"
+    assert lookup.name('TUR') == 'Türkiye'
+    assert lookup.code('Great Britain') == 'GBR'
+
+
+def test_codes_for_names():
+    """
+    GIVEN an NpcLookup
+    WHEN codes_for() is called with a series of names, one of which is not an NPC
+    THEN the codes should be returned in the same order, with a missing value for the unknown name
+    """
+    lookup = NpcLookup(['GBR', 'JPN'], ['Great Britain', 'Japan'])
+    codes = lookup.codes_for(pd.Series(['Japan', 'Atlantis', 'Great Britain', 'Japan']))
+    assert codes.tolist()[0] == 'JPN'
+    assert pd.isna(codes[1])
+    assert codes.tolist()[2:] == ['GBR', 'JPN']
+
+
+def test_join_index_saved_with_table(tmp_path):
+    """
+    GIVEN the npc_codes.csv file
+    WHEN the table is built and the join index is loaded from the file saved with it
+    THEN joining a categorical column of names should give the same codes as looking up each name
+    AND the names with no NPC should be counted, without counting missing names
+    """
+    table_path = build_npc_table(table_path=tmp_path.joinpath('npc.feather'))
+    lookup = NpcLookup.from_table(load_npc_table(table_path=table_path), load_npc_join_index(table_path=table_path))
+    names = pd.Series(['Japan', 'UK', None, 'Great Britain', 'UK', "Côte d'Ivoire"], dtype='category')
+
+    codes, unmatched = lookup.join(names)
+
+    assert tmp_path.joinpath('npc.index.feather').is_file()
+    assert codes[0] == 'JPN'
+    assert codes[[1, 2, 4]].isna().all()
+    assert codes[[3, 5]].tolist() == ['GBR', 'CIV']
+    assert unmatched == {'UK': 2}
+
+
+def test_npc_codes_from_different_csv_files(tmp_path):
+    """
+    GIVEN two csv files of NPC codes with different contents
+    WHEN the codes are loaded from each file
+    THEN each should give its own codes rather than the table built from the other file
+    AND changing a file's contents should build its table again
+    """
+    first = tmp_path.joinpath('first_npc.csv')
+    second = tmp_path.joinpath('second_npc.csv')
+    first.write_text('Code,Name\nGBR,Great Britain\nJPN,Japan\n', encoding='utf-8')
+    second.write_text('Code,Name\nZZZ,Atlantis\n', encoding='utf-8')
+
+    assert load_npc_codes(['Code', 'Name'], first)['Code'].tolist() == ['GBR', 'JPN']
+    assert load_npc_codes(['Code', 'Name'], second)['Code'].tolist() == ['ZZZ']
+    assert NpcLookup.from_table(load_npc_table(second), load_npc_join_index(second)).code('Atlantis') == 'ZZZ'
+
+    # Same size, so only the content hash shows the change
+    first.write_text('Code,Name\nGBX,Great Britain\nJPN,Japan\n', encoding='utf-8')
+    assert load_npc_codes(['Code'], first)['Code'].tolist() == ['GBX', 'JPN']
+
+
+def test_npc_lookup_for_each_csv_file(tmp_path):
+    """
+    GIVEN a csv file of NPC codes other than the default
+    WHEN get_npc_lookup() is called for it, before and after its contents change
+    THEN the lookup and its join index should have the file's codes each time, not the default or the earlier codes
+    """
+    csv_path = tmp_path.joinpath('npc.csv')
+    csv_path.write_text('Code,Name\nZZZ,Great Britain\n', encoding='utf-8')
+
+    lookup = get_npc_lookup(csv_path)
+    assert lookup.code('Great Britain') == 'ZZZ'
+    assert lookup.code('Japan') is None
+    assert get_npc_lookup(csv_path) is lookup
+
+    csv_path.write_text('Code,Name\nYYY,Great Britain\n', encoding='utf-8')
+    assert get_npc_lookup(csv_path).codes_for(pd.Series(['Great Britain'])).tolist() == ['YYY']
+    assert get_npc_lookup().code('Great Britain') == 'GBR'
+
+
+def test_add_host_data_reports_hosts_with_no_code(capsys):
+    """
+    GIVEN events hosted in a country with an NPC code and in a country without one
+    WHEN add_host_data() adds the hosts using an NpcLookup
+    THEN the host with a code should be added, and the country without a code printed rather than added
+    """
+    con = sqlite3.connect(':memory:')
+    cur = con.cursor()
+    create_paralympics_db_structure(cur, con)
+    events = pd.DataFrame({'host': ['London', 'Atlantis'], 'country': ['Great Britain', 'Lost Land']})
+    npc = NpcLookup(['GBR'], ['Great Britain'])
+
+    add_host_data(events, cur, con, npc)
+
+    assert cur.execute('SELECT country_code, host FROM Host').fetchall() == [('GBR', 'London')]
+    assert 'Host countries with no npc code: Lost Land (1 hosts)' in capsys.readouterr().out
+    con.close()
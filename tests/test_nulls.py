@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from tutorialpkg.data_tools.nulls import null_profile
+
+
+def test_null_profile_matches_pandas():
+    """
+    GIVEN a dataframe with missing values in some rows and columns
+    WHEN null_profile() is called
+    THEN the row mask, column counts, total, columns and rows should match the separate pandas calls
+    """
+    df = pd.DataFrame({'A': [1, np.nan, 3, 4], 'B': ['x', 'y', None, 'z'], 'C': [1, 2, 3, 4]}, index=[5, 6, 7, 8])
+
+    nulls = null_profile(df)
+
+    pd.testing.assert_series_equal(nulls.row_mask, df.isna().any(axis=1))
+    pd.testing.assert_series_equal(nulls.column_counts, df.isnull().sum())
+    pd.testing.assert_series_equal(nulls.column_mask, df.isnull().any(axis=0))
+    assert nulls.total == df.isnull().sum().sum() == 2
+    assert nulls.columns == ['A', 'B']
+    pd.testing.assert_frame_equal(nulls.rows, df[df.isna().any(axis=1)])
@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from tutorialpkg.data_tools.pipeline import Pipeline, code_fingerprint
+
+
+def add_column(df, name, value):
+    df[name] = value
+    return df
+
+
+def create_pipeline(cache_dir, value=1, version=None):
+    pipeline = Pipeline(cache_dir)
+    pipeline.add('first', add_column, ['raw'], {'name': 'a', 'value': 1}, version=version)
+    pipeline.add('second', add_column, ['first'], {'name': 'b', 'value': value})
+    pipeline.add('third', add_column, ['second'], {'name': 'c', 'value': 3})
+    return pipeline
+
+
+def test_pipeline_reruns_only_stages_after_a_change(tmp_path):
+    """
+    GIVEN a pipeline of three stages that has been run once with a disk cache
+    WHEN the config of the second stage is changed and the pipeline is run again
+    THEN the first stage should come from the cache, the second and third stages should run
+    AND the source dataframe should not be changed by the stages
+    """
+    raw = pd.DataFrame({'x': [1, 2]})
+    create_pipeline(tmp_path).run({'raw': raw})
+
+    pipeline = create_pipeline(tmp_path, value=20)
+    results = pipeline.run({'raw': raw}, targets=['third'])
+
+    assert {name: timing['status'] for name, timing in pipeline.timings.items()} == {
+        'first': 'disk', 'second': 'run', 'third': 'run'}
+    assert results['third']['b'].tolist() == [20, 20]
+    assert raw.columns.tolist() == ['x']
+
+
+def test_pipeline_reruns_stages_after_a_version_change(tmp_path):
+    """
+    GIVEN a pipeline of three stages that has been run once with a disk cache
+    WHEN the version of the first stage is changed, e.g. because a file it reads has changed, and it is run again
+    THEN every stage should run again
+    """
+    raw = pd.DataFrame({'x': [1, 2]})
+    create_pipeline(tmp_path, version='aliases-1').run({'raw': raw})
+
+    pipeline = create_pipeline(tmp_path, version='aliases-2')
+    pipeline.run({'raw': raw}, targets=['third'])
+
+    assert {name: timing['status'] for name, timing in pipeline.timings.items()} == {
+        'first': 'run', 'second': 'run', 'third': 'run'}
+
+
+def test_pipeline_unknown_input_raises_error():
+    """
+    GIVEN a pipeline with a stage that uses an input that is not a source or a stage
+    WHEN the pipeline is run
+    THEN a ValueError should be raised
+    """
+    pipeline = Pipeline().add('first', add_column, ['missing'], {'name': 'a', 'value': 1})
+    with pytest.raises(ValueError):
+        pipeline.run({'raw': pd.DataFrame({'x': [1]})})
+
+
+def test_pipeline_low_memory_returns_targets_and_memory_peaks():
+    """
+    GIVEN a pipeline of three stages
+    WHEN it is run with low_memory=True and trace_memory=True
+    THEN only the target result should be returned, each stage should run
+    AND the peak memory of each stage should be recorded
+    """
+    pipeline = create_pipeline(None)
+    results = pipeline.run({'raw': pd.DataFrame({'x': range(1000)})}, low_memory=True, trace_memory=True)
+
+    assert list(results) == ['third']
+    assert results['third'].columns.tolist() == ['x', 'a', 'b', 'c']
+    assert all(timing['status'] == 'run' and timing['peak_mb'] >= 0 for timing in pipeline.timings.values())
+
+
+def test_code_fingerprint_is_stable_for_nested_functions():
+    """
+    GIVEN a function with a nested function, and a copy of it made from the same source
+    WHEN code_fingerprint() is found for each
+    THEN the fingerprints should be equal, although the nested code objects are different objects
+    AND a function with different code should have a different fingerprint
+    """
+    source = 'def outer(x):\n    def inner(y):\n        return y + 1\n    return inner(x)\n'
+    first, second, changed = {}, {}, {}
+    exec(source, first)
+    exec(source, second)
+    exec(source.replace('y + 1', 'y + 2'), changed)
+
+    assert code_fingerprint(first['outer']) == code_fingerprint(second['outer'])
+    assert code_fingerprint(first['outer']) != code_fingerprint(changed['outer'])
@@ -0,0 +1,108 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tutorialpkg.data_tools.profile import profile_csv, profile_dataframe, profile_parallel
+from tutorialpkg.data_tools.resources import resource_path
+
+
+def test_profile_matches_pandas():
+    """
+    GIVEN the raw event data
+    WHEN it is profiled in one chunk
+    THEN the shape, head, tail, dtypes and missing values should be the same as from the pandas functions
+    AND describe() and info() should give the same results as DataFrame.describe() and DataFrame.info()
+    """
+    df = pd.read_csv(resource_path('paralympics_events_raw.csv'))
+    buf = io.StringIO()
+    df.info(buf=buf)
+
+    profile = profile_dataframe(df)
+
+    assert profile.shape == df.shape
+    pd.testing.assert_frame_equal(profile.head, df.head())
+    pd.testing.assert_frame_equal(profile.tail, df.tail())
+    assert profile.dtypes.equals(df.dtypes)
+    assert profile.null_counts.equals(df.isna().sum())
+    pd.testing.assert_frame_equal(profile.describe(), df.describe(), check_exact=True)
+    assert profile.info_text() == buf.getvalue()
+
+
+def test_profile_csv_in_chunks(tmp_path):
+    """
+    GIVEN a csv file with numbers, missing values, text and dates
+    WHEN it is profiled a few rows at a time, and in two parts that are merged
+    THEN the statistics should be the same as DataFrame.describe() of the whole file, to rounding
+    AND the quantiles should be missing once there are more than exact_rows rows
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'value': rng.normal(1e6, 3, 1000), 'count': rng.integers(0, 50, 1000),
+                       'date': pd.date_range('2000-01-01', periods=1000).astype(str)})
+    df.loc[::7, 'value'] = np.nan
+    csv_path = tmp_path.joinpath('values.csv')
+    df.to_csv(csv_path, index=False)
+    expected = pd.read_csv(csv_path, parse_dates=['date'])
+
+    profile = profile_csv(csv_path, chunksize=64, parse_dates=['date'])
+    merged = profile_dataframe(expected.iloc[:300]).merge(profile_dataframe(expected.iloc[300:]))
+    approximate = profile_csv(csv_path, chunksize=64, exact_rows=100)
+
+    for result in (profile.describe(), merged.describe()):
+        pd.testing.assert_frame_equal(result, expected.describe(), rtol=1e-12)
+    assert profile.shape == expected.shape
+    assert len(profile.null_rows) == expected['value'].isna().sum()
+    assert approximate.describe().loc['50%'].isna().all()
+    assert approximate.describe().loc['mean', 'count'] == pytest.approx(expected['count'].mean())
+
+
+def test_profile_csv_column_that_becomes_text(tmp_path):
+    """
+    GIVEN a csv file with a column of numbers that has text in a later chunk
+    WHEN it is profiled a few rows at a time
+    THEN describe() should leave the column out, the same as DataFrame.describe() of the whole file
+    """
+    csv_path = tmp_path.joinpath('values.csv')
+    csv_path.write_text('x,y\n1,1.5\n2,2.5\n3,3.5\nabc,4.5\n5,5.5\n')
+
+    profile = profile_csv(csv_path, chunksize=3)
+
+    pd.testing.assert_frame_equal(profile.describe(), pd.read_csv(csv_path).describe())
+    assert profile.null_counts.tolist() == [0, 0]
+
+
+def test_profile_time_zone_dates():
+    """
+    GIVEN dataframes with a time zone aware date column, alone and with numbers, text and dates without a time zone
+    WHEN they are profiled, in one chunk and two rows at a time
+    THEN describe() and info() should give the same results as DataFrame.describe() and DataFrame.info()
+    """
+    dates = pd.date_range('2000', periods=5, tz='UTC')
+    for df in [pd.DataFrame({'d': dates}), pd.DataFrame({'d': dates, 's': list('abcda')}),
+               pd.DataFrame({'d': dates, 'n': range(5), 'e': pd.date_range('2000', periods=5)})]:
+        buf = io.StringIO()
+        df.info(buf=buf)
+        for profile in (profile_dataframe(df), profile_dataframe(df, chunksize=2)):
+            pd.testing.assert_frame_equal(profile.describe(), df.describe())
+            assert profile.info_text() == buf.getvalue()
+
+
+def test_profile_parallel_matches_profile_dataframe():
+    """
+    GIVEN a dataframe with float, nullable integer, date and text columns
+    WHEN its columns are profiled in groups in a process pool, with the numeric columns in shared memory
+    THEN describe(), info(), the head and the rows with missing values should be the same as from profile_dataframe()
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'value': rng.normal(size=500), 'count': pd.array(rng.integers(0, 9, 500), dtype='Int64'),
+                       'date': pd.date_range('2000-01-01', periods=500), 'type': rng.choice(['summer', 'winter'], 500)})
+    df.loc[::9, 'count'] = pd.NA
+
+    expected = profile_dataframe(df)
+    profile = profile_parallel(df, workers=2, group_size=1)
+
+    pd.testing.assert_frame_equal(profile.describe(), expected.describe())
+    assert profile.info_text() == expected.info_text()
+    pd.testing.assert_frame_equal(profile.head, expected.head)
+    pd.testing.assert_frame_equal(profile.null_rows, expected.null_rows)
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from tutorialpkg.data_tools import profile
+from tutorialpkg.data_tools.reports import profile_report, render_text
+from tutorialpkg.data_tools.resources import resource_path
+
+
+def test_profile_report_is_cached_and_updated_by_column(tmp_path, monkeypatch):
+    """
+    GIVEN the raw event data and an empty report directory
+    WHEN profile_report() is called, called again, and called after one column is changed
+    THEN the first report should be new, and the second read from the saved report with the same text
+    AND after the change only the changed column should be profiled, with the same statistics as DataFrame.describe()
+    """
+    df = pd.read_csv(resource_path('paralympics_events_raw.csv'))
+
+    first, first_status = profile_report(df, cache_dir=tmp_path)
+    second, second_status = profile_report(df, cache_dir=tmp_path)
+
+    profiled = []
+    update = profile.ColumnProfile.update
+    monkeypatch.setattr(profile.ColumnProfile, 'update',
+                        lambda column, values: profiled.append(column.name) or update(column, values))
+    changed = df.assign(participants=df['participants'] + 1)
+    updated, updated_status = profile_report(changed, cache_dir=tmp_path)
+
+    assert (first_status, second_status, updated_status) == ('new', 'cached', 'updated')
+    assert render_text(second) == render_text(first)
+    assert profiled == ['participants']
+    pd.testing.assert_frame_equal(updated.describe(), changed.describe())
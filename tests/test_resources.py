@@ -0,0 +1,57 @@
+import pandas as pd
+
+from tutorialpkg.data_tools.resources import (DB_DATA_PACKAGE, connect_db, find_data_file, output_path,
+                                              read_csv_resource, resource_buffer, resource_path)
+
+
+def test_read_csv_resource_matches_read_csv():
+    """
+    GIVEN the paralympics_events_prepared.csv file in the package
+    WHEN it is read from the memory-mapped resource, with both the C and pyarrow parsers
+    THEN the data should be the same as reading the file with pd.read_csv
+    """
+    expected = pd.read_csv(resource_path('paralympics_events_prepared.csv'))
+    pd.testing.assert_frame_equal(read_csv_resource('paralympics_events_prepared.csv'), expected)
+    pyarrow_df = read_csv_resource('paralympics_events_prepared.csv', engine='pyarrow')
+    assert pyarrow_df.shape == expected.shape
+
+
+def test_resource_buffer_is_read_only():
+    """
+    GIVEN a data file in the package
+    WHEN resource_buffer() is called twice
+    THEN the same read-only buffer should be returned, with the contents of the file
+    """
+    buffer = resource_buffer('npc_codes.csv')
+    assert buffer is resource_buffer('npc_codes.csv')
+    assert buffer.readonly
+    assert bytes(buffer[:20]) == resource_path('npc_codes.csv').read_bytes()[:20]
+
+
+def test_connect_db_enables_mmap():
+    """
+    GIVEN the para_queries.db database in the package
+    WHEN a connection is made with connect_db()
+    THEN memory-mapped I/O should be enabled and the tables should be readable
+    """
+    con, cur = connect_db('para_queries.db', mmap_size=1024 * 1024)
+    try:
+        assert cur.execute('PRAGMA mmap_size;').fetchone()[0] == 1024 * 1024
+        assert cur.execute('SELECT COUNT(*) FROM Event;').fetchone()[0] > 0
+    finally:
+        con.close()
+
+
+def test_files_are_written_to_the_working_directory(tmp_path, monkeypatch):
+    """
+    GIVEN a working directory without the query database
+    WHEN output_path() and find_data_file() are used before and after the database is written there
+    THEN the file should be written to the working directory rather than the package
+    AND find_data_file() should give the package's file until the working directory has one
+    """
+    monkeypatch.chdir(tmp_path)
+    assert output_path('para_queries.db') == tmp_path.joinpath('para_queries.db')
+    assert find_data_file('para_queries.db', DB_DATA_PACKAGE) == resource_path('para_queries.db', DB_DATA_PACKAGE)
+
+    tmp_path.joinpath('para_queries.db').write_bytes(b'')
+    assert find_data_file('para_queries.db', DB_DATA_PACKAGE) == tmp_path.joinpath('para_queries.db')
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pandas as pd
+
+from tutorialpkg.data_tools.schema import EVENTS_SCHEMA, read_with_schema
+
+RAW_CSV = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data', 'paralympics_events_raw.csv')
+
+
+def test_read_with_schema_column_types():
+    """
+    GIVEN the raw paralympics events csv file
+    WHEN read_with_schema() is called with the events schema
+    THEN the counts with missing values should be nullable integers, 'type' and 'country' should be categorical
+    AND 'start' and 'end' should be dates
+    """
+    df = read_with_schema(RAW_CSV, EVENTS_SCHEMA)
+    assert df['participants_m'].dtype == 'Int64'
+    assert df['year'].dtype == 'int64'
+    assert isinstance(df['type'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['country'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df['start'])
+    assert df.loc[1, 'start'] == pd.Timestamp(1964, 11, 8)
+
+
+def test_read_with_schema_subset_of_columns():
+    """
+    GIVEN the raw paralympics events csv file
+    WHEN read_with_schema() is called with a list of columns
+    THEN only those columns should be read
+    """
+    df = read_with_schema(RAW_CSV, EVENTS_SCHEMA, columns=['year', 'end', 'participants'])
+    assert df.columns.tolist() == ['year', 'end', 'participants']
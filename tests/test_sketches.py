@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from tutorialpkg.data_tools.profile import profile_dataframe
+from tutorialpkg.data_tools.sketches import CountMinSketch, HyperLogLog, KllSketch
+
+
+def test_sketches_merged_across_chunks_are_within_their_error_bounds():
+    """
+    GIVEN 200,000 values split into chunks, each added to its own sketch
+    WHEN the sketches of the chunks are merged
+    THEN the distinct count should be within 2.5% of the true count
+    AND the quantiles should be within 1.7% of the true rank
+    AND the most common values should be found, with counts that are never too low and at most 0.13% of n too high
+    """
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.zipf(1.3, 200_000) % 50_000)
+    distinct, quantiles, counts = HyperLogLog(), KllSketch(seed=0), CountMinSketch()
+    for chunk in np.array_split(values, 4):
+        distinct.merge(HyperLogLog().update(chunk))
+        quantiles.merge(KllSketch(seed=1).update(chunk))
+        counts.merge(CountMinSketch().update(chunk))
+
+    true_counts = values.value_counts()
+    percentiles = np.array([0.1, 0.5, 0.9])
+    # Many values are repeated, so a quantile is right if its rank, anywhere in its run of ties, is close enough
+    estimates = quantiles.quantile(percentiles)
+    low = np.searchsorted(np.sort(values), estimates, side='left') / len(values)
+    high = np.searchsorted(np.sort(values), estimates, side='right') / len(values)
+    most_common = counts.most_common(3)
+
+    assert abs(distinct.estimate() / values.nunique() - 1) < 0.025
+    assert np.all((low - 0.017 < percentiles) & (percentiles < high + 0.017))
+    assert most_common.index.tolist() == true_counts.index[:3].tolist()
+    assert np.all(most_common.to_numpy() >= true_counts.iloc[:3].to_numpy())
+    assert np.all(most_common.to_numpy() <= true_counts.iloc[:3].to_numpy() + 0.0013 * len(values))
+
+
+def test_approximate_profile_of_small_data_matches_pandas():
+    """
+    GIVEN a small dataframe with numbers, missing values and repeated text
+    WHEN it is profiled in chunks with approximate=True
+    THEN describe() should be the same as DataFrame.describe(), as the sketches are exact for so few values
+    AND the estimated value counts and numbers of different values should be the same as value_counts() and nunique()
+    """
+    df = pd.DataFrame({'participants': [130, None, 209, 1004, 357, 400], 'type': ['summer', 'winter', 'summer',
+                                                                                  'summer', 'winter', 'Summer']})
+
+    profile = profile_dataframe(df, chunksize=4, approximate=True)
+
+    pd.testing.assert_frame_equal(profile.describe(), df.describe())
+    pd.testing.assert_series_equal(profile.value_counts('type'), df['type'].value_counts(), check_index_type=False)
+    assert profile.nunique().to_dict() == df.nunique().to_dict()
+
+
+def test_approximate_profile_of_time_zone_dates():
+    """
+    GIVEN a dataframe with a time zone aware date column with a repeated date
+    WHEN it is profiled in chunks with approximate=True
+    THEN describe() should be the same as DataFrame.describe() and the number of different dates as nunique()
+    """
+    df = pd.DataFrame({'start': pd.to_datetime(['2012-08-29', '2016-09-07', '2012-08-29', '2021-08-24']).tz_localize(
+        'Europe/London')})
+
+    profile = profile_dataframe(df, chunksize=3, approximate=True)
+
+    pd.testing.assert_frame_equal(profile.describe(), df.describe())
+    assert profile.nunique().to_dict() == df.nunique().to_dict()
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from tutorialpkg.data_tools.workbook import read_workbook
+
+DATA_PATH = Path(__file__).parent.parent.joinpath('src', 'tutorialpkg', 'data_db_activity', 'paralympics_all.xlsx')
+
+
+def test_read_workbook_matches_read_excel():
+    """
+    GIVEN the paralympics_all.xlsx workbook
+    WHEN read_workbook() is called for the events, medal_standings and npc_codes sheets
+    THEN each dataframe should be equal to the one returned by pd.read_excel for that sheet
+    """
+    sheets = ['events', 'medal_standings', 'npc_codes']
+    dfs = read_workbook(DATA_PATH, sheets)
+    for sheet in sheets:
+        pd.testing.assert_frame_equal(dfs[sheet], pd.read_excel(DATA_PATH, sheet_name=sheet))
+
+
+def test_read_workbook_selected_columns():
+    """
+    GIVEN the paralympics_all.xlsx workbook
+    WHEN read_workbook() is called with a list of columns for the npc_codes sheet
+    THEN the dataframe should only have those columns, in the order requested
+    """
+    dfs = read_workbook(DATA_PATH, ['npc_codes'], columns={'npc_codes': ['name', 'code']})
+    assert dfs['npc_codes'].columns.tolist() == ['name', 'code']
+
+
+def test_read_workbook_unknown_column_raises_error():
+    """
+    GIVEN the paralympics_all.xlsx workbook
+    WHEN read_workbook() is called with a column that is not in the sheet
+    THEN a ValueError should be raised
+    """
+    with pytest.raises(ValueError):
+        read_workbook(DATA_PATH, ['npc_codes'], columns={'npc_codes': ['not_a_column']})